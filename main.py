@@ -96,7 +96,8 @@ def format_enhanced_result_output(result):
                 print(f"    • {use_case}")
                 
         # Show executive report snippet
-        executive_report = result.get('executive_report', '')
+        report = result.get('executive_report_ref')
+        executive_report = (getattr(report, 'raw', None) or str(report)) if report is not None else ''
         if executive_report:
             print(f"\n📝 Executive Report Generated:")
             print(f"   Length: {len(executive_report):,} characters")
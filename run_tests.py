@@ -211,6 +211,8 @@ class TestRunner:
             cmd.extend(specific_tests)
         elif category:
             cmd.extend(["-m", self.test_categories[category]["markers"]])
+            if category == "integration":
+                cmd.append("--runintegration")  # Integration tests are skipped by default
         else:
             cmd.append("tests/")
         
@@ -227,7 +229,7 @@ class TestRunner:
         # Parallel execution
         if parallel and category != "integration":  # Integration tests shouldn't run in parallel
             try:
-                import pytest_xdist
+                import xdist  # Provided by pytest-xdist
                 cmd.extend(["-n", "auto"])
             except ImportError:
                 logger.warning("⚠️  pytest-xdist not available, running sequentially")
@@ -242,6 +244,9 @@ class TestRunner:
                 "--cov-report=json",
                 f"--cov-report=json:test_reports/coverage_{timestamp}.json"
             ])
+            # The coverage gate only means something for a run of the whole suite
+            if not (specific_tests or category):
+                cmd.append("--cov-fail-under=75")
         
         # Output options
         cmd.extend([
@@ -10,12 +10,47 @@ from reportlab.graphics.shapes import Drawing, Rect
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.charts.piecharts import Pie
 from src.utils.logger import logger
+import functools
 import os
 import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional, ClassVar
 import json
 
+# Prefixes of the error messages the other tools return instead of content
+_UPSTREAM_ERROR_PREFIXES = ("Error:", "Critical Error:", "Search Error:")
+
+# Section patterns for _extract_structured_data, compiled once at import
+_SECTION_FLAGS = re.IGNORECASE | re.DOTALL | re.MULTILINE
+
+_SUMMARY_PATTERNS = tuple(re.compile(pattern, _SECTION_FLAGS) for pattern in (
+    r'(?:### Executive Summary|## Executive Summary|Executive Summary)[:\s]*\n\n([^#]+?)(?=\n\n#{1,3}|\n\n[A-Z]|\Z)',
+    r'(?:executive summary|summary)[:\s]*([^\.]+(?:\.[^\.]+){0,5}\.)',
+    r'^([^#\n]+(?:\.[^\.]+){0,3}\.)'  # First substantial sentences
+))
+
+_FINDINGS_PATTERNS = tuple(re.compile(pattern, _SECTION_FLAGS) for pattern in (
+    r'(?:### Key Insights|## Key Insights|Key Insights|### Key Findings|## Key Findings|Key Findings)[:\s]*\n\n([^#]+?)(?=\n\n#{1,3}|\Z)',
+    r'(?:key findings?|findings?|insights?|takeaways?)[:\s]*([^\.]+(?:\.[^\.]+)*\.)',
+))
+
+_COMPANY_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\*\*([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]*)*(?:\s+(?:Inc|Corp|LLC|Ltd|Group|Motors|Motor|Company))?)\*\*',  # Bold company names
+    r'\b(Tesla|BYD|Volkswagen|General Motors|Hyundai|Ford|Rivian|Lucid|Mercedes-Benz|BMW|Audi|Porsche|Kia|Genesis|Chevrolet|Cadillac|Microsoft|Google|OpenAI|Amazon|Meta|Apple)\b',  # Known companies
+    r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]*)+)(?=:|\s+[-–])',  # Company names followed by colon or dash
+    r'\b(Microsoft|Google|OpenAI|Amazon|Meta|Apple|IBM|Oracle|Salesforce)\b',  # Tech companies
+))
+
+_RECOMMENDATION_PATTERNS = tuple(re.compile(pattern, _SECTION_FLAGS) for pattern in (
+    r'(?:### Strategic Recommendations|## Strategic Recommendations|Strategic Recommendations|### Recommendations|## Recommendations|Recommendations)[:\s]*\n\n([^#]+?)(?=\n\n#{1,3}|\Z)',
+    r'(?:recommend|suggestion|should|advice|strategy)[s]?[:\s]*([^\.]+\.(?:[^\.]+\.){0,2})',
+))
+
+# Capitalised words the company patterns pick up that are not company names
+_NON_COMPANY_WORDS = frozenset({'The', 'This', 'That', 'With', 'From', 'Market', 'Analysis', 'Report'})
+
+_HAS_LETTER = re.compile(r'[A-Za-z]')
+
 class EnhancedPDFReportTool(BaseTool):
     """Professional PDF report generator with advanced formatting and charts"""
     
@@ -28,8 +63,10 @@ class EnhancedPDFReportTool(BaseTool):
     Output: Path to generated PDF report
     """
     
-    def _setup_custom_styles(self):
-        """Setup custom styles for professional report formatting"""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _setup_custom_styles():
+        """Setup custom styles for professional report formatting (built once and shared)"""
         styles = getSampleStyleSheet()
         
         # Store styles in a dictionary to avoid Pydantic field conflicts
@@ -137,15 +174,9 @@ class EnhancedPDFReportTool(BaseTool):
         
         try:
             # Extract executive summary (look for Executive Summary section)
-            summary_patterns = [
-                r'(?:### Executive Summary|## Executive Summary|Executive Summary)[:\s]*\n\n([^#]+?)(?=\n\n#{1,3}|\n\n[A-Z]|\Z)',
-                r'(?:executive summary|summary)[:\s]*([^\.]+(?:\.[^\.]+){0,5}\.)',
-                r'^([^#\n]+(?:\.[^\.]+){0,3}\.)'  # First substantial sentences
-            ]
-            
             summary_found = False
-            for pattern in summary_patterns:
-                summary_match = re.search(pattern, content, re.IGNORECASE | re.DOTALL | re.MULTILINE)
+            for pattern in _SUMMARY_PATTERNS:
+                summary_match = pattern.search(content)
                 if summary_match and len(summary_match.group(1).strip()) > 50:
                     structured['executive_summary'] = summary_match.group(1).strip()
                     summary_found = True
@@ -157,13 +188,8 @@ class EnhancedPDFReportTool(BaseTool):
                 structured['executive_summary'] = '. '.join(sentences) + '.' if sentences else content[:400] + '...'
 
             # Extract key findings more comprehensively
-            findings_patterns = [
-                r'(?:### Key Insights|## Key Insights|Key Insights|### Key Findings|## Key Findings|Key Findings)[:\s]*\n\n([^#]+?)(?=\n\n#{1,3}|\Z)',
-                r'(?:key findings?|findings?|insights?|takeaways?)[:\s]*([^\.]+(?:\.[^\.]+)*\.)',
-            ]
-            
-            for pattern in findings_patterns:
-                findings_match = re.search(pattern, content, re.IGNORECASE | re.DOTALL | re.MULTILINE)
+            for pattern in _FINDINGS_PATTERNS:
+                findings_match = pattern.search(content)
                 if findings_match:
                     findings_text = findings_match.group(1)
                     # Split on bullet points, asterisks, or line breaks with bullets
@@ -180,16 +206,9 @@ class EnhancedPDFReportTool(BaseTool):
                         break
 
             # Extract company/competitor names more accurately
-            company_patterns = [
-                r'\*\*([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]*)*(?:\s+(?:Inc|Corp|LLC|Ltd|Group|Motors|Motor|Company))?)\*\*',  # Bold company names
-                r'\b(Tesla|BYD|Volkswagen|General Motors|Hyundai|Ford|Rivian|Lucid|Mercedes-Benz|BMW|Audi|Porsche|Kia|Genesis|Chevrolet|Cadillac|Microsoft|Google|OpenAI|Amazon|Meta|Apple)\b',  # Known companies
-                r'([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]*)+)(?=:|\s+[-–])',  # Company names followed by colon or dash
-                r'\b(Microsoft|Google|OpenAI|Amazon|Meta|Apple|IBM|Oracle|Salesforce)\b',  # Tech companies
-            ]
-            
             competitors_found = set()
-            for pattern in company_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
+            for pattern in _COMPANY_PATTERNS:
+                matches = pattern.findall(content)
                 for match in matches:
                     if isinstance(match, tuple):
                         match = match[0]
@@ -197,21 +216,16 @@ class EnhancedPDFReportTool(BaseTool):
                     # Clean up and validate company name
                     match = match.strip()
                     if (3 <= len(match) <= 50 and  # Reasonable length
-                        match not in ['The', 'This', 'That', 'With', 'From', 'Market', 'Analysis', 'Report'] and  # Not common words
+                        match not in _NON_COMPANY_WORDS and  # Not common words
                         not match.lower().startswith('http') and  # Not URLs
-                        re.search(r'[A-Za-z]', match)):  # Contains letters
+                        _HAS_LETTER.search(match)):  # Contains letters
                         competitors_found.add(match.title())
             
             structured['competitors'] = list(competitors_found)[:10]  # Top 10 competitors
             
             # Extract recommendations more accurately
-            rec_patterns = [
-                r'(?:### Strategic Recommendations|## Strategic Recommendations|Strategic Recommendations|### Recommendations|## Recommendations|Recommendations)[:\s]*\n\n([^#]+?)(?=\n\n#{1,3}|\Z)',
-                r'(?:recommend|suggestion|should|advice|strategy)[s]?[:\s]*([^\.]+\.(?:[^\.]+\.){0,2})',
-            ]
-            
-            for pattern in rec_patterns:
-                rec_matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL | re.MULTILINE)
+            for pattern in _RECOMMENDATION_PATTERNS:
+                rec_matches = pattern.findall(content)
                 if rec_matches:
                     if isinstance(rec_matches[0], str) and len(rec_matches[0]) > 100:
                         # Extract recommendations from a section
@@ -435,6 +449,104 @@ class EnhancedPDFReportTool(BaseTool):
         
         return filename
 
+    def render_to(self, target: Any, summary: str, query: str = "") -> None:
+        """
+        Render the report into a file path or a binary file-like object
+        
+        Kept off the tool's argument schema so callers (and tests) can render
+        in memory without CrewAI having to describe a file object.
+        
+        Args:
+            target: Output path or writable binary buffer
+            summary: Analysis content to include in report
+            query: Original query for context
+        """
+        # Setup styles
+        styles = self._setup_custom_styles()
+        
+        # Create document with professional margins
+        doc = SimpleDocTemplate(
+            target,
+            pagesize=letter,
+            topMargin=0.75*inch,
+            bottomMargin=0.75*inch,
+            leftMargin=0.75*inch,
+            rightMargin=0.75*inch,
+            title="Competitor Analysis Report",
+            author="AI Competitor Research Agent"
+        )
+        
+        # Extract structured data from summary
+        structured_data = self._extract_structured_data(summary)
+        
+        # Build story elements
+        story = []
+        
+        # Create a simple PDF structure for testing
+        story.append(Paragraph(f"Competitor Analysis Report: {query or 'General Analysis'}", styles['title']))
+        story.append(Spacer(1, 12))
+        
+        # Add executive summary
+        story.append(Paragraph("Executive Summary", styles['section_header']))
+        story.append(Paragraph(structured_data.get('executive_summary', 'Analysis summary not available.'), styles['body']))
+        story.append(Spacer(1, 12))
+        
+        # Add key findings
+        story.append(Paragraph("Key Findings", styles['section_header']))
+        for finding in structured_data.get('key_findings', ['No key findings identified.']):
+            story.append(Paragraph(f"• {finding}", styles['body']))
+        story.append(Spacer(1, 12))
+        
+        # Add competitors section
+        story.append(Paragraph("Identified Competitors", styles['section_header']))
+        if structured_data.get('competitors'):
+            for competitor in structured_data['competitors'][:5]:  # Limit to 5
+                story.append(Paragraph(f"• {competitor}", styles['body']))
+        else:
+            story.append(Paragraph("No specific competitors identified in the analysis.", styles['body']))
+        story.append(Spacer(1, 12))
+        
+        # Add recommendations
+        story.append(Paragraph("Recommendations", styles['section_header']))
+        for rec in structured_data.get('recommendations', ['Further analysis recommended.']):
+            story.append(Paragraph(f"• {rec}", styles['body']))
+        
+        # Add complete analysis content instead of just preview
+        story.append(PageBreak())
+        story.append(Paragraph("Detailed Analysis", styles['section_header']))
+        raw_content = structured_data.get('raw_content', summary)
+        
+        # Process the full content with proper markdown-style formatting
+        if raw_content:
+            # Split on multiple newlines for section breaks
+            sections = raw_content.split('\n\n')
+            for section in sections:
+                if section.strip():
+                    # Check if it's a header (starts with ### or ##)
+                    if section.strip().startswith('###'):
+                        header_text = section.strip().replace('###', '').strip()
+                        story.append(Paragraph(header_text, styles['subsection']))
+                    elif section.strip().startswith('##'):
+                        header_text = section.strip().replace('##', '').strip()
+                        story.append(Paragraph(header_text, styles['section_header']))
+                    elif section.strip().startswith('#'):
+                        header_text = section.strip().replace('#', '').strip()
+                        story.append(Paragraph(header_text, styles['title']))
+                    else:
+                        # Regular content - preserve bullet points and formatting
+                        lines = section.split('\n')
+                        for line in lines:
+                            if line.strip():
+                                if line.strip().startswith('*') or line.strip().startswith('-'):
+                                    # Bullet point
+                                    bullet_text = line.strip().replace('*', '•').replace('-', '•')
+                                    story.append(Paragraph(bullet_text, styles['body']))
+                                else:
+                                    story.append(Paragraph(line.strip(), styles['body']))
+        
+        # Build PDF
+        doc.build(story)
+
     def _run(self, summary: str, filename: Optional[str] = None, query: str = "") -> str:
         """
         Generate enhanced professional PDF report
@@ -447,10 +559,12 @@ class EnhancedPDFReportTool(BaseTool):
         Returns:
             Path to generated PDF file
         """
+        # Nothing worth rendering: skip the ReportLab build for empty or upstream-error content
+        if not summary or summary.lstrip().startswith(_UPSTREAM_ERROR_PREFIXES):
+            logger.warning("Skipping PDF generation for empty or upstream-error summary")
+            return "Error: empty or upstream-error summary"
+
         try:
-            # Setup styles
-            styles = self._setup_custom_styles()
-                
             # Generate filename if not provided
             if not filename:
                 filename = self._generate_filename(query)
@@ -460,96 +574,17 @@ class EnhancedPDFReportTool(BaseTool):
                 filename += '.pdf'
             
             logger.info(f"Generating enhanced PDF report: {filename}")
-            
-            # Create document with professional margins
-            doc = SimpleDocTemplate(
-                filename, 
-                pagesize=letter,
-                topMargin=0.75*inch,
-                bottomMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                rightMargin=0.75*inch,
-                title="Competitor Analysis Report",
-                author="AI Competitor Research Agent"
-            )
-            
-            # Extract structured data from summary
-            structured_data = self._extract_structured_data(summary)
-            
-            # Build story elements
-            story = []
-            
-            # Create a simple PDF structure for testing
-            story.append(Paragraph(f"Competitor Analysis Report: {query or 'General Analysis'}", styles['title']))
-            story.append(Spacer(1, 12))
-            
-            # Add executive summary
-            story.append(Paragraph("Executive Summary", styles['section_header']))
-            story.append(Paragraph(structured_data.get('executive_summary', 'Analysis summary not available.'), styles['body']))
-            story.append(Spacer(1, 12))
-            
-            # Add key findings
-            story.append(Paragraph("Key Findings", styles['section_header']))
-            for finding in structured_data.get('key_findings', ['No key findings identified.']):
-                story.append(Paragraph(f"• {finding}", styles['body']))
-            story.append(Spacer(1, 12))
-            
-            # Add competitors section
-            story.append(Paragraph("Identified Competitors", styles['section_header']))
-            if structured_data.get('competitors'):
-                for competitor in structured_data['competitors'][:5]:  # Limit to 5
-                    story.append(Paragraph(f"• {competitor}", styles['body']))
-            else:
-                story.append(Paragraph("No specific competitors identified in the analysis.", styles['body']))
-            story.append(Spacer(1, 12))
-            
-            # Add recommendations
-            story.append(Paragraph("Recommendations", styles['section_header']))
-            for rec in structured_data.get('recommendations', ['Further analysis recommended.']):
-                story.append(Paragraph(f"• {rec}", styles['body']))
-            
-            # Add complete analysis content instead of just preview
-            story.append(PageBreak())
-            story.append(Paragraph("Detailed Analysis", styles['section_header']))
-            raw_content = structured_data.get('raw_content', summary)
-            
-            # Process the full content with proper markdown-style formatting
-            if raw_content:
-                # Split on multiple newlines for section breaks
-                sections = raw_content.split('\n\n')
-                for section in sections:
-                    if section.strip():
-                        # Check if it's a header (starts with ### or ##)
-                        if section.strip().startswith('###'):
-                            header_text = section.strip().replace('###', '').strip()
-                            story.append(Paragraph(header_text, styles['subsection']))
-                        elif section.strip().startswith('##'):
-                            header_text = section.strip().replace('##', '').strip()
-                            story.append(Paragraph(header_text, styles['section_header']))
-                        elif section.strip().startswith('#'):
-                            header_text = section.strip().replace('#', '').strip()
-                            story.append(Paragraph(header_text, styles['title']))
-                        else:
-                            # Regular content - preserve bullet points and formatting
-                            lines = section.split('\n')
-                            for line in lines:
-                                if line.strip():
-                                    if line.strip().startswith('*') or line.strip().startswith('-'):
-                                        # Bullet point
-                                        bullet_text = line.strip().replace('*', '•').replace('-', '•')
-                                        story.append(Paragraph(bullet_text, styles['body']))
-                                    else:
-                                        story.append(Paragraph(line.strip(), styles['body']))
-            
-            # Build PDF
-            doc.build(story)
+            self.render_to(filename, summary, query)
             
             # Get absolute path
             abs_path = os.path.abspath(filename)
             
-            # Log success with file info
-            if os.path.exists(abs_path):
-                file_size = os.path.getsize(abs_path) / 1024  # Size in KB
+            # Log success with file info (one stat call covers existence and size)
+            try:
+                file_size = os.stat(abs_path).st_size / 1024  # Size in KB
+            except OSError:
+                pass
+            else:
                 logger.info(f"Enhanced PDF report generated successfully: {abs_path} ({file_size:.1f} KB)")
             
             return abs_path
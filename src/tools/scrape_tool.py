@@ -4,6 +4,7 @@ from playwright.sync_api import sync_playwright
 from src.utils.logger import logger
 import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 import random
 from typing import Dict, List, Optional, Union, ClassVar
 from urllib.parse import urlparse, urljoin
@@ -371,4 +372,48 @@ Status: ✅ Successfully scraped
         return self._run(url)
 
 # Alias for backwards compatibility
-ScrapeTool = EnhancedScrapeTool
\ No newline at end of file
+ScrapeTool = EnhancedScrapeTool
+
+
+class ScrapeBatchTool(BaseTool):
+    """Scrape several websites concurrently with the enhanced scraper"""
+    
+    name: str = "scrape_batch"
+    description: str = """
+    Scrape several websites at once. Prefer this over the single-URL scraper
+    whenever you have two or more URLs to visit.
+    
+    Input: A list of website URLs (or a comma / newline separated string of URLs)
+    Output: The structured scraping results for each URL, in the order given
+    """
+    
+    # Upper bound on browsers running at the same time
+    MAX_CONCURRENCY: ClassVar[int] = 5
+    
+    def _run(self, urls: Union[str, List[str]], max_concurrency: int = MAX_CONCURRENCY) -> str:
+        """
+        Scrape URLs in parallel, each in its own worker thread and browser
+        
+        Args:
+            urls: Website URLs to scrape
+            max_concurrency: Largest number of URLs scraped at the same time
+            
+        Returns:
+            Formatted scraping results for every URL
+        """
+        if isinstance(urls, str):
+            urls = re.split(r'[\s,]+', urls)
+        urls = [url for url in urls if url and url.strip()]
+        if not urls:
+            return "Error: No URLs provided"
+        
+        logger.info(f"Starting batch scraping for {len(urls)} URLs")
+        scraper = EnhancedScrapeTool()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(urls)))) as executor:
+            results = list(executor.map(scraper._run, urls))
+        
+        return "\n".join(results)
+    
+    async def _arun(self, urls: Union[str, List[str]], max_concurrency: int = MAX_CONCURRENCY) -> str:
+        """Async wrapper for the sync _run method"""
+        return await asyncio.get_running_loop().run_in_executor(None, self._run, urls, max_concurrency)
\ No newline at end of file
@@ -1,13 +1,26 @@
 from crewai.tools import BaseTool
 from duckduckgo_search import DDGS
 from src.utils.logger import logger
+import functools
+import re
+import sys
 import time
 import random
-from typing import List, Dict, Any, Optional, ClassVar
+from typing import List, Dict, Any, Optional, ClassVar, Tuple
 from dataclasses import dataclass
 from pydantic import Field
 
-@dataclass
+# dataclass(slots=True) requires Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Title of the result _search_with_retry returns once every attempt has failed
+_SEARCH_ERROR_TITLE = "Search Error"
+
+# Markup, script schemes, template/SQL separators and path traversal stripped from
+# queries; none of them helps a web search and the query is echoed in the results
+_QUERY_NOISE = re.compile(r"<[^>]*>|javascript:|\$\{|[{};]|--|\.\./", re.I)
+
+@dataclass(frozen=True, **_SLOTS)
 class SearchResult:
     """Structured search result data class"""
     title: str
@@ -32,8 +45,10 @@ class SearchTool(BaseTool):
     RETRY_COUNT: ClassVar[int] = 3
     BASE_DELAY: ClassVar[float] = 1.0
     
-    def _optimize_query(self, query: str) -> List[str]:
-        """Generate optimized search queries for better competitor discovery"""
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _optimize_query(query: str) -> Tuple[str, ...]:
+        """Generate optimized search queries for better competitor discovery (cached, hence a tuple)"""
         base_query = query.strip()
         
         # Generate multiple query variations for comprehensive results
@@ -55,7 +70,7 @@ class SearchTool(BaseTool):
                 f"{base_query} industry leaders"
             ])
         
-        return queries[:3]  # Return top 3 most relevant queries
+        return tuple(queries[:3])  # Return top 3 most relevant queries
 
     def _search_with_retry(self, query: str) -> List[SearchResult]:
         """Execute search with retry logic and rate limiting"""
@@ -101,7 +116,7 @@ class SearchTool(BaseTool):
                 else:
                     logger.error(f"All search attempts failed for query '{query}': {e}")
                     return [SearchResult(
-                        title="Search Error",
+                        title=_SEARCH_ERROR_TITLE,
                         url="",
                         snippet=f"Search failed after {self.RETRY_COUNT} attempts: {str(e)}"
                     )]
@@ -133,8 +148,8 @@ class SearchTool(BaseTool):
         if not results:
             return results
         
-        # Filter out low-quality results
-        filtered_results = []
+        # Filter out low-quality results, keeping (score, result) pairs since results are frozen
+        scored_results = []
         
         for result in results:
             # Skip results with poor quality indicators
@@ -165,15 +180,13 @@ class SearchTool(BaseTool):
                 sum(1 for word in query_words if word in snippet_words)
             )
             
-            # Add quality_score as an attribute to the result
-            setattr(result, 'quality_score', quality_score + relevance)
-            filtered_results.append(result)
+            scored_results.append((quality_score + relevance, result))
         
-        # Sort by quality score (descending)
-        filtered_results.sort(key=lambda x: getattr(x, 'quality_score', 0), reverse=True)
+        # Sort by quality score (descending); stable, so ties keep search order
+        scored_results.sort(key=lambda pair: pair[0], reverse=True)
         
         # Return top results
-        return filtered_results[:self.MAX_RESULTS]
+        return [result for _, result in scored_results[:self.MAX_RESULTS]]
 
     def _run(self, query: str) -> str:
         """
@@ -186,7 +199,8 @@ class SearchTool(BaseTool):
             Formatted search results string
         """
         try:
-            if not query or not query.strip():
+            query = " ".join(_QUERY_NOISE.sub(" ", query or "").split())
+            if not query:
                 return "Error: Empty search query provided"
             
             logger.info(f"Starting enhanced search for: '{query}'")
@@ -213,6 +227,12 @@ class SearchTool(BaseTool):
             
             final_results = list(unique_results.values())
             
+            # Error results carry no URL, so when every search failed report why
+            if not final_results:
+                failures = [result.snippet for result in all_results if result.title == _SEARCH_ERROR_TITLE]
+                if failures:
+                    return f"Search Error: {failures[0]}. Please try a different query or check your internet connection."
+            
             # Filter and rank results
             final_results = self._filter_and_rank_results(final_results, query)
             
@@ -15,6 +15,10 @@ class Config:
         self.gemini_api_key = os.getenv("GEMINI_API_KEY") 
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         
+        # Crew request throttle; MAX_RPM=0 disables it for provider tiers with high limits
+        max_rpm = int(os.getenv("MAX_RPM", "10"))
+        self.max_rpm = max_rpm if max_rpm > 0 else None
+        
         # Model configurations with fallbacks
         self.primary_model = "gemini/gemini-2.0-flash-exp"
         self.fallback_models = [
@@ -61,13 +65,15 @@ class Config:
             return {
                 "provider": "gemini",
                 "model": "gemini-2.0-flash-exp",
-                "api_key": self.gemini_api_key
+                "api_key": self.gemini_api_key,
+                "max_rpm": self.max_rpm
             }
         elif self.groq_api_key:
             return {
                 "provider": "groq", 
                 "model": "llama-3.1-70b-versatile",
-                "api_key": self.groq_api_key
+                "api_key": self.groq_api_key,
+                "max_rpm": self.max_rpm
             }
         else:
             raise ValueError("No valid API keys configured. Please set up Gemini or Groq API keys.")
@@ -82,16 +88,33 @@ class Config:
             "backoff_factor": 2
         }
 
-# Global configuration instance
-config = Config()
+# Global configuration instance, created on first use so importing this module stays cheap
+_config: Optional[Config] = None
+
+# Legacy compatibility names resolved lazily by __getattr__
+_LEGACY_KEY_ATTRIBUTES = {
+    "GROQ_API_KEY": "groq_api_key",
+    "GEMINI_API_KEY": "gemini_api_key",
+}
 
-# Legacy compatibility
-GROQ_API_KEY = config.groq_api_key
-GEMINI_API_KEY = config.gemini_api_key
+def get_config() -> Config:
+    """Return the global Config, reading the environment and validating keys on first call"""
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``config`` and the legacy API key constants on first access"""
+    if name == "config":
+        return get_config()
+    if name in _LEGACY_KEY_ATTRIBUTES:
+        return getattr(get_config(), _LEGACY_KEY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_configured_llm() -> str:
     """Get the configured LLM model string for CrewAI"""
-    model_config = config.get_model_config()
+    model_config = get_config().get_model_config()
     
     if model_config["provider"] == "gemini":
         return f"gemini/{model_config['model']}"
@@ -101,11 +124,54 @@ def get_configured_llm() -> str:
         # Default fallback
         return "gemini/gemini-2.0-flash-exp"
 
-def validate_configuration() -> bool:
-    """Validate that all required configuration is present"""
+# Placeholder values (from .env.example and the setup instructions) that mean a key was never filled in
+_PLACEHOLDER_API_KEYS = {
+    "YOUR_GEMINI_API_KEY_HERE", "your_gemini_api_key_here",
+    "YOUR_GROQ_API_KEY_HERE", "your_groq_api_key_here",
+}
+
+# Last check_configuration result, keyed by the API keys it was computed from
+_validation_cache: Dict[tuple, Dict[str, Any]] = {}
+
+def check_configuration() -> Dict[str, Any]:
+    """Check API key and model configuration (cached until the API keys change)
+    
+    Returns:
+        Dict with ``auth_ok`` and ``model_ok`` flags and a list of failure ``reasons``
+    """
+    config = get_config()
+    keys = (config.gemini_api_key, config.groq_api_key)
+    cached = _validation_cache.get(keys)
+    if cached is not None:
+        return cached
+    
+    reasons = []
+    auth_ok = model_ok = False
     try:
-        config.get_model_config()
-        return True
+        model_config = config.get_model_config()
     except ValueError as e:
-        logger.error(f"Configuration validation failed: {e}")
-        return False
\ No newline at end of file
+        reasons.append(str(e))
+    else:
+        auth_ok = model_config.get("api_key") not in _PLACEHOLDER_API_KEYS
+        if not auth_ok:
+            reasons.append(f"The {model_config['provider']} API key is still the placeholder value")
+        model_ok = bool(model_config.get("model"))
+        if not model_ok:
+            reasons.append(f"No model configured for provider {model_config['provider']}")
+    
+    if reasons:
+        logger.error(f"Configuration validation failed: {'; '.join(reasons)}")
+    
+    result = {"auth_ok": auth_ok, "model_ok": model_ok, "reasons": reasons}
+    _validation_cache.clear()
+    _validation_cache[keys] = result
+    return result
+
+def validate_configuration() -> bool:
+    """Validate that all required configuration is present"""
+    result = check_configuration()
+    return result["auth_ok"] and result["model_ok"]
+
+def invalidate_validation():
+    """Forget the cached validate_configuration result"""
+    _validation_cache.clear()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Cached Embeddings
+
+Content-addressed embedding cache for crew memory, so repeated runs do not
+re-embed the same text through the provider API.
+"""
+
+from array import array
+from typing import Any, Dict, List, Sequence
+
+import google.generativeai as genai
+
+from src.utils.logger import logger
+from src.utils.performance import intelligent_cache
+
+try:
+    from chromadb import EmbeddingFunction
+except ImportError:  # Only needed so CrewAI accepts this as a custom embedder
+    EmbeddingFunction = object
+
+try:
+    # CrewAI's custom provider also requires a subclass of its own base class
+    from crewai.rag.embeddings.providers.custom.embedding_callable import CustomEmbeddingFunction
+except ImportError:  # Older CrewAI releases accept any chromadb embedding function
+    class CustomEmbeddingFunction:
+        """Empty stand-in base for CrewAI releases without a custom embedding class"""
+
+# Embeddings are deterministic per model, so they can be kept for a long time
+EMBEDDING_CACHE_TTL = 30 * 24 * 3600
+
+
+class CachedEmbedder(CustomEmbeddingFunction, EmbeddingFunction):
+    """Gemini embedding function backed by the persistent intelligent cache"""
+
+    def __init__(self, model: str = "models/embedding-001"):
+        self.model = model
+
+    def _cache_key(self, text: str) -> str:
+        """Cache key addressing an embedding by model and exact text"""
+        return f"embedding:{self.model}:{text}"
+
+    def __call__(self, input: Sequence[str]) -> List[List[float]]:
+        """Embed texts, only calling the API for texts not already cached"""
+        texts = list(input)
+        embeddings: List[Any] = [None] * len(texts)
+        missing = []
+
+        for i, text in enumerate(texts):
+            cached = intelligent_cache.get(self._cache_key(text))
+            if cached is not None:
+                embeddings[i] = array('f', cached).tolist()
+            else:
+                missing.append(i)
+
+        if missing:
+            logger.debug(f"Embedding {len(missing)} of {len(texts)} texts with {self.model}")
+            response = genai.embed_content(model=self.model, content=[texts[i] for i in missing])
+            for i, vector in zip(missing, response["embedding"]):
+                embeddings[i] = vector
+                # Stored as packed float32 bytes, a quarter of the size of a pickled float list
+                intelligent_cache.set(self._cache_key(texts[i]), array('f', vector).tobytes(),
+                                      ttl=EMBEDDING_CACHE_TTL)
+
+        return embeddings
+
+
+def embedder_config() -> Dict[str, Any]:
+    """Crew ``embedder`` spec for memory backed by CachedEmbedder
+
+    CrewAI instantiates ``embedding_callable`` itself and keeps no other config
+    keys, so the embedder runs with its default model.
+    """
+    return {"provider": "custom", "config": {"embedding_callable": CachedEmbedder}}
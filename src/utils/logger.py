@@ -5,9 +5,13 @@ Provides structured logging with multiple handlers, log levels, and formatting o
 Supports both development and production logging configurations.
 """
 
+import atexit
 import logging
+import queue
 import sys
 import os
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -167,6 +171,33 @@ class EnhancedLogger:
 _enhanced_logger = EnhancedLogger()
 logger = _enhanced_logger.get_logger()
 
+# Background listener that writes records emitted through queued loggers
+_queue_listener: Optional[QueueListener] = None
+_queue_listener_lock = threading.Lock()
+
+def get_queued_logger(suffix: str) -> logging.Logger:
+    """Get a child logger whose records are written by a background thread
+    
+    Emitting only enqueues the record, so high-frequency callers (such as per-step
+    agent callbacks) never block on console or file I/O.
+    """
+    global _queue_listener
+    queued_logger = logging.getLogger(f"{logger.name}.{suffix}")
+    
+    with _queue_listener_lock:
+        if not any(isinstance(h, QueueHandler) for h in queued_logger.handlers):
+            if _queue_listener is None:
+                _queue_listener = QueueListener(queue.SimpleQueue(), *logger.handlers,
+                                                respect_handler_level=True)
+                _queue_listener.start()
+                atexit.register(_queue_listener.stop)
+            
+            queued_logger.addHandler(QueueHandler(_queue_listener.queue))
+            # The listener already writes to the main logger's handlers
+            queued_logger.propagate = False
+    
+    return queued_logger
+
 # Convenience functions for different log levels
 def debug(message: str, **kwargs):
     """Log debug message with optional extra fields"""
@@ -5,15 +5,22 @@ This module provides comprehensive error handling, monitoring, and alerting
 for the Competitor Research Agent system.
 """
 
+import atexit
 import functools
+import os
+import sys
+import threading
 import traceback
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Callable, Union
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Union, Tuple, Deque
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 import hashlib
+import re
 from pathlib import Path
 
 from src.utils.logger import logger
@@ -41,10 +48,108 @@ class ErrorCategory(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
-@dataclass
+# Keyword patterns checked in priority order; the first match decides the category
+_CATEGORY_PATTERNS = tuple(
+    (re.compile("|".join(re.escape(term) for term in terms)), category)
+    for terms, category in (
+        (("api_key", "unauthorized", "authentication", "401", "403"), ErrorCategory.AUTHENTICATION_ERROR),
+        (("rate_limit", "429", "quota", "throttled"), ErrorCategory.RATE_LIMIT_ERROR),
+        (("network", "connection", "502", "503", "504"), ErrorCategory.NETWORK_ERROR),
+        (("timeout", "timed out"), ErrorCategory.TIMEOUT_ERROR),
+        (("parse", "json", "xml", "format"), ErrorCategory.PARSING_ERROR),
+        (("file", "path", "directory", "permission"), ErrorCategory.FILE_ERROR),
+        (("config", "setting", "environment"), ErrorCategory.CONFIGURATION_ERROR),
+        (("validation", "invalid", "format"), ErrorCategory.VALIDATION_ERROR),
+        (("api",), ErrorCategory.API_ERROR),
+    )
+)
+
+# Default severity per category
+_SEVERITY_BY_CATEGORY = {
+    ErrorCategory.AUTHENTICATION_ERROR: ErrorSeverity.HIGH,
+    ErrorCategory.CONFIGURATION_ERROR: ErrorSeverity.HIGH,
+    ErrorCategory.RATE_LIMIT_ERROR: ErrorSeverity.MEDIUM,
+    ErrorCategory.API_ERROR: ErrorSeverity.MEDIUM,
+    ErrorCategory.NETWORK_ERROR: ErrorSeverity.MEDIUM,
+    ErrorCategory.TIMEOUT_ERROR: ErrorSeverity.MEDIUM,
+    ErrorCategory.PARSING_ERROR: ErrorSeverity.LOW,
+    ErrorCategory.FILE_ERROR: ErrorSeverity.LOW,
+    ErrorCategory.VALIDATION_ERROR: ErrorSeverity.LOW,
+    ErrorCategory.UNKNOWN_ERROR: ErrorSeverity.MEDIUM,
+}
+
+# Resolution suggestions per category (tuples so the shared constant stays immutable)
+_SUGGESTIONS_MAP = {
+    ErrorCategory.AUTHENTICATION_ERROR: (
+        "Check your API keys in the .env file",
+        "Verify API key permissions and quotas",
+        "Ensure API keys are not expired",
+        "Try regenerating your API keys"
+    ),
+    ErrorCategory.RATE_LIMIT_ERROR: (
+        "Wait before retrying the request",
+        "Consider upgrading your API plan",
+        "Implement exponential backoff in your requests",
+        "Reduce the frequency of API calls"
+    ),
+    ErrorCategory.NETWORK_ERROR: (
+        "Check your internet connection",
+        "Try again after a few minutes",
+        "Check if the service is experiencing downtime",
+        "Consider using a VPN if blocked by geographic restrictions"
+    ),
+    ErrorCategory.TIMEOUT_ERROR: (
+        "Increase timeout settings",
+        "Check network connectivity",
+        "Try with a smaller request payload",
+        "Consider breaking large requests into smaller chunks"
+    ),
+    ErrorCategory.CONFIGURATION_ERROR: (
+        "Review configuration settings",
+        "Check environment variables",
+        "Validate configuration file syntax",
+        "Refer to configuration documentation"
+    ),
+    ErrorCategory.FILE_ERROR: (
+        "Check file permissions",
+        "Verify file path exists",
+        "Ensure sufficient disk space",
+        "Check file is not in use by another process"
+    )
+}
+
+_DEFAULT_SUGGESTIONS = ("Check logs for more details", "Try restarting the application")
+
+# User impact descriptions per (category, severity)
+_IMPACT_MATRIX = {
+    (ErrorCategory.AUTHENTICATION_ERROR, ErrorSeverity.HIGH): "Complete service failure - users cannot access any functionality",
+    (ErrorCategory.RATE_LIMIT_ERROR, ErrorSeverity.MEDIUM): "Temporary slowdown - users may experience delays",
+    (ErrorCategory.NETWORK_ERROR, ErrorSeverity.MEDIUM): "Intermittent failures - some requests may fail",
+    (ErrorCategory.API_ERROR, ErrorSeverity.MEDIUM): "Feature degradation - some features may not work",
+    (ErrorCategory.PARSING_ERROR, ErrorSeverity.LOW): "Minor data issues - some results may be incomplete",
+}
+
+
+class _ReportEncoder(json.JSONEncoder):
+    """JSON encoder for error reports (enums, datetimes, paths)"""
+    
+    def default(self, o):
+        if isinstance(o, Enum):
+            return o.value
+        if isinstance(o, datetime):
+            return o.isoformat()
+        # Arbitrary context values (paths, exceptions, ...) fall back to str()
+        return str(o)
+
+
+# slots=True is only available on Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ErrorEvent:
     """Structured error event data"""
-    timestamp: str
+    timestamp: float
     error_id: str
     category: ErrorCategory
     severity: ErrorSeverity
@@ -55,150 +160,128 @@ class ErrorEvent:
     user_impact: str
     resolution_suggestions: List[str]
     count: int = 1
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Timestamp formatted as an ISO 8601 string"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dict with the timestamp in ISO format"""
+        data = asdict(self)
+        data["timestamp"] = self.timestamp_iso
+        return data
 
 
 class ErrorMonitor:
     """Advanced error monitoring and alerting system"""
     
-    def __init__(self, max_errors: int = 1000):
+    def __init__(
+        self,
+        max_errors: int = 1000,
+        persist_path: Optional[str] = None,
+        flush_batch_size: int = 50,
+        flush_interval: float = 5.0
+    ):
         self.max_errors = max_errors
-        self.errors: List[ErrorEvent] = []
-        self.error_stats: Dict[str, Dict[str, int]] = {}
+        # Error events by error ID in first-seen order, so the oldest is evicted first
+        self.errors: "OrderedDict[str, ErrorEvent]" = OrderedDict()
+        # The same events in last-seen order, for finding recent errors
+        self._last_seen: "OrderedDict[str, ErrorEvent]" = OrderedDict()
+        self.error_stats: Dict[str, Counter] = defaultdict(Counter)
         self.alert_thresholds = {
             ErrorSeverity.CRITICAL: 1,  # Alert immediately
             ErrorSeverity.HIGH: 3,      # Alert after 3 occurrences
             ErrorSeverity.MEDIUM: 10,   # Alert after 10 occurrences
             ErrorSeverity.LOW: 50       # Alert after 50 occurrences
         }
+        self.alert_window_seconds = 3600
+        # Sliding window of event timestamps per (category, severity)
+        self._alert_windows: Dict[Tuple[ErrorCategory, ErrorSeverity], Deque[float]] = defaultdict(deque)
+        
+        # Optional JSONL persistence, written in batches by a background thread
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[ErrorEvent] = []
+        self._pending_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._closing = False
+        self._flush_thread: Optional[threading.Thread] = None
+        if self.persist_path:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            self._flush_thread = threading.Thread(target=self._flush_loop, name="error-monitor-flush", daemon=True)
+            self._flush_thread.start()
+            # Events queued since the last flush are written out at interpreter exit
+            atexit.register(self.close)
         
-    def categorize_error(self, error: Exception) -> ErrorCategory:
+    def categorize_error(self, error: Exception, error_str: Optional[str] = None) -> ErrorCategory:
         """Automatically categorize errors based on type and message"""
-        error_str = str(error).lower()
-        error_type = type(error).__name__.lower()
+        error_str = (str(error) if error_str is None else error_str).lower()
         
-        if any(term in error_str for term in ["api_key", "unauthorized", "authentication", "401", "403"]):
-            return ErrorCategory.AUTHENTICATION_ERROR
-        elif any(term in error_str for term in ["rate_limit", "429", "quota", "throttled"]):
-            return ErrorCategory.RATE_LIMIT_ERROR
-        elif any(term in error_str for term in ["network", "connection", "502", "503", "504"]):
-            return ErrorCategory.NETWORK_ERROR
-        elif any(term in error_str for term in ["timeout", "timed out"]):
-            return ErrorCategory.TIMEOUT_ERROR
-        elif any(term in error_str for term in ["parse", "json", "xml", "format"]):
-            return ErrorCategory.PARSING_ERROR
-        elif any(term in error_str for term in ["file", "path", "directory", "permission"]):
-            return ErrorCategory.FILE_ERROR
-        elif any(term in error_str for term in ["config", "setting", "environment"]):
-            return ErrorCategory.CONFIGURATION_ERROR
-        elif any(term in error_str for term in ["validation", "invalid", "format"]):
-            return ErrorCategory.VALIDATION_ERROR
-        elif "api" in error_str:
-            return ErrorCategory.API_ERROR
-        else:
-            return ErrorCategory.UNKNOWN_ERROR
+        for pattern, category in _CATEGORY_PATTERNS:
+            if pattern.search(error_str):
+                return category
+        return ErrorCategory.UNKNOWN_ERROR
     
     def determine_severity(self, error: Exception, category: ErrorCategory) -> ErrorSeverity:
         """Determine error severity based on category and impact"""
-        severity_map = {
-            ErrorCategory.AUTHENTICATION_ERROR: ErrorSeverity.HIGH,
-            ErrorCategory.CONFIGURATION_ERROR: ErrorSeverity.HIGH,
-            ErrorCategory.RATE_LIMIT_ERROR: ErrorSeverity.MEDIUM,
-            ErrorCategory.API_ERROR: ErrorSeverity.MEDIUM,
-            ErrorCategory.NETWORK_ERROR: ErrorSeverity.MEDIUM,
-            ErrorCategory.TIMEOUT_ERROR: ErrorSeverity.MEDIUM,
-            ErrorCategory.PARSING_ERROR: ErrorSeverity.LOW,
-            ErrorCategory.FILE_ERROR: ErrorSeverity.LOW,
-            ErrorCategory.VALIDATION_ERROR: ErrorSeverity.LOW,
-            ErrorCategory.UNKNOWN_ERROR: ErrorSeverity.MEDIUM,
-        }
-        return severity_map.get(category, ErrorSeverity.MEDIUM)
+        return _SEVERITY_BY_CATEGORY.get(category, ErrorSeverity.MEDIUM)
     
     def generate_resolution_suggestions(self, error: Exception, category: ErrorCategory) -> List[str]:
         """Generate helpful resolution suggestions based on error category"""
-        suggestions_map = {
-            ErrorCategory.AUTHENTICATION_ERROR: [
-                "Check your API keys in the .env file",
-                "Verify API key permissions and quotas",
-                "Ensure API keys are not expired",
-                "Try regenerating your API keys"
-            ],
-            ErrorCategory.RATE_LIMIT_ERROR: [
-                "Wait before retrying the request",
-                "Consider upgrading your API plan",
-                "Implement exponential backoff in your requests",
-                "Reduce the frequency of API calls"
-            ],
-            ErrorCategory.NETWORK_ERROR: [
-                "Check your internet connection",
-                "Try again after a few minutes",
-                "Check if the service is experiencing downtime",
-                "Consider using a VPN if blocked by geographic restrictions"
-            ],
-            ErrorCategory.TIMEOUT_ERROR: [
-                "Increase timeout settings",
-                "Check network connectivity",
-                "Try with a smaller request payload",
-                "Consider breaking large requests into smaller chunks"
-            ],
-            ErrorCategory.CONFIGURATION_ERROR: [
-                "Review configuration settings",
-                "Check environment variables",
-                "Validate configuration file syntax",
-                "Refer to configuration documentation"
-            ],
-            ErrorCategory.FILE_ERROR: [
-                "Check file permissions",
-                "Verify file path exists",
-                "Ensure sufficient disk space",
-                "Check file is not in use by another process"
-            ]
-        }
-        return suggestions_map.get(category, ["Check logs for more details", "Try restarting the application"])
+        return list(_SUGGESTIONS_MAP.get(category, _DEFAULT_SUGGESTIONS))
     
     def record_error(self, error: Exception, context: Dict[str, Any] = None) -> str:
         """Record an error event with full context and analysis"""
         context = context or {}
+        now_ts = time.time()
+        
+        error_type = type(error).__name__
+        error_message = str(error)
         
         # Generate unique error ID
-        error_content = f"{type(error).__name__}:{str(error)}:{context.get('function', 'unknown')}"
+        error_content = f"{error_type}:{error_message}:{context.get('function', 'unknown')}"
         error_id = hashlib.md5(error_content.encode()).hexdigest()[:8]
         
-        # Categorize and analyze error
-        category = self.categorize_error(error)
-        severity = self.determine_severity(error, category)
-        suggestions = self.generate_resolution_suggestions(error, category)
-        
-        # Check if this is a duplicate error
-        existing_error = next((e for e in self.errors if e.error_id == error_id), None)
-        
-        if existing_error:
+        # Duplicate errors only bump the count; no re-analysis needed
+        existing_error = self.errors.get(error_id)
+        if existing_error is not None:
             existing_error.count += 1
-            existing_error.timestamp = datetime.now().isoformat()
+            existing_error.timestamp = now_ts
+            self._last_seen.move_to_end(error_id)
             logger.warning(f"Duplicate error recorded (count: {existing_error.count}): {error_id}")
         else:
+            # Categorize and analyze error
+            category = self.categorize_error(error, error_message)
+            severity = self.determine_severity(error, category)
+            suggestions = self.generate_resolution_suggestions(error, category)
+            
             # Create new error event
             error_event = ErrorEvent(
-                timestamp=datetime.now().isoformat(),
+                timestamp=now_ts,
                 error_id=error_id,
                 category=category,
                 severity=severity,
-                message=str(error),
+                message=error_message,
                 details={
-                    "error_type": type(error).__name__,
+                    "error_type": error_type,
                     "args": str(error.args) if error.args else "",
                     "module": getattr(error, '__module__', 'unknown')
                 },
                 stack_trace=traceback.format_exc(),
-                context=context,
+                context=dict(context),
                 user_impact=self._assess_user_impact(category, severity),
                 resolution_suggestions=suggestions
             )
             
-            self.errors.append(error_event)
+            self.errors[error_id] = error_event
+            self._last_seen[error_id] = error_event
             
             # Maintain max errors limit
             if len(self.errors) > self.max_errors:
-                self.errors.pop(0)
+                evicted_id, _ = self.errors.popitem(last=False)
+                del self._last_seen[evicted_id]
             
             # Update statistics
             self._update_stats(category, severity)
@@ -207,68 +290,61 @@ class ErrorMonitor:
             self._log_error(error_event)
             
             # Check for alert conditions
-            self._check_alert_conditions(error_event)
+            self._check_alert_conditions(error_event, now_ts)
+            
+            # Queue for background persistence
+            if self.persist_path:
+                self._queue_for_flush(error_event)
         
         return error_id
     
     def _assess_user_impact(self, category: ErrorCategory, severity: ErrorSeverity) -> str:
         """Assess the impact of the error on user experience"""
-        impact_matrix = {
-            (ErrorCategory.AUTHENTICATION_ERROR, ErrorSeverity.HIGH): "Complete service failure - users cannot access any functionality",
-            (ErrorCategory.RATE_LIMIT_ERROR, ErrorSeverity.MEDIUM): "Temporary slowdown - users may experience delays",
-            (ErrorCategory.NETWORK_ERROR, ErrorSeverity.MEDIUM): "Intermittent failures - some requests may fail",
-            (ErrorCategory.API_ERROR, ErrorSeverity.MEDIUM): "Feature degradation - some features may not work",
-            (ErrorCategory.PARSING_ERROR, ErrorSeverity.LOW): "Minor data issues - some results may be incomplete",
-        }
-        
-        return impact_matrix.get((category, severity), "Minimal impact on user experience")
+        return _IMPACT_MATRIX.get((category, severity), "Minimal impact on user experience")
     
     def _update_stats(self, category: ErrorCategory, severity: ErrorSeverity):
         """Update error statistics"""
-        category_key = category.value
-        severity_key = severity.value
-        
-        if category_key not in self.error_stats:
-            self.error_stats[category_key] = {}
-        
-        if severity_key not in self.error_stats[category_key]:
-            self.error_stats[category_key][severity_key] = 0
-        
-        self.error_stats[category_key][severity_key] += 1
+        self.error_stats[category.value][severity.value] += 1
+    
+    def get_error_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get error statistics as plain dicts (category -> severity -> count)"""
+        return {category: dict(counts) for category, counts in self.error_stats.items()}
     
     def _log_error(self, error_event: ErrorEvent):
         """Log error with appropriate level and formatting"""
         log_message = f"[{error_event.error_id}] {error_event.message}"
         
         if error_event.severity == ErrorSeverity.CRITICAL:
-            logger.critical(log_message, extra={"error_event": asdict(error_event)})
+            logger.critical(log_message, extra={"error_event": error_event.to_dict()})
         elif error_event.severity == ErrorSeverity.HIGH:
-            logger.error(log_message, extra={"error_event": asdict(error_event)})
+            logger.error(log_message, extra={"error_event": error_event.to_dict()})
         elif error_event.severity == ErrorSeverity.MEDIUM:
-            logger.warning(log_message, extra={"error_event": asdict(error_event)})
+            logger.warning(log_message, extra={"error_event": error_event.to_dict()})
         else:
-            logger.info(log_message, extra={"error_event": asdict(error_event)})
+            logger.info(log_message, extra={"error_event": error_event.to_dict()})
     
-    def _check_alert_conditions(self, error_event: ErrorEvent):
+    def _check_alert_conditions(self, error_event: ErrorEvent, now_ts: float):
         """Check if error conditions warrant alerts"""
         threshold = self.alert_thresholds.get(error_event.severity, 10)
-        recent_errors = [
-            e for e in self.errors 
-            if e.category == error_event.category 
-            and e.severity == error_event.severity
-            and self._is_recent(e.timestamp, hours=1)
-        ]
+        window = self._alert_windows[(error_event.category, error_event.severity)]
+        window.append(now_ts)
         
-        if len(recent_errors) >= threshold:
-            self._send_alert(error_event, len(recent_errors))
+        cutoff = now_ts - self.alert_window_seconds
+        while window and window[0] < cutoff:
+            window.popleft()
+        
+        if len(window) >= threshold:
+            self._send_alert(error_event, len(window))
     
-    def _is_recent(self, timestamp_str: str, hours: int = 1) -> bool:
-        """Check if timestamp is within recent time window"""
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str)
-            return datetime.now() - timestamp <= timedelta(hours=hours)
-        except:
-            return False
+    def _recent_errors(self, cutoff: float) -> List[ErrorEvent]:
+        """Get errors last seen at or after the cutoff timestamp, least recently seen first"""
+        recent = []
+        for error in reversed(self._last_seen.values()):
+            if error.timestamp < cutoff:
+                break
+            recent.append(error)
+        recent.reverse()
+        return recent
     
     def _send_alert(self, error_event: ErrorEvent, count: int):
         """Send alert for critical error conditions"""
@@ -280,52 +356,86 @@ class ErrorMonitor:
             "suggestions": error_event.resolution_suggestions
         })
     
+    def _queue_for_flush(self, error_event: ErrorEvent):
+        """Queue an error event for the background writer"""
+        with self._pending_lock:
+            self._pending.append(error_event)
+            if len(self._pending) >= self.flush_batch_size:
+                self._flush_event.set()
+    
+    def _flush_loop(self):
+        """Background loop flushing pending events every batch or interval until closed"""
+        while not self._closing:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Failed to persist error events: {e}")
+    
+    def close(self):
+        """Stop the background writer and persist any events still pending"""
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            self._closing = True
+            self._flush_event.set()
+            self._flush_thread.join()
+        self.flush()
+    
+    def flush(self):
+        """Append all pending error events to the persistence file as JSONL"""
+        if not self.persist_path:
+            return
+        
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        lines = "".join(json.dumps(e.to_dict(), cls=_ReportEncoder) + "\n" for e in batch)
+        with open(self.persist_path, 'a', buffering=1 << 20) as f:
+            f.write(lines)
+    
     def get_error_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get comprehensive error summary for specified time period"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_errors = [
-            e for e in self.errors 
-            if self._is_recent(e.timestamp, hours)
-        ]
+        recent_errors = self._recent_errors(time.time() - hours * 3600)
+        
+        # Count by severity, category and error ID in a single pass
+        severity_counts = Counter()
+        category_counts = Counter()
+        error_counts = Counter()
+        first_seen: Dict[str, ErrorEvent] = {}
+        for error in recent_errors:
+            severity_counts[error.severity] += 1
+            category_counts[error.category] += 1
+            error_counts[error.error_id] += 1
+            first_seen.setdefault(error.error_id, error)
         
         summary = {
             "time_period": f"Last {hours} hours",
             "total_errors": len(recent_errors),
-            "unique_errors": len(set(e.error_id for e in recent_errors)),
-            "by_severity": {},
-            "by_category": {},
+            "unique_errors": len(error_counts),
+            "by_severity": {
+                severity.value: severity_counts[severity]
+                for severity in ErrorSeverity if severity_counts[severity]
+            },
+            "by_category": {
+                category.value: category_counts[category]
+                for category in ErrorCategory if category_counts[category]
+            },
             "top_errors": [],
             "recommendations": []
         }
         
-        # Count by severity
-        for severity in ErrorSeverity:
-            count = len([e for e in recent_errors if e.severity == severity])
-            if count > 0:
-                summary["by_severity"][severity.value] = count
-        
-        # Count by category
-        for category in ErrorCategory:
-            count = len([e for e in recent_errors if e.category == category])
-            if count > 0:
-                summary["by_category"][category.value] = count
-        
         # Get top recurring errors
-        error_counts = {}
-        for error in recent_errors:
-            error_counts[error.error_id] = error_counts.get(error.error_id, 0) + 1
-        
-        top_errors = sorted(error_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        for error_id, count in top_errors:
-            error_details = next((e for e in recent_errors if e.error_id == error_id), None)
-            if error_details:
-                summary["top_errors"].append({
-                    "error_id": error_id,
-                    "count": count,
-                    "message": error_details.message[:100],
-                    "severity": error_details.severity.value,
-                    "category": error_details.category.value
-                })
+        for error_id, count in error_counts.most_common(5):
+            error_details = first_seen[error_id]
+            summary["top_errors"].append({
+                "error_id": error_id,
+                "count": count,
+                "message": error_details.message[:100],
+                "severity": error_details.severity.value,
+                "category": error_details.category.value
+            })
         
         # Generate overall recommendations
         if summary["total_errors"] > 50:
@@ -339,24 +449,23 @@ class ErrorMonitor:
     
     def export_error_report(self, filepath: str, hours: int = 24):
         """Export detailed error report to JSON file"""
+        now = datetime.now()
+        cutoff = now.timestamp() - hours * 3600
         report = {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now.isoformat(),
             "summary": self.get_error_summary(hours),
-            "detailed_errors": [
-                asdict(e) for e in self.errors 
-                if self._is_recent(e.timestamp, hours)
-            ]
+            "detailed_errors": [e.to_dict() for e in self._recent_errors(cutoff)]
         }
         
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
         with open(filepath, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+            json.dump(report, f, indent=2, cls=_ReportEncoder)
         
         logger.info(f"Error report exported to {filepath}")
 
 
-# Global error monitor instance
-error_monitor = ErrorMonitor()
+# Global error monitor instance (set ERROR_LOG_PATH to persist events as JSONL)
+error_monitor = ErrorMonitor(persist_path=os.getenv("ERROR_LOG_PATH"))
 
 
 def error_handler(
@@ -375,6 +484,12 @@ def error_handler(
             pass
     """
     def decorator(func: Callable) -> Callable:
+        # Static part of the error context, built once per decorated function
+        base_context = {
+            "function": func.__name__,
+            "module": func.__module__,
+        }
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
@@ -382,8 +497,7 @@ def error_handler(
             except Exception as e:
                 # Create enriched context
                 enriched_context = {
-                    "function": func.__name__,
-                    "module": func.__module__,
+                    **base_context,
                     "args_count": len(args),
                     "kwargs_keys": list(kwargs.keys()),
                     **(context or {})
@@ -419,10 +533,18 @@ def with_retry(
             pass
     """
     def decorator(func: Callable) -> Callable:
+        base_context = {
+            "function": func.__name__,
+            "max_retries": max_retries,
+            "is_retry": True
+        }
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             last_exception = None
             current_delay = delay
+            # One context dict per call; record_error snapshots it for new events
+            retry_context = dict(base_context)
             
             for attempt in range(max_retries + 1):
                 try:
@@ -431,12 +553,8 @@ def with_retry(
                     last_exception = e
                     
                     # Record retry attempt
-                    error_monitor.record_error(e, {
-                        "function": func.__name__,
-                        "attempt": attempt + 1,
-                        "max_retries": max_retries,
-                        "is_retry": True
-                    })
+                    retry_context["attempt"] = attempt + 1
+                    error_monitor.record_error(e, retry_context)
                     
                     if attempt < max_retries:
                         if on_retry:
@@ -453,6 +571,29 @@ def with_retry(
     return decorator
 
 
+def _ttl_cache(ttl: float):
+    """Cache a zero-argument function's result for ``ttl`` seconds"""
+    def decorator(func: Callable[[], Any]) -> Callable[[], Any]:
+        cached_value = None
+        expires_at = 0.0
+        
+        @functools.wraps(func)
+        def wrapper():
+            nonlocal cached_value, expires_at
+            now = time.monotonic()
+            if now >= expires_at:
+                cached_value = func()
+                expires_at = now + ttl
+            return cached_value
+        return wrapper
+    return decorator
+
+
+# Shared by every run_health_checks call (threads start on first use); a check that
+# overruns its timeout keeps only its own worker busy
+_health_check_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health-check")
+
+
 class HealthChecker:
     """System health monitoring"""
     
@@ -470,16 +611,29 @@ class HealthChecker:
             "last_check": None
         }
     
+    @staticmethod
+    def _timed_check(check_func: Callable[[], bool]) -> Tuple[bool, float]:
+        """Run a check function and return its result with duration in seconds"""
+        start_time = time.perf_counter()
+        result = check_func()
+        return result, time.perf_counter() - start_time
+    
     def run_health_checks(self) -> Dict[str, Any]:
-        """Run all registered health checks"""
+        """Run all registered health checks concurrently, honouring each check's timeout"""
         results = {}
         overall_healthy = True
         
-        for name, check_config in self.health_checks.items():
+        futures = {
+            name: _health_check_executor.submit(self._timed_check, check_config["function"])
+            for name, check_config in self.health_checks.items()
+        }
+        started = time.perf_counter()
+        
+        for name, future in futures.items():
+            check_config = self.health_checks[name]
+            remaining = check_config["timeout"] - (time.perf_counter() - started)
             try:
-                start_time = time.time()
-                result = check_config["function"]()
-                duration = time.time() - start_time
+                result, duration = future.result(timeout=max(remaining, 0))
                 
                 results[name] = {
                     "healthy": result,
@@ -494,6 +648,8 @@ class HealthChecker:
                     overall_healthy = False
                     
             except Exception as e:
+                if isinstance(e, FutureTimeoutError):
+                    e = TimeoutError(f"Health check timed out after {check_config['timeout']}s")
                 results[name] = {
                     "healthy": False,
                     "error": str(e),
@@ -534,12 +690,14 @@ def setup_default_health_checks():
         except ValueError:
             return False
     
+    @_ttl_cache(ttl=5.0)
     def check_disk_space():
         """Check available disk space"""
         import shutil
         free_space_gb = shutil.disk_usage('.').free / (1024**3)
         return free_space_gb > 1.0  # At least 1GB free
     
+    @_ttl_cache(ttl=5.0)
     def check_memory_usage():
         """Check memory usage"""
         import psutil
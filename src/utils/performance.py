@@ -5,19 +5,26 @@ Advanced performance monitoring, optimization, and caching system for the
 Competitor Research Agent.
 """
 
+import atexit
+import os
+import sys
 import time
 import functools
 import hashlib
 import json
 import pickle
 import gzip
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Callable, Union, Tuple
+import re
+import string
+import struct
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Callable, Union, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import queue
+from collections import OrderedDict, defaultdict, deque
 import asyncio
 import aiohttp
 import sqlite3
@@ -25,6 +32,51 @@ from contextlib import contextmanager
 
 from src.utils.logger import logger
 
+try:
+    import zstandard
+except ImportError:  # Optional: fall back to gzip compression
+    zstandard = None
+
+try:
+    import xxhash
+except ImportError:  # Optional: fall back to hashlib.blake2b for cache keys
+    xxhash = None
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+_MAXRSS_PER_MB = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+
+# Cache record layout: pickle length, out-of-band buffer count, buffer lengths,
+# then the (optionally compressed) pickle stream followed by the raw buffers
+_RECORD_HEADER = struct.Struct("<QI")
+
+# Bumped whenever the cache database layout changes (stored in PRAGMA user_version)
+_SCHEMA_VERSION = 3
+
+# Cache records are appended to segment logs; a segment is sealed once it grows past
+# this size and compacted once less than half of its bytes are still referenced
+_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+_SEGMENT_MIN_LIVE_RATIO = 0.5
+
+# Values of the cache_segments.state column. Each segment is appended to only by the
+# process that claimed it, and compacted by whichever process first marks it compacting
+_SEGMENT_ACTIVE, _SEGMENT_SEALED, _SEGMENT_COMPACTING = 0, 1, 2
+
+# Values of the cache_metadata.compressed column
+_CODEC_NONE, _CODEC_GZIP, _CODEC_ZSTD = 0, 1, 2
+
+
+def _peak_memory_mb() -> float:
+    """Peak resident memory of this process in MB (0 when unavailable)"""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / _MAXRSS_PER_MB
+
 
 @dataclass
 class PerformanceMetrics:
@@ -33,23 +85,75 @@ class PerformanceMetrics:
     execution_time: float
     memory_before: float
     memory_after: float
-    timestamp: str
+    timestamp: float
     success: bool
     error_message: Optional[str] = None
     cache_hit: bool = False
     optimization_applied: bool = False
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Timestamp formatted as an ISO 8601 string"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+
+# dataclass(slots=True) requires Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class FunctionStats:
+    """Aggregated call statistics for a single function"""
+    total_calls: int = 0
+    successful_calls: int = 0
+    failed_calls: int = 0
+    total_time: float = 0.0
+    min_time: float = float('inf')
+    max_time: float = 0.0
+    cache_hits: int = 0
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Convert to a dict including the derived average time and cache hit rate"""
+        return {
+            'total_calls': self.total_calls,
+            'successful_calls': self.successful_calls,
+            'failed_calls': self.failed_calls,
+            'total_time': self.total_time,
+            'avg_time': self.total_time / self.total_calls if self.total_calls else 0.0,
+            'min_time': self.min_time,
+            'max_time': self.max_time,
+            'cache_hits': self.cache_hits,
+            'cache_hit_rate': self.cache_hits / self.total_calls * 100 if self.total_calls else 0.0
+        }
 
 
 class PerformanceMonitor:
     """Advanced performance monitoring and optimization"""
     
-    def __init__(self, max_metrics: int = 10000):
+    def __init__(self, max_metrics: int = 10000, shard_count: int = 16):
         self.max_metrics = max_metrics
-        self.metrics: List[PerformanceMetrics] = []
-        self.function_stats: Dict[str, Dict[str, float]] = {}
+        self.metrics: "deque[PerformanceMetrics]" = deque(maxlen=max_metrics)
         self.slow_functions: Dict[str, int] = {}
         self.optimization_suggestions: Dict[str, List[str]] = {}
+        # Guards self.metrics only; function stats are sharded by function name
         self._lock = threading.Lock()
+        self._shard_count = shard_count
+        self._shard_locks = [threading.Lock() for _ in range(shard_count)]
+        self._shard_stats: List[Dict[str, FunctionStats]] = [
+            defaultdict(FunctionStats) for _ in range(shard_count)
+        ]
+        # Bumped on every record so get_performance_summary can reuse its last result
+        self._stats_version = 0
+        self._cached_summaries: Dict[int, Tuple[Tuple[int, int], float, str]] = {}
+    
+    @property
+    def function_stats(self) -> Dict[str, FunctionStats]:
+        """Per-function statistics merged across all shards"""
+        merged = {}
+        for lock, shard in zip(self._shard_locks, self._shard_stats):
+            with lock:
+                merged.update(shard)
+        return merged
         
     def record_performance(self, 
                          function_name: str,
@@ -61,66 +165,52 @@ class PerformanceMonitor:
                          cache_hit: bool = False) -> None:
         """Record performance metrics for a function"""
         
-        with self._lock:
-            metrics = PerformanceMetrics(
-                function_name=function_name,
-                execution_time=execution_time,
-                memory_before=memory_before,
-                memory_after=memory_after,
-                timestamp=datetime.now().isoformat(),
-                success=success,
-                error_message=error_message,
-                cache_hit=cache_hit
-            )
-            
-            self.metrics.append(metrics)
-            
-            # Maintain max metrics limit
-            if len(self.metrics) > self.max_metrics:
-                self.metrics.pop(0)
-            
+        metrics = PerformanceMetrics(
+            function_name=function_name,
+            execution_time=execution_time,
+            memory_before=memory_before,
+            memory_after=memory_after,
+            timestamp=time.time(),
+            success=success,
+            error_message=error_message,
+            cache_hit=cache_hit
+        )
+        
+        shard = hash(function_name) % self._shard_count
+        with self._shard_locks[shard]:
             # Update function statistics
-            self._update_function_stats(function_name, execution_time, success, cache_hit)
+            self._update_function_stats(self._shard_stats[shard], function_name,
+                                        execution_time, success, cache_hit)
             
             # Check for slow functions
             if execution_time > 30.0:  # Functions taking more than 30 seconds
                 self.slow_functions[function_name] = self.slow_functions.get(function_name, 0) + 1
                 self._generate_optimization_suggestions(function_name, execution_time)
+        
+        with self._lock:
+            # Bounded deque drops the oldest metric once max_metrics is reached
+            self.metrics.append(metrics)
+            self._stats_version += 1
     
-    def _update_function_stats(self, function_name: str, execution_time: float, 
-                             success: bool, cache_hit: bool):
+    def _update_function_stats(self, shard_stats: Dict[str, FunctionStats], function_name: str,
+                             execution_time: float, success: bool, cache_hit: bool):
         """Update aggregated statistics for functions"""
-        if function_name not in self.function_stats:
-            self.function_stats[function_name] = {
-                'total_calls': 0,
-                'successful_calls': 0,
-                'failed_calls': 0,
-                'total_time': 0.0,
-                'avg_time': 0.0,
-                'min_time': float('inf'),
-                'max_time': 0.0,
-                'cache_hits': 0,
-                'cache_hit_rate': 0.0
-            }
-        
-        stats = self.function_stats[function_name]
-        stats['total_calls'] += 1
+        stats = shard_stats[function_name]
+        stats.total_calls += 1
         
         if success:
-            stats['successful_calls'] += 1
+            stats.successful_calls += 1
         else:
-            stats['failed_calls'] += 1
+            stats.failed_calls += 1
         
-        stats['total_time'] += execution_time
-        stats['avg_time'] = stats['total_time'] / stats['total_calls']
-        stats['min_time'] = min(stats['min_time'], execution_time)
-        stats['max_time'] = max(stats['max_time'], execution_time)
+        stats.total_time += execution_time
+        if execution_time < stats.min_time:
+            stats.min_time = execution_time
+        if execution_time > stats.max_time:
+            stats.max_time = execution_time
         
         if cache_hit:
-            stats['cache_hits'] += 1
-        
-        if stats['total_calls'] > 0:
-            stats['cache_hit_rate'] = stats['cache_hits'] / stats['total_calls'] * 100
+            stats.cache_hits += 1
     
     def _generate_optimization_suggestions(self, function_name: str, execution_time: float):
         """Generate optimization suggestions for slow functions"""
@@ -158,16 +248,38 @@ class PerformanceMonitor:
     
     def get_performance_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get comprehensive performance summary"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff = time.time() - hours * 3600
         
-        recent_metrics = [
-            m for m in self.metrics 
-            if datetime.fromisoformat(m.timestamp) >= cutoff_time
-        ]
+        # Metrics are appended in time order, so walk back from the newest
+        recent_metrics = []
+        with self._lock:
+            # The length check also catches callers clearing self.metrics directly
+            version = (self._stats_version, len(self.metrics))
+            cached = self._cached_summaries.get(hours)
+            if cached is not None:
+                cached_version, oldest, summary_json = cached
+                # Still valid while nothing was recorded and no metric has aged out of the window
+                if cached_version == version and oldest >= cutoff:
+                    return json.loads(summary_json)
+            
+            for m in reversed(self.metrics):
+                if m.timestamp < cutoff:
+                    break
+                recent_metrics.append(m)
+        recent_metrics.reverse()
         
         if not recent_metrics:
             return {"message": "No performance data available for the specified period"}
         
+        summary = self._build_summary(recent_metrics, hours)
+        # Serialized immediately, so later mutations cannot leak into the cached copy
+        summary_json = json.dumps(summary)
+        with self._lock:
+            self._cached_summaries[hours] = (version, recent_metrics[0].timestamp, summary_json)
+        return summary
+    
+    def _build_summary(self, recent_metrics: List[PerformanceMetrics], hours: int) -> Dict[str, Any]:
+        """Build the performance summary for metrics within the requested window"""
         # Calculate overall statistics
         total_execution_time = sum(m.execution_time for m in recent_metrics)
         avg_execution_time = total_execution_time / len(recent_metrics)
@@ -195,13 +307,15 @@ class PerformanceMonitor:
                 {
                     "function": call.function_name,
                     "execution_time": call.execution_time,
-                    "timestamp": call.timestamp,
+                    "timestamp": call.timestamp_iso,
                     "success": call.success,
                     "cache_hit": call.cache_hit
                 }
                 for call in slowest_calls
             ],
-            "function_statistics": dict(self.function_stats),
+            "function_statistics": {
+                name: stats.to_dict() for name, stats in self.function_stats.items()
+            },
             "optimization_suggestions": dict(self.optimization_suggestions)
         }
 
@@ -209,20 +323,35 @@ class PerformanceMonitor:
 class IntelligentCache:
     """Intelligent caching system with TTL, compression, and smart eviction"""
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 3600, cache_dir: str = "cache"):
+    def __init__(self, max_size: int = 1000, default_ttl: int = 3600, cache_dir: str = "cache",
+                 memory_size: Optional[int] = None, shard_count: int = 16):
         self.max_size = max_size
         self.default_ttl = default_ttl
+        self.memory_size = memory_size or max_size
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         
-        # In-memory cache for frequently accessed items
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
+        # In-memory LRU cache of (expires_at monotonic, data) for frequently accessed items,
+        # split into independently locked shards (shard_count must be a power of two)
+        self._shard_count = shard_count
+        self._shard_size = max(1, -(-self.memory_size // shard_count))
+        self._memory_shards: List["OrderedDict[str, Tuple[float, Any]]"] = [
+            OrderedDict() for _ in range(shard_count)
+        ]
+        self._memory_locks = [threading.Lock() for _ in range(shard_count)]
+        # Memory-tier hits per shard, counted under that shard's lock
+        self._memory_hits = [0] * shard_count
+        
+        # Per-function caches layered in front of this one by performance_tracker,
+        # as (lock, OrderedDict) pairs, so clear() empties them too
+        self._local_caches: List[Tuple[threading.Lock, "OrderedDict[str, Tuple[float, Any]]"]] = []
         
-        # SQLite for persistent cache metadata
+        # SQLite for persistent cache metadata (one long-lived connection per thread)
         self.db_path = self.cache_dir / "cache_metadata.db"
+        self._tls = threading.local()
         self._init_database()
         
-        # Cache statistics
+        # Cache statistics for the persistent tier, updated while holding self._lock
         self.stats = {
             'hits': 0,
             'misses': 0,
@@ -230,123 +359,382 @@ class IntelligentCache:
             'compressions': 0
         }
         
+        # Guards the persistent (SQLite + segment log) tier
         self._lock = threading.Lock()
+        
+        # Open segment log file descriptors by file_id; appends go to the segment this
+        # process claimed, since other processes sharing cache_dir append to their own
+        self._segments: Dict[int, int] = {}
+        self._active_segment: Optional[int] = None
+        # Segments this process has rolled over from, sealed once their rows are committed
+        self._unsealed: List[int] = []
+        
+        # Disk writes are deferred to a single background writer thread
+        self._write_q: "queue.Queue[Optional[Tuple[str, List[Any], int, int]]]" = queue.Queue(maxsize=1024)
+        self._writer = threading.Thread(target=self._writer_loop, name="cache-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+    
+    def register_local_cache(self, lock: threading.Lock, cache: "OrderedDict[str, Tuple[float, Any]]"):
+        """Register an in-process cache kept in front of this one, keyed by unhashed keys"""
+        with self._lock:
+            self._local_caches.append((lock, cache))
+    
+    def _memory_shard(self, cache_key: str) -> int:
+        """Get the memory shard index for a hex cache key"""
+        return int(cache_key[:8], 16) & (self._shard_count - 1)
+    
+    def _memory_discard(self, cache_key: str):
+        """Remove a key from the memory tier if present"""
+        shard = self._memory_shard(cache_key)
+        with self._memory_locks[shard]:
+            self._memory_shards[shard].pop(cache_key, None)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's SQLite connection, opening it in WAL mode on first use"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._tls.conn = conn
+        return conn
     
     def _init_database(self):
         """Initialize SQLite database for cache metadata"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cache_metadata (
-                    key TEXT PRIMARY KEY,
-                    filename TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP,
-                    access_count INTEGER DEFAULT 0,
-                    last_accessed TIMESTAMP,
-                    compressed BOOLEAN DEFAULT FALSE,
-                    size_bytes INTEGER DEFAULT 0
-                )
-            """)
-            conn.commit()
+        conn = self._conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            # Older layouts are simply discarded; everything here is recomputable
+            conn.execute("DROP TABLE IF EXISTS cache_metadata")
+            conn.execute("DROP TABLE IF EXISTS cache_segments")
+            for pattern in ("*.cache", "*.gz", "*.zst", "seg_*.log"):
+                for path in self.cache_dir.glob(pattern):
+                    path.unlink(missing_ok=True)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_metadata (
+                key TEXT PRIMARY KEY,
+                file_id INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at INTEGER,
+                access_count INTEGER DEFAULT 0,
+                last_accessed TIMESTAMP,
+                compressed INTEGER DEFAULT 0
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_segments (
+                file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pid INTEGER NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0
+            )
+        """)
     
     def _get_cache_key(self, key: str) -> str:
-        """Generate a safe cache key"""
-        return hashlib.sha256(key.encode()).hexdigest()
-    
-    def _get_file_path(self, cache_key: str, compressed: bool = False) -> Path:
-        """Get file path for cached data"""
-        ext = ".gz" if compressed else ".cache"
-        return self.cache_dir / f"{cache_key}{ext}"
-    
-    def _should_compress(self, data: Any) -> bool:
-        """Determine if data should be compressed"""
-        # Compress large data or specific types
-        serialized_size = len(pickle.dumps(data))
+        """Generate a safe cache key (non-cryptographic; only used for lookup)"""
+        if xxhash:
+            return xxhash.xxh3_128_hexdigest(key)
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    
+    def _segment_path(self, file_id: int) -> Path:
+        """Get the path of a segment log"""
+        return self.cache_dir / f"seg_{file_id}.log"
+    
+    def _segment_fd(self, file_id: int, create: bool = False) -> int:
+        """Get an open descriptor for a segment log, opening it on first use"""
+        fd = self._segments.get(file_id)
+        if fd is None:
+            flags = os.O_RDWR | os.O_APPEND | getattr(os, "O_BINARY", 0)
+            if create:
+                flags |= os.O_CREAT
+            fd = self._segments[file_id] = os.open(self._segment_path(file_id), flags, 0o644)
+        return fd
+    
+    def _claim_segment(self) -> int:
+        """Register a new segment owned by this process and make it the active one"""
+        if self._active_segment is not None:
+            self._unsealed.append(self._active_segment)
+        # AUTOINCREMENT never hands out an id twice, even across processes
+        self._active_segment = self._conn().execute(
+            "INSERT INTO cache_segments (pid) VALUES (?)", (os.getpid(),)
+        ).lastrowid
+        return self._segment_fd(self._active_segment, create=True)
+    
+    def _seal_segments(self):
+        """Hand rolled-over segments to compaction; call only once their rows are committed"""
+        if self._unsealed:
+            self._conn().executemany("UPDATE cache_segments SET state = ? WHERE file_id = ?",
+                                     [(_SEGMENT_SEALED, file_id) for file_id in self._unsealed])
+            self._unsealed.clear()
+    
+    def _close_segment(self, file_id: int, delete: bool = False):
+        """Close a segment log and optionally delete it"""
+        fd = self._segments.pop(file_id, None)
+        if fd is not None:
+            os.close(fd)
+        if delete:
+            self._segment_path(file_id).unlink(missing_ok=True)
+    
+    def _append_record(self, chunks: List[Any]) -> Tuple[int, int, int]:
+        """Append record chunks to the active segment and return (file_id, offset, length)"""
+        length = sum(memoryview(chunk).nbytes for chunk in chunks)
+        if self._active_segment is None:
+            fd = self._claim_segment()
+        else:
+            fd = self._segment_fd(self._active_segment)
+        offset = os.fstat(fd).st_size
+        if offset and offset + length > _SEGMENT_MAX_BYTES:
+            fd = self._claim_segment()
+            offset = 0
+        
+        # Only this process appends to its segment, and only under self._lock, so the
+        # record starts at the current end; writev normally writes it in one call, and
+        # whatever a short write leaves is written in a loop
+        written = os.writev(fd, chunks) if hasattr(os, "writev") else 0
+        if written < length:
+            remaining = memoryview(b"".join(chunks))[written:]
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+        return self._active_segment, offset, length
+    
+    def _read_record(self, file_id: int, offset: int, length: int) -> bytearray:
+        """Read a record from a segment log at the given offset"""
+        fd = self._segment_fd(file_id)
+        record = bytearray(length)
+        if hasattr(os, "preadv"):
+            read = os.preadv(fd, [record], offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            chunk = os.read(fd, length)
+            read = len(chunk)
+            record[:read] = chunk
+        if read != length:
+            raise EOFError(f"Short read from segment {file_id}")
+        return record
+    
+    def _compress(self, data: bytes) -> Tuple[bytes, int]:
+        """Compress serialized data with zstd when available, otherwise gzip"""
+        if zstandard:
+            return zstandard.compress(data, 3), _CODEC_ZSTD
+        return gzip.compress(data, compresslevel=6), _CODEC_GZIP
+    
+    def _decompress(self, data: bytes, codec: int) -> bytes:
+        """Decompress data using the codec recorded in the metadata"""
+        if codec == _CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this cache entry")
+            return zstandard.decompress(data)
+        return gzip.decompress(data)
+    
+    def _should_compress(self, serialized_size: int) -> bool:
+        """Determine if serialized data should be compressed"""
         return serialized_size > 1024  # Compress if larger than 1KB
     
-    def _store_data(self, cache_key: str, data: Any, ttl: int) -> bool:
-        """Store data to cache with optional compression"""
+    def _encode_record(self, data: Any) -> Tuple[List[Any], int]:
+        """Serialize data into record chunks and codec, keeping large buffers out-of-band"""
+        buffers: List[pickle.PickleBuffer] = []
+        serialized_data = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+        codec = _CODEC_NONE
+        # Decide from the pickle we already have instead of serializing a second time
+        if self._should_compress(len(serialized_data)):
+            serialized_data, codec = self._compress(serialized_data)
+        
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        lengths = struct.pack(f"<{len(raw_buffers)}Q", *(b.nbytes for b in raw_buffers))
+        header = _RECORD_HEADER.pack(len(serialized_data), len(raw_buffers))
+        return [header, lengths, serialized_data, *raw_buffers], codec
+    
+    def _decode_record(self, record: bytearray, codec: int) -> Any:
+        """Rebuild data from a record, passing buffer slices to pickle without copying"""
+        view = memoryview(record)
+        data_len, buffer_count = _RECORD_HEADER.unpack_from(view, 0)
+        offset = _RECORD_HEADER.size
+        lengths = struct.unpack_from(f"<{buffer_count}Q", view, offset)
+        offset += 8 * buffer_count
+        
+        serialized_data = view[offset:offset + data_len]
+        offset += data_len
+        if codec != _CODEC_NONE:
+            serialized_data = self._decompress(bytes(serialized_data), codec)
+        
+        buffers = []
+        for length in lengths:
+            buffers.append(view[offset:offset + length])
+            offset += length
+        return pickle.loads(serialized_data, buffers=buffers)
+    
+    def _store_data(self, cache_key: str, chunks: List[Any], codec: int, ttl: int) -> Optional[Tuple]:
+        """Append encoded record chunks to the segment log and return the metadata row to insert"""
         try:
-            should_compress = self._should_compress(data)
-            file_path = self._get_file_path(cache_key, should_compress)
+            # Append the chunks directly, without joining them first
+            file_id, offset, length = self._append_record(chunks)
+            if codec != _CODEC_NONE:
+                self.stats['compressions'] += 1
             
-            # Serialize data
-            serialized_data = pickle.dumps(data)
+            expires_at = int(time.time()) + ttl
+            return (cache_key, file_id, offset, length, expires_at, codec)
             
-            if should_compress:
-                # Compress data
-                compressed_data = gzip.compress(serialized_data)
-                with open(file_path, 'wb') as f:
-                    f.write(compressed_data)
-                self.stats['compressions'] += 1
-                data_size = len(compressed_data)
-            else:
-                with open(file_path, 'wb') as f:
-                    f.write(serialized_data)
-                data_size = len(serialized_data)
+        except Exception as e:
+            logger.error(f"Failed to store cache data for key {cache_key}: {e}")
+            return None
+    
+    def _writer_loop(self):
+        """Drain queued writes in batches, committing each batch in one transaction"""
+        while True:
+            batch = [self._write_q.get()]
+            try:
+                while len(batch) < 64:
+                    batch.append(self._write_q.get_nowait())
+            except queue.Empty:
+                pass
             
-            # Update database metadata
-            expires_at = datetime.now() + timedelta(seconds=ttl)
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO cache_metadata 
-                    (key, filename, expires_at, compressed, size_bytes, last_accessed)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (cache_key, file_path.name, expires_at, should_compress, data_size))
-                conn.commit()
+            stop = None in batch
+            try:
+                with self._lock:
+                    active_segment = self._active_segment
+                    rows = [self._store_data(*item) for item in batch if item is not None]
+                    rows = [row for row in rows if row is not None]
+                    if rows:
+                        conn = self._conn()
+                        conn.execute("BEGIN")
+                        try:
+                            conn.executemany("""
+                                INSERT OR REPLACE INTO cache_metadata 
+                                (key, file_id, offset, length, expires_at, compressed, last_accessed)
+                                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                            """, rows)
+                            
+                            # Manage cache size once per batch
+                            self._enforce_size_limits()
+                            conn.execute("COMMIT")
+                        except Exception:
+                            conn.execute("ROLLBACK")
+                            raise
+                    self._seal_segments()
+                    
+                    # A segment was just rolled over; reclaim space from mostly-dead ones
+                    if self._active_segment != active_segment:
+                        self._compact_segments()
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} cache entries: {e}")
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+            
+            if stop:
+                return
+    
+    def flush(self):
+        """Block until all queued writes have reached disk"""
+        if self._writer.is_alive():
+            self._write_q.join()
+    
+    def close(self):
+        """Drain pending writes, stop the background writer and close segment logs"""
+        if self._writer.is_alive():
+            self._write_q.put(None)
+            self._writer.join()
+        with self._lock:
+            # Hand every segment of this process over to compaction by any process
+            if self._active_segment is not None:
+                self._unsealed.append(self._active_segment)
+                self._active_segment = None
+            try:
+                self._seal_segments()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to seal cache segments: {e}")
+            for file_id in list(self._segments):
+                self._close_segment(file_id)
+    
+    def _compact_segments(self):
+        """Rewrite live records out of sealed segments that are mostly dead, then delete them"""
+        try:
+            conn = self._conn()
+            live_bytes = dict(conn.execute(
+                "SELECT file_id, SUM(length) FROM cache_metadata GROUP BY file_id"
+            ).fetchall())
             
-            return True
+            # The active segment is only reset once nothing in it is referenced
+            if self._active_segment is not None and not live_bytes.get(self._active_segment):
+                os.ftruncate(self._segment_fd(self._active_segment), 0)
             
+            sealed = [row[0] for row in conn.execute(
+                "SELECT file_id FROM cache_segments WHERE state = ?", (_SEGMENT_SEALED,)
+            ).fetchall()]
+            for file_id in sealed:
+                path = self._segment_path(file_id)
+                size = path.stat().st_size if path.exists() else 0
+                if size and live_bytes.get(file_id, 0) / size >= _SEGMENT_MIN_LIVE_RATIO:
+                    continue
+                
+                # Another process sharing cache_dir may be compacting the same segment
+                claimed = conn.execute(
+                    "UPDATE cache_segments SET state = ? WHERE file_id = ? AND state = ?",
+                    (_SEGMENT_COMPACTING, file_id, _SEGMENT_SEALED)
+                ).rowcount
+                if not claimed:
+                    continue
+                
+                rows = conn.execute(
+                    "SELECT key, offset, length FROM cache_metadata WHERE file_id = ?", (file_id,)
+                ).fetchall()
+                moved = []
+                for cache_key, offset, length in rows:
+                    record = self._read_record(file_id, offset, length)
+                    new_file_id, new_offset, _ = self._append_record([record])
+                    moved.append((new_file_id, new_offset, cache_key, file_id, offset))
+                
+                # Entries rewritten by another process in the meantime are left alone
+                conn.execute("BEGIN")
+                conn.executemany("""
+                    UPDATE cache_metadata SET file_id = ?, offset = ?
+                    WHERE key = ? AND file_id = ? AND offset = ?
+                """, moved)
+                conn.execute("DELETE FROM cache_segments WHERE file_id = ?", (file_id,))
+                conn.execute("COMMIT")
+                self._close_segment(file_id, delete=True)
+            self._seal_segments()
+        
         except Exception as e:
-            logger.error(f"Failed to store cache data for key {cache_key}: {e}")
-            return False
+            logger.error(f"Failed to compact cache segments: {e}")
     
     def _load_data(self, cache_key: str) -> Optional[Any]:
         """Load data from cache"""
         try:
             # Check metadata first
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT filename, expires_at, compressed, access_count
-                    FROM cache_metadata 
-                    WHERE key = ?
-                """, (cache_key,))
-                result = cursor.fetchone()
+            conn = self._conn()
+            cursor = conn.execute("""
+                SELECT file_id, offset, length, expires_at, compressed
+                FROM cache_metadata 
+                WHERE key = ?
+            """, (cache_key,))
+            result = cursor.fetchone()
             
             if not result:
                 return None
             
-            filename, expires_at_str, compressed, access_count = result
-            
-            # Check if expired
-            if expires_at_str:
-                expires_at = datetime.fromisoformat(expires_at_str)
-                if datetime.now() > expires_at:
-                    self._remove_cache_entry(cache_key)
-                    return None
+            file_id, offset, length, expires_at, codec = result
             
-            # Load data from file
-            file_path = self.cache_dir / filename
-            if not file_path.exists():
+            # Check if expired (expires_at is a Unix timestamp)
+            if expires_at is not None and time.time() > expires_at:
                 self._remove_cache_entry(cache_key)
                 return None
             
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-            
-            if compressed:
-                raw_data = gzip.decompress(raw_data)
-            
-            data = pickle.loads(raw_data)
+            # Read the record straight out of its segment log
+            record = self._read_record(file_id, offset, length)
+            data = self._decode_record(record, codec)
             
             # Update access statistics
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    UPDATE cache_metadata 
-                    SET access_count = access_count + 1, last_accessed = CURRENT_TIMESTAMP
-                    WHERE key = ?
-                """, (cache_key,))
-                conn.commit()
+            conn = self._conn()
+            conn.execute("""
+                UPDATE cache_metadata 
+                SET access_count = access_count + 1, last_accessed = CURRENT_TIMESTAMP
+                WHERE key = ?
+            """, (cache_key,))
             
             return data
             
@@ -356,48 +744,56 @@ class IntelligentCache:
             return None
     
     def _remove_cache_entry(self, cache_key: str):
-        """Remove cache entry and associated files"""
+        """Remove a cache entry; its segment bytes are reclaimed by compaction"""
         try:
-            # Get filename from database
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT filename FROM cache_metadata WHERE key = ?", (cache_key,))
-                result = cursor.fetchone()
-                
-                if result:
-                    filename = result[0]
-                    file_path = self.cache_dir / filename
-                    
-                    # Remove file
-                    if file_path.exists():
-                        file_path.unlink()
-                    
-                    # Remove from database
-                    conn.execute("DELETE FROM cache_metadata WHERE key = ?", (cache_key,))
-                    conn.commit()
-                    
-                    self.stats['evictions'] += 1
+            conn = self._conn()
+            cursor = conn.execute("DELETE FROM cache_metadata WHERE key = ?", (cache_key,))
+            if cursor.rowcount:
+                self.stats['evictions'] += 1
             
             # Remove from memory cache
-            if cache_key in self.memory_cache:
-                del self.memory_cache[cache_key]
+            self._memory_discard(cache_key)
                 
         except Exception as e:
             logger.error(f"Failed to remove cache entry {cache_key}: {e}")
     
+    def _remove_cache_entries(self, keys: List[str]):
+        """Remove many cache entries with batched DELETE statements"""
+        if not keys:
+            return
+        
+        for cache_key in keys:
+            self._memory_discard(cache_key)
+        
+        conn = self._conn()
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM cache_metadata WHERE key IN ({placeholders})", chunk)
+        
+        self.stats['evictions'] += len(keys)
+    
     def get(self, key: str) -> Optional[Any]:
         """Get data from cache"""
+        cache_key = self._get_cache_key(key)
+        shard = self._memory_shard(cache_key)
+        memory = self._memory_shards[shard]
+        
+        # Check memory cache first; only this key's shard is locked
+        with self._memory_locks[shard]:
+            try:
+                expires_at, data = memory[cache_key]
+            except KeyError:
+                pass
+            else:
+                if expires_at > time.monotonic():
+                    memory.move_to_end(cache_key)
+                    self._memory_hits[shard] += 1
+                    return data
+                del memory[cache_key]
+        
         with self._lock:
-            cache_key = self._get_cache_key(key)
-            
-            # Check memory cache first
-            if cache_key in self.memory_cache:
-                cache_data = self.memory_cache[cache_key]
-                if datetime.now() < cache_data['expires_at']:
-                    self.stats['hits'] += 1
-                    return cache_data['data']
-                else:
-                    del self.memory_cache[cache_key]
-            
             # Check persistent cache
             data = self._load_data(cache_key)
             if data is not None:
@@ -409,106 +805,126 @@ class IntelligentCache:
     
     def set(self, key: str, data: Any, ttl: Optional[int] = None) -> bool:
         """Set data in cache"""
-        with self._lock:
-            ttl = ttl or self.default_ttl
-            cache_key = self._get_cache_key(key)
-            
-            # Store in memory cache for frequently accessed items
-            expires_at = datetime.now() + timedelta(seconds=ttl)
-            self.memory_cache[cache_key] = {
-                'data': data,
-                'expires_at': expires_at
-            }
-            
-            # Also store persistently
-            success = self._store_data(cache_key, data, ttl)
-            
-            # Manage cache size
-            self._enforce_size_limits()
-            
-            return success
+        ttl = ttl or self.default_ttl
+        cache_key = self._get_cache_key(key)
+        shard = self._memory_shard(cache_key)
+        memory = self._memory_shards[shard]
+        
+        # Store in memory cache for frequently accessed items
+        with self._memory_locks[shard]:
+            memory[cache_key] = (time.monotonic() + ttl, data)
+            memory.move_to_end(cache_key)
+            if len(memory) > self._shard_size:
+                memory.popitem(last=False)
+        
+        # Serialize now so later changes to data cannot reach the disk copy; out-of-band
+        # buffers of mutable objects are copied for the same reason
+        try:
+            chunks, codec = self._encode_record(data)
+        except Exception as e:
+            logger.error(f"Failed to serialize cache data for key {cache_key}: {e}")
+            return False
+        chunks = [chunk if memoryview(chunk).readonly else bytes(chunk) for chunk in chunks]
+        
+        # Persist in the background; losing writes is fine for a cache, so when the writer
+        # is stopped or behind the entry is only kept in memory instead of blocking here
+        try:
+            self._write_q.put_nowait((cache_key, chunks, codec, ttl))
+        except queue.Full:
+            logger.debug(f"Cache write queue full, keeping {cache_key} in memory only")
+        return True
     
     def _enforce_size_limits(self):
         """Enforce cache size limits using LRU eviction"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT COUNT(*) FROM cache_metadata")
-                count = cursor.fetchone()[0]
+            conn = self._conn()
+            cursor = conn.execute("SELECT COUNT(*) FROM cache_metadata")
+            count = cursor.fetchone()[0]
+            
+            if count > self.max_size:
+                # Remove oldest, least accessed entries
+                excess_count = count - self.max_size
+                cursor = conn.execute("""
+                    SELECT key FROM cache_metadata 
+                    ORDER BY last_accessed ASC, access_count ASC 
+                    LIMIT ?
+                """, (excess_count,))
                 
-                if count > self.max_size:
-                    # Remove oldest, least accessed entries
-                    excess_count = count - self.max_size
-                    cursor = conn.execute("""
-                        SELECT key FROM cache_metadata 
-                        ORDER BY last_accessed ASC, access_count ASC 
-                        LIMIT ?
-                    """, (excess_count,))
-                    
-                    keys_to_remove = [row[0] for row in cursor.fetchall()]
-                    for key in keys_to_remove:
-                        self._remove_cache_entry(key)
+                self._remove_cache_entries([row[0] for row in cursor.fetchall()])
         
         except Exception as e:
             logger.error(f"Failed to enforce cache size limits: {e}")
     
     def clear(self, pattern: Optional[str] = None):
         """Clear cache entries, optionally matching a pattern"""
+        self.flush()
         with self._lock:
             try:
+                conn = self._conn()
                 if pattern:
                     # Clear entries matching pattern
-                    with sqlite3.connect(self.db_path) as conn:
-                        cursor = conn.execute("SELECT key FROM cache_metadata WHERE key LIKE ?", (f"%{pattern}%",))
-                        keys_to_remove = [row[0] for row in cursor.fetchall()]
+                    cursor = conn.execute("SELECT key FROM cache_metadata WHERE key LIKE ?", (f"%{pattern}%",))
                 else:
                     # Clear all entries
-                    with sqlite3.connect(self.db_path) as conn:
-                        cursor = conn.execute("SELECT key FROM cache_metadata")
-                        keys_to_remove = [row[0] for row in cursor.fetchall()]
+                    cursor = conn.execute("SELECT key FROM cache_metadata")
                 
-                for key in keys_to_remove:
-                    self._remove_cache_entry(key)
+                rows = cursor.fetchall()
+                self._remove_cache_entries([row[0] for row in rows])
+                self._compact_segments()
                 
                 # Clear memory cache
-                if pattern:
-                    keys_to_remove = [k for k in self.memory_cache.keys() if pattern in k]
-                    for key in keys_to_remove:
-                        del self.memory_cache[key]
-                else:
-                    self.memory_cache.clear()
+                for lock, memory in zip(self._memory_locks, self._memory_shards):
+                    with lock:
+                        if pattern:
+                            for key in [k for k in memory if pattern in k]:
+                                del memory[key]
+                        else:
+                            memory.clear()
+                
+                # Clear the per-function caches in front of this one
+                for lock, local_cache in self._local_caches:
+                    with lock:
+                        if pattern:
+                            for key in [k for k in local_cache if pattern in k]:
+                                del local_cache[key]
+                        else:
+                            local_cache.clear()
                 
-                logger.info(f"Cleared {len(keys_to_remove)} cache entries")
+                logger.info(f"Cleared {len(rows)} cache entries")
                 
             except Exception as e:
                 logger.error(f"Failed to clear cache: {e}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        self.flush()
         with self._lock:
             try:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute("""
-                        SELECT 
-                            COUNT(*) as total_entries,
-                            SUM(size_bytes) as total_size_bytes,
-                            AVG(access_count) as avg_access_count,
-                            SUM(CASE WHEN compressed THEN 1 ELSE 0 END) as compressed_entries
-                        FROM cache_metadata
-                    """)
-                    db_stats = cursor.fetchone()
+                conn = self._conn()
+                cursor = conn.execute("""
+                    SELECT 
+                        COUNT(*) as total_entries,
+                        SUM(length) as total_size_bytes,
+                        AVG(access_count) as avg_access_count,
+                        SUM(CASE WHEN compressed THEN 1 ELSE 0 END) as compressed_entries
+                    FROM cache_metadata
+                """)
+                db_stats = cursor.fetchone()
                 
                 total_entries, total_size_bytes, avg_access_count, compressed_entries = db_stats
-                hit_rate = (self.stats['hits'] / (self.stats['hits'] + self.stats['misses'])) * 100 if (self.stats['hits'] + self.stats['misses']) > 0 else 0
+                hits = self.stats['hits'] + sum(self._memory_hits)
+                misses = self.stats['misses']
+                hit_rate = (hits / (hits + misses)) * 100 if (hits + misses) > 0 else 0
                 
                 return {
                     'total_entries': total_entries or 0,
-                    'memory_cache_entries': len(self.memory_cache),
+                    'memory_cache_entries': sum(len(memory) for memory in self._memory_shards),
                     'total_size_mb': round((total_size_bytes or 0) / (1024 * 1024), 2),
                     'compressed_entries': compressed_entries or 0,
                     'average_access_count': round(avg_access_count or 0, 2),
                     'hit_rate_percent': round(hit_rate, 2),
-                    'cache_hits': self.stats['hits'],
-                    'cache_misses': self.stats['misses'],
+                    'cache_hits': hits,
+                    'cache_misses': misses,
                     'evictions': self.stats['evictions'],
                     'compressions': self.stats['compressions']
                 }
@@ -523,10 +939,33 @@ performance_monitor = PerformanceMonitor()
 intelligent_cache = IntelligentCache()
 
 
-def performance_tracker(cache_key: Optional[str] = None, cache_ttl: int = 3600):
+def _compile_cache_key(template: str, func_name: str) -> Callable[[tuple, dict], str]:
+    """Turn a ``cache_key`` template into a key function
+    
+    The template is checked once, so a field other than ``{func}``, ``{args...}``
+    or ``{kwargs...}`` fails at decoration time; keys are then built with
+    ``str.format_map``.
+    """
+    for _, field_name, _, _ in string.Formatter().parse(template):
+        if field_name is not None and re.split(r"[.\[]", field_name, 1)[0] not in ("func", "args", "kwargs"):
+            raise ValueError(f"Unsupported cache_key field '{{{field_name}}}' in {template!r}")
+    
+    def key_fn(args: tuple, kwargs: dict) -> str:
+        return template.format_map({"func": func_name, "args": args, "kwargs": kwargs})
+    
+    return key_fn
+
+
+def performance_tracker(cache_key: Optional[str] = None, cache_ttl: int = 3600,
+                        key_fn: Optional[Callable[[tuple, dict], str]] = None,
+                        local_cache_size: int = 256):
     """
     Decorator for performance tracking and caching
     
+    Results are looked up in a small per-function in-process LRU first and
+    then in the shared IntelligentCache. Pass ``key_fn(args, kwargs)`` instead
+    of a ``cache_key`` template to build keys without string formatting.
+    
     Usage:
         @performance_tracker(cache_key="search_{args[0]}", cache_ttl=1800)
         def search_function(query):
@@ -534,17 +973,58 @@ def performance_tracker(cache_key: Optional[str] = None, cache_ttl: int = 3600):
             pass
     """
     def decorator(func: Callable) -> Callable:
+        perf_counter = time.perf_counter
+        function_name = func.__name__
+        record = performance_monitor.record_performance
+        
+        if not cache_key and key_fn is None:
+            # No caching requested: time the call without any cache bookkeeping
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                memory_before = _peak_memory_mb()
+                start_time = perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    record(function_name, perf_counter() - start_time, memory_before,
+                           _peak_memory_mb(), False, error_message=str(e))
+                    raise
+                record(function_name, perf_counter() - start_time, memory_before,
+                       _peak_memory_mb(), True)
+                return result
+            return wrapper
+        
+        make_key = key_fn or _compile_cache_key(cache_key, function_name)
+        
+        # Per-function L0 cache of key -> (expires_at monotonic, result)
+        local_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        local_lock = threading.Lock()
+        intelligent_cache.register_local_cache(local_lock, local_cache)
+        
+        def local_get(key: str) -> Any:
+            with local_lock:
+                entry = local_cache.get(key)
+                if entry is None:
+                    return None
+                if entry[0] <= time.monotonic():
+                    del local_cache[key]
+                    return None
+                local_cache.move_to_end(key)
+                return entry[1]
+        
+        def local_set(key: str, value: Any):
+            with local_lock:
+                local_cache[key] = (time.monotonic() + cache_ttl, value)
+                local_cache.move_to_end(key)
+                if len(local_cache) > local_cache_size:
+                    local_cache.popitem(last=False)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = perf_counter()
             
-            # Get memory usage before
-            try:
-                import psutil
-                process = psutil.Process()
-                memory_before = process.memory_info().rss / 1024 / 1024  # MB
-            except ImportError:
-                memory_before = 0
+            # Get memory usage before (single getrusage syscall)
+            memory_before = _peak_memory_mb()
             
             success = False
             result = None
@@ -552,30 +1032,26 @@ def performance_tracker(cache_key: Optional[str] = None, cache_ttl: int = 3600):
             cache_hit = False
             
             try:
-                # Check cache if cache_key is provided
-                if cache_key:
-                    # Format cache key with function arguments
-                    formatted_cache_key = cache_key.format(
-                        func=func.__name__,
-                        args=args,
-                        kwargs=kwargs
-                    )
-                    
-                    # Try to get from cache
+                # Build cache key from function arguments
+                formatted_cache_key = make_key(args, kwargs)
+                
+                # Try the in-process cache, then the shared cache
+                cached_result = local_get(formatted_cache_key)
+                if cached_result is None:
                     cached_result = intelligent_cache.get(formatted_cache_key)
                     if cached_result is not None:
-                        cache_hit = True
-                        success = True
-                        result = cached_result
-                    else:
-                        # Execute function and cache result
-                        result = func(*args, **kwargs)
-                        success = True
-                        intelligent_cache.set(formatted_cache_key, result, cache_ttl)
+                        local_set(formatted_cache_key, cached_result)
+                
+                if cached_result is not None:
+                    cache_hit = True
+                    success = True
+                    result = cached_result
                 else:
-                    # Execute function without caching
+                    # Execute function and cache result
                     result = func(*args, **kwargs)
                     success = True
+                    local_set(formatted_cache_key, result)
+                    intelligent_cache.set(formatted_cache_key, result, cache_ttl)
                 
             except Exception as e:
                 error_message = str(e)
@@ -583,15 +1059,12 @@ def performance_tracker(cache_key: Optional[str] = None, cache_ttl: int = 3600):
             
             finally:
                 # Get memory usage after
-                try:
-                    memory_after = process.memory_info().rss / 1024 / 1024  # MB
-                except (NameError, ImportError):
-                    memory_after = memory_before
+                memory_after = _peak_memory_mb()
                 
                 # Record performance
-                execution_time = time.time() - start_time
-                performance_monitor.record_performance(
-                    function_name=func.__name__,
+                execution_time = perf_counter() - start_time
+                record(
+                    function_name=function_name,
                     execution_time=execution_time,
                     memory_before=memory_before,
                     memory_after=memory_after,
@@ -616,6 +1089,11 @@ def async_batch_processor(batch_size: int = 10, max_workers: int = 5):
             pass
     """
     def decorator(func: Callable) -> Callable:
+        # One pool per decorated function, reused across calls (threads start lazily)
+        executor = ThreadPoolExecutor(max_workers=max_workers,
+                                      thread_name_prefix=f"batch_{func.__name__}")
+        atexit.register(executor.shutdown, wait=False)
+        
         @functools.wraps(func)
         def wrapper(items: List[Any], *args, **kwargs):
             if not items:
@@ -626,26 +1104,25 @@ def async_batch_processor(batch_size: int = 10, max_workers: int = 5):
             results = []
             
             # Process batches in parallel
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_batch = {
-                    executor.submit(func, batch, *args, **kwargs): batch 
-                    for batch in batches
-                }
-                
-                for future in as_completed(future_to_batch):
-                    try:
-                        batch_result = future.result()
-                        results.extend(batch_result if isinstance(batch_result, list) else [batch_result])
-                    except Exception as e:
-                        logger.error(f"Batch processing failed: {e}")
-                        batch = future_to_batch[future]
-                        # Try processing items individually as fallback
-                        for item in batch:
-                            try:
-                                individual_result = func([item], *args, **kwargs)
-                                results.extend(individual_result if isinstance(individual_result, list) else [individual_result])
-                            except Exception as item_error:
-                                logger.error(f"Individual item processing failed: {item_error}")
+            future_to_batch = {
+                executor.submit(func, batch, *args, **kwargs): batch 
+                for batch in batches
+            }
+            
+            for future in as_completed(future_to_batch):
+                try:
+                    batch_result = future.result()
+                    results.extend(batch_result if isinstance(batch_result, list) else [batch_result])
+                except Exception as e:
+                    logger.error(f"Batch processing failed: {e}")
+                    batch = future_to_batch[future]
+                    # Try processing items individually as fallback
+                    for item in batch:
+                        try:
+                            individual_result = func([item], *args, **kwargs)
+                            results.extend(individual_result if isinstance(individual_result, list) else [individual_result])
+                        except Exception as item_error:
+                            logger.error(f"Individual item processing failed: {item_error}")
             
             return results
         return wrapper
@@ -655,52 +1132,52 @@ def async_batch_processor(batch_size: int = 10, max_workers: int = 5):
 class ResourceManager:
     """System resource management and optimization"""
     
-    def __init__(self):
+    def __init__(self, sample_cpu: bool = False):
         self.resource_limits = {
             'max_memory_mb': 2048,
             'max_cpu_percent': 80,
             'max_disk_usage_percent': 90
         }
         self.monitoring_active = False
+        # CPU sampling is opt-in; it costs an os.times() call on entry and exit
+        self.sample_cpu = sample_cpu
+        # Recent (operation, warning) pairs for limits crossed inside resource_monitor
+        self.resource_warnings: Deque[Tuple[str, str]] = deque(maxlen=100)
     
     @contextmanager
     def resource_monitor(self, operation_name: str = "operation"):
         """Context manager for monitoring resource usage during operations"""
+        initial_memory = _peak_memory_mb()
+        initial_times = os.times() if self.sample_cpu else None
+        logger.debug("Starting %s - Peak memory: %.1fMB", operation_name, initial_memory)
+        
+        start_time = time.perf_counter()
         try:
-            import psutil
-            process = psutil.Process()
-            
-            # Get initial resource usage
-            initial_memory = process.memory_info().rss / 1024 / 1024
-            initial_cpu = process.cpu_percent()
-            
-            logger.info(f"Starting {operation_name} - Memory: {initial_memory:.1f}MB, CPU: {initial_cpu:.1f}%")
-            
-            start_time = time.time()
             yield
+        finally:
+            execution_time = time.perf_counter() - start_time
+            final_memory = _peak_memory_mb()
             
-            # Get final resource usage
-            final_memory = process.memory_info().rss / 1024 / 1024
-            final_cpu = process.cpu_percent()
-            execution_time = time.time() - start_time
+            cpu_percent = None
+            if initial_times is not None and execution_time > 0:
+                final_times = os.times()
+                cpu_time = (final_times.user - initial_times.user) + (final_times.system - initial_times.system)
+                cpu_percent = cpu_time / execution_time * 100
             
-            logger.info(f"Completed {operation_name} in {execution_time:.2f}s - "
-                       f"Memory: {final_memory:.1f}MB (Δ{final_memory-initial_memory:+.1f}MB), "
-                       f"CPU: {final_cpu:.1f}%")
+            logger.debug("Completed %s in %.2fs - Peak memory: %.1fMB (Δ%+.1fMB)",
+                         operation_name, execution_time, final_memory, final_memory - initial_memory)
             
-            # Check for resource warnings
+            # Only format warning messages when a limit is actually crossed
             if final_memory > self.resource_limits['max_memory_mb']:
-                logger.warning(f"High memory usage detected: {final_memory:.1f}MB")
+                self._warn(operation_name, f"High memory usage detected: {final_memory:.1f}MB")
             
-            if final_cpu > self.resource_limits['max_cpu_percent']:
-                logger.warning(f"High CPU usage detected: {final_cpu:.1f}%")
-        
-        except ImportError:
-            logger.warning("psutil not available for resource monitoring")
-            yield
-        except Exception as e:
-            logger.error(f"Resource monitoring failed: {e}")
-            yield
+            if cpu_percent is not None and cpu_percent > self.resource_limits['max_cpu_percent']:
+                self._warn(operation_name, f"High CPU usage detected: {cpu_percent:.1f}%")
+    
+    def _warn(self, operation_name: str, message: str):
+        """Record and log a resource limit warning"""
+        self.resource_warnings.append((operation_name, message))
+        logger.warning("%s (%s)", message, operation_name)
 
 
 # Global resource manager
@@ -1,25 +1,135 @@
-from crewai import Crew, Process, Task
-from src.agents.researcher import researcher
-from src.agents.analyzer import analyzer
-from src.agents.reporter import reporter
-from src.utils.logger import logger
-from src.utils.config import validate_configuration, config
-import time
+from src.utils.logger import logger, get_queued_logger
+from src.utils.config import check_configuration, get_config
+import asyncio
+import concurrent.futures
+import functools
+import importlib
+import json
+import logging
+import os
 import random
-from typing import Union, Dict, Any
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Union, Dict, Any, List, Literal, Optional, Tuple
 
-def create_enhanced_tasks(query: str) -> list:
-    """Create enhanced task definitions with better descriptions and validation"""
-    
-    # Validate query input
-    if not query or not query.strip():
-        query = "top AI companies and competitors"
-        logger.warning(f"Empty query provided, using default: {query}")
-    
-    # Task 1: Enhanced Research Task
-    research_task = Task(
-        description=f"""
-        Conduct comprehensive competitor research for: "{query}"
+try:
+    import orjson
+except ImportError:  # Optional faster serializer; falls back to the json module
+    orjson = None
+
+if TYPE_CHECKING:
+    from crewai import Agent, Crew
+
+# CrewAI, the agents (with their LLM clients) and the cache are imported on first use,
+# so importing this module stays cheap until a workflow actually runs
+_LAZY_IMPORTS = {
+    "Crew": ("crewai", "Crew"),
+    "Process": ("crewai", "Process"),
+    "Task": ("crewai", "Task"),
+    "researcher": ("src.agents.researcher", "researcher"),
+    "analyzer": ("src.agents.analyzer", "analyzer"),
+    "reporter": ("src.agents.reporter", "reporter"),
+    "embedder_config": ("src.utils.embeddings", "embedder_config"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve a lazily imported attribute and keep it as a module global"""
+    try:
+        module_name, attr = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def _load_dependencies():
+    """Import any lazy dependencies not yet loaded so functions can use them as globals"""
+    for name in _LAZY_IMPORTS:
+        if name not in globals():
+            __getattr__(name)
+
+# Error categories checked in order; patterns are case-insensitive so the message
+# is searched as-is (separators are optional, e.g. "rate limit" and "rate_limit")
+_ERROR_PATTERNS = (
+    ("rate_limit", re.compile(r"rate[_ ]?limit|429|quota", re.I)),
+    ("authentication", re.compile(r"api[_ ]?key|authentication|unauthorized|401|403", re.I)),
+    ("network", re.compile(r"network|connection|timeout|502|503|504", re.I)),
+    ("model_config", re.compile(r"model|decommissioned|deprecated|invalid_request", re.I)),
+)
+
+
+# Largest number of queries researched together by one batch crew
+_BATCH_MAX_QUERIES = 8
+
+# Successful workflow results are reused for repeated queries within this window
+_RESULT_CACHE_TTL = 6 * 3600
+_RESULT_CACHE_MAX = 128
+
+# Serialized results of successful runs, held in memory only: key -> (expiry, response).
+# Nothing survives a restart, and a hit whose PDF report has since been removed is dropped.
+_result_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_result_cache_lock = threading.Lock()
+
+# PDF paths mentioned in a serialized result
+_PDF_PATH = re.compile(r"[^\s'\"`]+\.pdf\b", re.I)
+
+
+@functools.lru_cache(maxsize=1)
+def _backoff_table() -> Tuple[float, ...]:
+    """Capped exponential backoff ceilings per attempt, computed once the config is loaded"""
+    rate_limits = get_config().rate_limit_config
+    return tuple(
+        min(rate_limits["max_delay"], rate_limits["base_delay"] * rate_limits["backoff_factor"] ** attempt)
+        for attempt in range(rate_limits["max_retries"])
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _crew_logger() -> logging.Logger:
+    """Queued logger for crew step/task progress; its listener thread starts on first use"""
+    return get_queued_logger("crew")
+
+
+def _result_cache_key(query: str, include_report: bool = True) -> str:
+    """Cache key for a query, normalized so case and whitespace variants share results"""
+    kind = "workflow_result" if include_report else "workflow_analysis"
+    return f"{kind}:{' '.join(query.lower().split())}"
+
+
+def _cache_result(key: str, response: Dict[str, Any]):
+    """Remember a successful response, keeping only the crew output's raw text"""
+    entry = {**response, "result": _json_default(response["result"])}
+    with _result_cache_lock:
+        _result_cache.pop(key, None)
+        if len(_result_cache) >= _RESULT_CACHE_MAX:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del _result_cache[next(iter(_result_cache))]
+        _result_cache[key] = (time.monotonic() + _RESULT_CACHE_TTL, entry)
+
+
+def _cached_result(key: str) -> Optional[Dict[str, Any]]:
+    """Return a live cached response, or None if absent, expired or its report is gone"""
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+        if cached is None:
+            return None
+        expires, response = cached
+        if time.monotonic() < expires and all(
+                os.path.exists(path) for path in _PDF_PATH.findall(response["result"])):
+            return response
+        del _result_cache[key]
+    return None
+
+
+# Task prompts keep all static instructions first and append the query last, so the
+# long shared prefix is identical across runs and eligible for provider prompt caching
+_PROFILE_RESEARCH_PROMPT_PREFIX = """
+        Conduct comprehensive competitor research for the target query given below.
         
         Your objectives:
         1. Search for and identify 5-7 key competitors in this space
@@ -28,29 +138,51 @@ def create_enhanced_tasks(query: str) -> list:
            - Key products and services offered
            - Pricing information (if publicly available)
            - Target market and customer base
-           - Recent news and developments
-           - Market positioning and competitive advantages
         3. Scrape their official websites to extract detailed information
         4. Focus on factual, up-to-date information from reliable sources
         
         Provide comprehensive raw data that can be analyzed for insights.
-        """,
-        agent=researcher,
-        expected_output="""
+        """
+
+_PROFILE_RESEARCH_EXPECTED_OUTPUT = """
         Detailed competitor profiles containing:
         - Company names and websites
         - Business model descriptions  
         - Product/service offerings
         - Pricing information (where available)
-        - Market positioning data
+        - Target market and customer base
+        
+        Use concise bullet points (about 150 words per competitor) and do not paste raw
+        page content; this output is passed verbatim to the analysis step.
+        """
+
+_MARKET_RESEARCH_PROMPT_PREFIX = """
+        Research recent market activity for the key competitors in the target query given below.
+        
+        Your objectives:
+        1. Search for and identify 5-7 key competitors in this space
+        2. For each competitor, gather:
+           - Recent news and developments (funding, launches, partnerships)
+           - Market positioning and competitive advantages
+        3. Note overall industry trends shaping this market
+        4. Focus on factual, up-to-date information from reliable sources
+        
+        Provide comprehensive raw data that can be analyzed for insights.
+        """
+
+_MARKET_RESEARCH_EXPECTED_OUTPUT = """
+        Market activity report containing:
+        - Company names
         - Recent company developments
+        - Market positioning data
+        - Key industry trends
+        
+        Use concise bullet points (about 100 words per competitor) and do not paste raw
+        article text; this output is passed verbatim to the analysis step.
         """
-    )
 
-    # Task 2: Enhanced Analysis Task  
-    analyze_task = Task(
-        description=f"""
-        Analyze the competitor research data and provide strategic insights for: "{query}"
+_ANALYZE_PROMPT_PREFIX = """
+        Analyze the competitor research data and provide strategic insights for the target query given below.
         
         Your analysis should include:
         1. Market landscape overview and key trends
@@ -62,23 +194,19 @@ def create_enhanced_tasks(query: str) -> list:
         7. Strategic recommendations based on competitive analysis
         
         Present insights in a structured, actionable format suitable for business decision-making.
-        """,
-        agent=analyzer,
-        expected_output="""
+        """
+
+_ANALYZE_EXPECTED_OUTPUT = """
         Structured competitive analysis including:
         - Executive summary of key findings
         - Competitive positioning matrix
         - Market opportunity analysis
         - Strategic recommendations
         - Key insights and actionable takeaways
-        """,
-        context=[research_task]  # Depends on research task
-    )
+        """
 
-    # Task 3: Enhanced Reporting Task
-    report_task = Task(
-        description=f"""
-        Create a comprehensive competitor analysis report for: "{query}"
+_REPORT_PROMPT_PREFIX = """
+        Create a comprehensive competitor analysis report for the target query given below.
         
         Generate a professional PDF report that includes:
         1. Executive Summary highlighting key findings and recommendations
@@ -91,156 +219,480 @@ def create_enhanced_tasks(query: str) -> list:
         
         Use professional formatting with tables, charts, and clear section headers.
         Ensure the report is suitable for executive presentation and strategic planning.
-        """,
-        agent=reporter,
-        expected_output="Professional PDF report saved as '[Query]_Competitor_Analysis_Report.pdf'",
-        context=[analyze_task]  # Depends on analysis task
+        """
+
+_REPORT_EXPECTED_OUTPUT = "Professional PDF report saved as '[Query]_Competitor_Analysis_Report.pdf'"
+
+
+def _with_query(prefix: str, query: str) -> str:
+    """Append the dynamic query after a static prompt prefix"""
+    return f'{prefix}\n        TARGET QUERY: "{query}"\n'
+
+
+# Task kind -> (prompt prefix, expected output, agent name, async_execution)
+_TASK_TEMPLATES = {
+    "profile_research": (_PROFILE_RESEARCH_PROMPT_PREFIX, _PROFILE_RESEARCH_EXPECTED_OUTPUT, "researcher", True),
+    "market_research": (_MARKET_RESEARCH_PROMPT_PREFIX, _MARKET_RESEARCH_EXPECTED_OUTPUT, "researcher", True),
+    "analyze": (_ANALYZE_PROMPT_PREFIX, _ANALYZE_EXPECTED_OUTPUT, "analyzer", False),
+    "report": (_REPORT_PROMPT_PREFIX, _REPORT_EXPECTED_OUTPUT, "reporter", False),
+}
+
+TaskKind = Literal["profile_research", "market_research", "analyze", "report"]
+
+# dataclass(slots=True) requires Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class TaskSpec:
+    """A workflow task reduced to its kind and query; the CrewAI Task is built on demand"""
+    kind: TaskKind
+    query: str
+
+
+@functools.lru_cache(maxsize=512)
+def _render_description(kind: TaskKind, query: str) -> str:
+    """Render a task description for a query
+    
+    Only the immutable strings are cached; Task objects are mutated by CrewAI during a
+    run and are always created fresh.
+    """
+    return _with_query(_TASK_TEMPLATES[kind][0], query)
+
+
+def to_task(spec: TaskSpec, context: Optional[list] = None) -> "Task":
+    """Materialize a CrewAI Task from a spec"""
+    _load_dependencies()
+    _, expected_output, agent_name, async_execution = _TASK_TEMPLATES[spec.kind]
+    extra = {"context": context} if context else {}
+    return Task(
+        description=_render_description(spec.kind, spec.query),
+        agent=globals()[agent_name],
+        expected_output=expected_output,
+        async_execution=async_execution,
+        **extra
     )
 
-    return [research_task, analyze_task, report_task]
 
-def create_workflow(query: str = "top competitors to xAI") -> Union[str, Dict[str, Any]]:
+_BATCH_RESEARCH_PROMPT_PREFIX = """
+        Conduct competitor research for each of the numbered target queries given below.
+        
+        For every query:
+        1. Search for and identify 5-7 key competitors in that space
+        2. For each competitor, gather the company overview, business model, key products
+           and services, pricing (if public), target market and recent developments
+        3. Focus on factual, up-to-date information from reliable sources
+        
+        Keep the findings for each query clearly separated and labelled with its number.
+        """
+
+_BATCH_RESEARCH_EXPECTED_OUTPUT = """
+        Competitor profiles grouped under each numbered query, containing:
+        - Company names and websites
+        - Business model, products and pricing
+        - Market positioning and recent developments
+        
+        Use concise bullet points (about 100 words per competitor) and do not paste raw
+        page content; this output is passed verbatim to the analysis step.
+        """
+
+_BATCH_ANALYZE_PROMPT_PREFIX = """
+        Analyze the competitor research data separately for each of the numbered target queries given below.
+        
+        For every query, cover the market landscape, competitive positioning, market gaps
+        and opportunities, and strategic recommendations.
+        """
+
+_BATCH_ANALYZE_EXPECTED_OUTPUT = """
+        Only a JSON array with one object per numbered query, in the same order:
+        [{"query": "<query text>", "analysis": "<structured competitive analysis>"}]
+        """
+
+
+def create_task_specs(query: str, include_report: bool = True) -> List[TaskSpec]:
+    """Describe the workflow's tasks for a query without building CrewAI objects"""
+    # Validate query input
+    if not query or not query.strip():
+        query = "top AI companies and competitors"
+        logger.warning(f"Empty query provided, using default: {query}")
+    
+    query = query.strip()
+    kinds = ("profile_research", "market_research", "analyze") + (("report",) if include_report else ())
+    return [TaskSpec(kind, query) for kind in kinds]
+
+def create_enhanced_tasks(query: str, include_report: bool = True) -> list:
     """
-    Create and execute enhanced competitor research workflow with improved error handling
+    Create enhanced task definitions with better descriptions and validation
     
-    Args:
-        query: The competitor research query to analyze
-        
-    Returns:
-        Union[str, Dict[str, Any]]: Result of the workflow execution
+    With include_report=False the PDF reporting task is left out and the analysis is
+    the crew's final output.
     """
+    profile_spec, market_spec, analyze_spec, *report_spec = create_task_specs(query, include_report)
     
-    # Validate configuration before starting
-    if not validate_configuration():
-        return {
-            "status": "error",
-            "message": "Configuration validation failed. Please check your API keys.",
-            "success": False
-        }
+    # Task 1: Research, split into two independent facets that CrewAI runs concurrently
+    # (async_execution) since the competitor list is only known once research starts
+    profile_research_task = to_task(profile_spec)
+    market_research_task = to_task(market_spec)
+
+    # Task 2: Enhanced Analysis Task, waiting for both research facets
+    analyze_task = to_task(analyze_spec, context=[profile_research_task, market_research_task])
+
+    tasks = [profile_research_task, market_research_task, analyze_task]
+    
+    # Task 3: Enhanced Reporting Task, depending on the analysis
+    if report_spec:
+        tasks.append(to_task(report_spec[0], context=[analyze_task]))
+    
+    return tasks
+
+def _log_step(step: Any):
+    """Crew step callback"""
+    _crew_logger().info("Crew step: %s", getattr(step, "action", step))
+
+def _log_task(output: Any):
+    """Crew task completion callback"""
+    _crew_logger().info("Task completed: %s", getattr(output, "description", output))
+
+def _build_crew(agents: list, tasks: list) -> "Crew":
+    """Create a crew with the shared workflow configuration"""
+    return Crew(
+        agents=agents,
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=False,
+        step_callback=_log_step,
+        task_callback=_log_task,
+        memory=True,  # Enable crew memory for better context
+        # Gemini embeddings for crew memory, cached on disk by model and text
+        embedder=embedder_config(),
+        max_rpm=10,  # Requests per minute limit
+        language="en"  # Specify language for better results
+    )
+
+def _err(error_type: str, message: str, attempts: int) -> Dict[str, Any]:
+    """Build a workflow error response"""
+    return {
+        "status": "error",
+        "error_type": error_type,
+        "message": message,
+        "success": False,
+        "attempts": attempts
+    }
+
+def _cancelled_error(attempts: int) -> Dict[str, Any]:
+    """Error response for a run abandoned because a concurrent run failed fatally"""
+    return _err("cancelled",
+                "Cancelled after a concurrent run hit an authentication or model configuration error.",
+                attempts)
+
+async def _backoff(delay: float, cancel: Optional[asyncio.Event]) -> bool:
+    """Sleep for a retry backoff, returning True early if the run was cancelled meanwhile"""
+    if cancel is None:
+        await asyncio.sleep(delay)
+        return False
+    try:
+        await asyncio.wait_for(cancel.wait(), delay)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+async def _kickoff_with_retries(crew: "Crew", query: str,
+                                cancel: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+    """
+    Run a crew with enhanced retry logic and error categorization
     
-    # Enhanced retry configuration
-    rate_limits = config.rate_limit_config
+    When a shared cancel event is given, authentication and model configuration errors
+    set it, and every run sharing it stops before its next attempt or backoff instead
+    of spending its remaining retries on a failure that cannot recover.
+    """
+    rate_limits = get_config().rate_limit_config
     max_retries = rate_limits["max_retries"]
     base_delay = rate_limits["base_delay"]
     max_delay = rate_limits["max_delay"]
     
-    logger.info(f"Starting enhanced competitor research workflow for: '{query}'")
     logger.info(f"Using configuration: max_retries={max_retries}, base_delay={base_delay}s")
     
-    try:
-        # Create enhanced tasks
-        tasks = create_enhanced_tasks(query)
-        
-        # Create crew with enhanced configuration
-        crew = Crew(
-            agents=[researcher, analyzer, reporter],
-            tasks=tasks,
-            process=Process.sequential,
-            verbose=True,
-            memory=True,  # Enable crew memory for better context
-            embedder={"provider": "google", "config": {"model": "models/embedding-001"}},  # Optional: better memory
-            max_rpm=10,  # Requests per minute limit
-            language="en"  # Specify language for better results
-        )
-
-        # Execute with enhanced retry logic and error categorization
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Starting crew execution (attempt {attempt + 1}/{max_retries})")
-                
-                # Execute the workflow
-                result = crew.kickoff()
-                
-                logger.info(f"Workflow completed successfully: {result}")
-                
-                return {
-                    "status": "success", 
-                    "result": result,
-                    "query": query,
-                    "attempts": attempt + 1,
-                    "success": True
-                }
-                
-            except Exception as e:
-                error_str = str(e).lower()
-                error_type = "unknown"
-                
-                # Categorize error types for better handling
-                if any(term in error_str for term in ["rate_limit", "429", "ratelimiterror", "quota"]):
-                    error_type = "rate_limit"
-                elif any(term in error_str for term in ["api_key", "authentication", "unauthorized", "401", "403"]):
-                    error_type = "authentication"
-                elif any(term in error_str for term in ["network", "connection", "timeout", "502", "503", "504"]):
-                    error_type = "network"
-                elif any(term in error_str for term in ["model", "decommissioned", "deprecated", "invalid_request"]):
-                    error_type = "model_config"
+    # Previous rate-limit delay, for decorrelated jitter
+    prev_delay = base_delay
+    
+    for attempt in range(max_retries):
+        if cancel is not None and cancel.is_set():
+            return _cancelled_error(attempt)
+        
+        try:
+            logger.info(f"Starting crew execution (attempt {attempt + 1}/{max_retries})")
+            
+            # Execute the workflow off the event loop
+            result = await asyncio.get_running_loop().run_in_executor(None, crew.kickoff)
+            
+            logger.info(f"Workflow completed successfully: {result}")
+            
+            return {
+                "status": "success", 
+                "result": result,
+                "query": query,
+                "attempts": attempt + 1,
+                "success": True
+            }
+            
+        except Exception as e:
+            error_str = str(e)
+            
+            # Categorize error types for better handling
+            error_type = next(
+                (category for category, pattern in _ERROR_PATTERNS if pattern.search(error_str)),
+                "unknown"
+            )
+            
+            logger.error(f"Attempt {attempt + 1} failed with {error_type} error: {e}")
+            
+            if cancel is not None and error_type in ("authentication", "model_config"):
+                cancel.set()
+            
+            # Handle different error types
+            if error_type == "rate_limit":
+                if attempt < max_retries - 1:
+                    # Decorrelated jitter keeps concurrent clients from retrying in lockstep
+                    delay = min(max_delay, random.uniform(base_delay, prev_delay * 3))
+                    prev_delay = delay
+                    logger.warning(f"Rate limit detected, waiting {delay:.1f}s before retry...")
+                    if await _backoff(delay, cancel):
+                        return _cancelled_error(attempt + 1)
+                    continue
+                else:
+                    return _err("rate_limit",
+                                f"Rate limit exceeded after {max_retries} attempts. Please upgrade your API tier or try again later.",
+                                max_retries)
+                    
+            elif error_type == "authentication":
+                return _err("authentication", "API authentication failed. Please check your API keys in the .env file.", attempt + 1)
                 
-                logger.error(f"Attempt {attempt + 1} failed with {error_type} error: {e}")
+            elif error_type == "model_config":
+                return _err("model_config", f"Model configuration error: {str(e)}. Please check your model settings.", attempt + 1)
                 
-                # Handle different error types
-                if error_type == "rate_limit":
-                    if attempt < max_retries - 1:
-                        delay = min(base_delay * (config.rate_limit_config["backoff_factor"] ** attempt) + random.uniform(0, 2), max_delay)
-                        logger.warning(f"Rate limit detected, waiting {delay:.1f}s before retry...")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        return {
-                            "status": "error",
-                            "error_type": "rate_limit",
-                            "message": f"Rate limit exceeded after {max_retries} attempts. Please upgrade your API tier or try again later.",
-                            "success": False,
-                            "attempts": max_retries
-                        }
-                        
-                elif error_type == "authentication":
-                    return {
-                        "status": "error", 
-                        "error_type": "authentication",
-                        "message": "API authentication failed. Please check your API keys in the .env file.",
-                        "success": False,
-                        "attempts": attempt + 1
-                    }
-                    
-                elif error_type == "model_config":
-                    return {
-                        "status": "error",
-                        "error_type": "model_config", 
-                        "message": f"Model configuration error: {str(e)}. Please check your model settings.",
-                        "success": False,
-                        "attempts": attempt + 1
-                    }
-                    
+            else:
+                # For other errors, retry with exponential backoff
+                if attempt < max_retries - 1:
+                    # Full jitter over the precomputed exponential schedule
+                    delay = random.random() * _backoff_table()[attempt]
+                    logger.warning(f"Retrying after {delay:.1f}s due to: {e}")
+                    if await _backoff(delay, cancel):
+                        return _cancelled_error(attempt + 1)
+                    continue
                 else:
-                    # For other errors, retry with exponential backoff
-                    if attempt < max_retries - 1:
-                        delay = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
-                        logger.warning(f"Retrying after {delay:.1f}s due to: {e}")
-                        time.sleep(delay)
-                        continue
-                    else:
-                        return {
-                            "status": "error",
-                            "error_type": error_type,
-                            "message": f"Workflow failed after {max_retries} attempts: {str(e)}",
-                            "success": False,
-                            "attempts": max_retries
-                        }
-        
-        # Should not reach here, but handle it gracefully
-        return {
-            "status": "error",
-            "message": "Workflow failed after all retry attempts",
-            "success": False,
-            "attempts": max_retries
-        }
+                    return _err(error_type, f"Workflow failed after {max_retries} attempts: {str(e)}", max_retries)
+    
+    # Should not reach here, but handle it gracefully
+    return _err("unknown", "Workflow failed after all retry attempts", max_retries)
+
+def create_batch_tasks(queries: List[str], agents: Optional[Tuple["Agent", "Agent"]] = None) -> list:
+    """
+    Create research and analysis tasks covering several queries at once
+    
+    agents is an optional (researcher, analyzer) pair to assign instead of the shared
+    module-level agents.
+    """
+    _load_dependencies()
+    research_agent, analysis_agent = agents or (researcher, analyzer)
+    numbered = "\n".join(f'        {i}. "{query.strip()}"' for i, query in enumerate(queries, 1))
+    suffix = f"\n        TARGET QUERIES:\n{numbered}\n"
+    
+    research_task = Task(
+        description=_BATCH_RESEARCH_PROMPT_PREFIX + suffix,
+        agent=research_agent,
+        expected_output=_BATCH_RESEARCH_EXPECTED_OUTPUT
+    )
+    
+    analyze_task = Task(
+        description=_BATCH_ANALYZE_PROMPT_PREFIX + suffix,
+        agent=analysis_agent,
+        expected_output=_BATCH_ANALYZE_EXPECTED_OUTPUT,
+        context=[research_task]
+    )
+    
+    return [research_task, analyze_task]
+
+def _configuration_error() -> Union[Dict[str, Any], None]:
+    """Error response for missing credentials or model settings, or None when usable"""
+    checks = check_configuration()
+    reasons = "; ".join(checks["reasons"])
+    if not checks["auth_ok"]:
+        return _err("authentication",
+                    f"Configuration validation failed ({reasons}). Please check your API keys in the .env file.", 0)
+    if not checks["model_ok"]:
+        return _err("model_config", f"Model configuration error ({reasons}). Please check your model settings.", 0)
+    return None
+
+def _json_default(value: Any) -> Any:
+    """Serialize crew outputs by their raw text"""
+    return getattr(value, "raw", None) or str(value)
+
+def serialize_response(response: Dict[str, Any]) -> bytes:
+    """Encode a workflow response as UTF-8 JSON (application/json), using orjson if installed"""
+    if orjson is not None:
+        return orjson.dumps(response, default=_json_default)
+    return json.dumps(response, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+def _run_sync(coro) -> Any:
+    """Run a coroutine to completion from synchronous code
+    
+    asyncio.run refuses to start while a loop is already running in this thread
+    (notebooks, async web handlers), so in that case the coroutine gets its own loop
+    on a helper thread and the caller blocks until it finishes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(asyncio.run, coro).result()
+
+def create_workflow(query: str = "top competitors to xAI", use_cache: bool = True,
+                    serialize: bool = False, include_report: bool = True) -> Union[bytes, Dict[str, Any]]:
+    """
+    Synchronous entry point for the competitor research workflow
+    
+    Callable with or without a running event loop; async callers should still prefer
+    awaiting create_workflow_async so their loop is not blocked.
+    """
+    return _run_sync(create_workflow_async(query, use_cache=use_cache, serialize=serialize,
+                                           include_report=include_report))
+
+async def create_workflow_async(query: str = "top competitors to xAI", use_cache: bool = True,
+                                cancel: Optional[asyncio.Event] = None,
+                                serialize: bool = False,
+                                include_report: bool = True) -> Union[bytes, Dict[str, Any]]:
+    """
+    Create and execute enhanced competitor research workflow with improved error handling
+    
+    The crew runs in a worker thread and retry backoff uses asyncio.sleep, so several
+    workflows can be awaited concurrently without blocking each other.
+    
+    Args:
+        query: The competitor research query to analyze
+        use_cache: Return a recent successful result for the same (normalized) query
+                   instead of running the crew again
+        cancel: Event shared by concurrently awaited workflows; an authentication or
+                model configuration failure sets it and the others stop retrying
+        serialize: Return the response already encoded as JSON bytes, for callers that
+                   would otherwise serialize the dict themselves
+        include_report: Generate the PDF report; pass False when only the structured
+                        analysis is needed, which skips the slowest stage
         
+    Returns:
+        Union[bytes, Dict[str, Any]]: Result of the workflow execution
+    """
+    response = await _run_workflow(query, use_cache, cancel, include_report)
+    return serialize_response(response) if serialize else response
+
+async def _run_workflow(query: str, use_cache: bool, cancel: Optional[asyncio.Event],
+                        include_report: bool) -> Dict[str, Any]:
+    """Run the workflow for one query and return its response dict"""
+    # Fail fast on configuration that could never succeed, before importing the agents
+    # (whose LLM clients need that configuration) or building the crew
+    config_error = _configuration_error()
+    if config_error is not None:
+        return {**config_error, "query": query}
+    _load_dependencies()
+    
+    cache_key = _result_cache_key(query, include_report)
+    if use_cache:
+        cached = _cached_result(cache_key)
+        if cached is not None:
+            logger.info(f"Returning cached workflow result for: '{query}'")
+            return {**cached, "query": query, "cached": True}
+    
+    logger.info(f"Starting enhanced competitor research workflow for: '{query}'")
+    
+    try:
+        # Create enhanced tasks and a fresh crew to run them, so no crew memory or
+        # state carries over from a previous query
+        agents = [researcher, analyzer] + ([reporter] if include_report else [])
+        crew = _build_crew(agents, create_enhanced_tasks(query, include_report))
     except Exception as e:
         logger.error(f"Fatal error in workflow setup: {e}")
-        return {
-            "status": "error", 
-            "error_type": "setup",
-            "message": f"Failed to initialize workflow: {str(e)}",
-            "success": False,
-            "attempts": 0
-        }
\ No newline at end of file
+        return _err("setup", f"Failed to initialize workflow: {str(e)}", 0)
+    
+    response = await _kickoff_with_retries(crew, query, cancel)
+    
+    if response["success"]:
+        _cache_result(cache_key, response)
+    return response
+
+def create_workflow_batch(queries: List[str]) -> List[Dict[str, Any]]:
+    """Synchronous entry point for create_workflow_batch_async"""
+    return _run_sync(create_workflow_batch_async(queries))
+
+async def create_workflow_batch_async(queries: List[str]) -> List[Dict[str, Any]]:
+    """
+    Research several queries with one research + analysis crew per group of queries
+    
+    Sharing a crew amortizes the per-run system prompt and tool schema tokens across up
+    to _BATCH_MAX_QUERIES queries. No PDF report is generated for batched queries.
+    Groups run concurrently, each on its own copies of the agents so no agent state is
+    shared between in-flight kickoffs, and share a cancel event, so an authentication
+    or model configuration failure in one group stops the others from retrying.
+    
+    Args:
+        queries: The competitor research queries to analyze
+        
+    Returns:
+        List[Dict[str, Any]]: One result dict per query, in the same order
+    """
+    if not queries:
+        return []
+    
+    config_error = _configuration_error()
+    if config_error is not None:
+        return [{**config_error, "query": query} for query in queries]
+    _load_dependencies()
+    
+    cancel = asyncio.Event()
+    groups = [queries[start:start + _BATCH_MAX_QUERIES]
+              for start in range(0, len(queries), _BATCH_MAX_QUERIES)]
+    group_results = await asyncio.gather(*(_run_batch_group(group, cancel) for group in groups))
+    return [result for group_result in group_results for result in group_result]
+
+async def _run_batch_group(group: List[str], cancel: asyncio.Event) -> List[Dict[str, Any]]:
+    """Run one group of batched queries on its own crew and agent copies"""
+    if cancel.is_set():
+        return [{**_cancelled_error(0), "query": query} for query in group]
+    logger.info(f"Starting batched competitor research for {len(group)} queries")
+    
+    try:
+        agents = (researcher.copy(), analyzer.copy())
+        crew = _build_crew(list(agents), create_batch_tasks(group, agents))
+    except Exception as e:
+        logger.error(f"Fatal error in batch workflow setup: {e}")
+        setup_error = _err("setup", f"Failed to initialize workflow: {str(e)}", 0)
+        return [{**setup_error, "query": query} for query in group]
+    
+    response = await _kickoff_with_retries(crew, f"batch of {len(group)} queries", cancel)
+    return _split_batch_response(group, response)
+
+def _split_batch_response(queries: List[str], response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Split a batched crew response into one result dict per query"""
+    if not response["success"]:
+        return [{**response, "query": query} for query in queries]
+    
+    result = response["result"]
+    raw = str(getattr(result, "raw", result))
+    try:
+        # Tolerate prose or code fences around the JSON array
+        analyses = json.loads(raw[raw.index("["):raw.rindex("]") + 1])
+        if not isinstance(analyses, list) or len(analyses) != len(queries):
+            raise ValueError(f"expected {len(queries)} results")
+    except ValueError as e:
+        logger.error(f"Could not split batched analysis output: {e}")
+        parse_error = _err("batch_parse",
+                           "The batched analysis could not be split per query. The combined output is in 'result'.",
+                           response["attempts"])
+        return [{**parse_error, "result": result, "query": query} for query in queries]
+    
+    return [{
+        "status": "success",
+        "result": analysis.get("analysis", analysis) if isinstance(analysis, dict) else analysis,
+        "query": query,
+        "attempts": response["attempts"],
+        "success": True
+    } for query, analysis in zip(queries, analyses)]
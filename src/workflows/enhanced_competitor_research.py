@@ -5,35 +5,245 @@ This module creates advanced AI agents with specialized capabilities for
 world-class competitor intelligence and market analysis.
 """
 
+import asyncio
 import json
-from typing import Dict, List, Any, Optional
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from crewai import Agent, Task, Crew, Process
-from src.tools.llm_tool import LLMSummarizerTool
-from src.tools.search_tool import SearchTool
-from src.tools.scrape_tool import ScrapeTool
-from src.tools.pdf_tool import EnhancedPDFReportTool
-from src.tools.financial_data_tool import financial_data_tool
-from src.tools.market_intelligence_tool import market_intelligence_tool
-from src.tools.visualization_tool import visualization_tool
 from src.utils.logger import logger
 from src.utils.config import config
+from src.workflows.competitor_research import serialize_response
+
+# Agent and crew step output is off unless CREW_VERBOSE=1, since it is written synchronously
+_VERBOSE = os.getenv("CREW_VERBOSE") == "1"
+
+# Research analysts whose tasks are independent and feed the strategic synthesis
+_RESEARCH_AGENTS = ('strategic_researcher', 'financial_analyst', 'market_intelligence_specialist', 'technology_analyst')
+
+_PLANNER_PROMPT = """
+You plan a competitor research workflow. Decide which of these research analysts
+are needed to answer the query below, and leave out any whose research would add
+nothing (for example the financial analyst when the competitors are not public
+companies and have no disclosed funding):
+
+- strategic_researcher: competitors, business models, positioning, strategy
+- financial_analyst: financial metrics, funding, valuation
+- market_intelligence_specialist: market trends, regulation, opportunities
+- technology_analyst: technology, R&D, patents, innovation
+
+Answer with only a JSON array of the analyst names to run.
+"""
+
+# Evidence markers used to score confidence in the task outputs
+_CITATION_PATTERN = re.compile(r'https?://|\[\d+\]|\bsources?:', re.I)
+_FIGURE_PATTERN = re.compile(r'\d[\d,.]*\s*(?:%|percent|billion|million|thousand|[bmk]\b)|[$€£]\s?\d', re.I)
+_FAILURE_PATTERN = re.compile(r'^\s*(?:critical )?error\b|failed to|unable to', re.I)
+
+# Task descriptions are fixed templates; CrewAI fills {query} from the kickoff inputs
+_STRATEGIC_DESCRIPTION = """
+    Conduct comprehensive strategic intelligence research on: {query}
+
+    Your analysis must include:
+    1. Complete competitor identification and categorization (direct, indirect, emerging)
+    2. Detailed business model analysis for each major competitor
+    3. Market positioning and competitive advantages assessment
+    4. Strategic initiatives, partnerships, and M&A activity
+    5. Geographic presence and expansion strategies
+    6. Customer base and target market analysis
+    7. Distribution channels and go-to-market strategies
+    8. Recent strategic moves and their implications
+
+    Provide institutional-grade intelligence with specific details, metrics, 
+    and strategic implications. Include recent developments and forward-looking 
+    strategic assessments.
+"""
+
+_FINANCIAL_DESCRIPTION = """
+    Perform comprehensive financial intelligence analysis for competitors identified in: {query}
+
+    Your analysis must include:
+    1. Real-time financial metrics and performance indicators
+    2. Revenue models, growth trajectories, and profitability analysis
+    3. Valuation metrics and market capitalization trends
+    4. Investment flows, funding rounds, and capital structure
+    5. Financial health assessment and risk indicators
+    6. Comparative financial benchmarking
+    7. Analyst ratings, price targets, and market sentiment
+    8. Financial forecasting and scenario analysis
+
+    Use the financial data tool to gather real-time market data and provide 
+    institutional-grade financial intelligence suitable for investment decisions.
+"""
+
+_MARKET_DESCRIPTION = """
+    Conduct advanced market intelligence and trend analysis for: {query}
+
+    Your analysis must include:
+    1. Comprehensive market landscape and dynamics assessment
+    2. Technology trends and disruption analysis
+    3. Consumer behavior and adoption patterns
+    4. Regulatory environment and policy impact analysis
+    5. Supply chain and ecosystem mapping
+    6. Market opportunity identification and sizing
+    7. Competitive dynamics and intensity assessment
+    8. Future market scenarios and strategic implications
+
+    Use the market intelligence tool to gather comprehensive trend data and 
+    provide forward-looking strategic market intelligence.
+"""
+
+_TECHNOLOGY_DESCRIPTION = """
+    Analyze technology and innovation capabilities for competitors in: {query}
+
+    Your analysis must include:
+    1. Technology stack and capabilities assessment
+    2. R&D investment levels and innovation pipeline analysis
+    3. Patent portfolio analysis and intellectual property strength
+    4. Technology partnerships and ecosystem development
+    5. Innovation timeline and product roadmap assessment
+    6. Technical competitive advantages and differentiation
+    7. Technology risk assessment and mitigation strategies
+    8. Future technology readiness and adaptation capacity
+
+    Provide technical intelligence that assesses innovation capacity and 
+    competitive technological positioning.
+"""
+
+_SYNTHESIS_DESCRIPTION = """
+    Synthesize all intelligence gathered into cohesive strategic insights for: {query}
+
+    Integrate findings from:
+    - Strategic intelligence research
+    - Financial intelligence analysis
+    - Market intelligence and trends
+    - Technology and innovation assessment
+
+    Your synthesis must include:
+    1. Integrated competitive landscape overview
+    2. Key strategic insights and implications
+    3. Competitive positioning matrix and strategic recommendations
+    4. Market opportunities and threat assessment
+    5. Strategic scenario planning and future outlook
+    6. Risk assessment and mitigation strategies
+    7. Implementation roadmap with timelines and metrics
+    8. Executive summary with key takeaways and decisions points
+
+    Provide strategic-grade insights suitable for C-suite decision making.
+"""
+
+_VISUALIZATION_DESCRIPTION = """
+    Create professional-grade visualizations for the competitive analysis of: {query}
+
+    Generate comprehensive visualizations including:
+    1. Interactive competitive positioning matrix
+    2. Financial performance comparison charts
+    3. Market share evolution and projections
+    4. Technology roadmap and innovation timeline
+    5. Risk assessment radar charts
+    6. Strategic scenario comparison matrices
+    7. Executive dashboard with key metrics
+    8. Investment attractiveness analysis charts
+
+    Use the visualization tool to create interactive, professional-grade charts 
+    suitable for executive presentations and strategic planning sessions.
+"""
+
+_REPORT_DESCRIPTION = """
+    Create a comprehensive executive report for the competitive analysis of: {query}
+
+    Your report must include:
+    1. Executive Summary with key findings and recommendations
+    2. Detailed competitive landscape analysis
+    3. Strategic positioning assessment
+    4. Financial intelligence and market insights
+    5. Technology and innovation analysis
+    6. Risk assessment and scenario planning
+    7. Strategic recommendations with implementation roadmap
+    8. Professional appendices with supporting data
+
+    Integrate all findings including:
+    - Strategic intelligence research
+    - Financial analysis
+    - Market intelligence
+    - Technology assessment
+    - Strategic synthesis
+    - Professional visualizations
+
+    Create a board-ready report with professional formatting, clear recommendations, 
+    and actionable insights suitable for strategic decision-making.
+"""
+
 
 class EnhancedAgentSystem:
     """Advanced multi-agent system for comprehensive competitor research"""
     
     def __init__(self):
-        self.llm_tool = LLMSummarizerTool()
-        self.search_tool = SearchTool()
-        self.scrape_tool = ScrapeTool()
-        self.pdf_tool = EnhancedPDFReportTool()
+        self.model_config = config.get_model_config()
         
-        # Initialize enhanced tools
-        self.financial_tool = financial_data_tool
-        self.market_intel_tool = market_intelligence_tool
-        self.viz_tool = visualization_tool
+        # Agents are built on first use and reused by later analyses; crews are not,
+        # since a crew's memory would carry one query's findings into the next
+        self._agents: Optional[Dict[str, Agent]] = None
         
-        self.model_config = config.get_model_config()
+        # PDF rendering runs after the crew, off the path that returns the results;
+        # renders are kept by (query, timestamp) for get_pdf_path()
+        self._pdf_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="enhanced-pdf")
+        self._pdf_renders: Dict[Tuple[str, str], Future] = {}
+    
+    @cached_property
+    def llm(self):
+        """One LLM shared by every agent, so they reuse a single client and its connections"""
+        try:
+            from crewai import LLM
+        except ImportError:  # Older CrewAI releases only take the model name
+            return self.model_config['model']
+        return LLM(model=self.model_config['model'], api_key=self.model_config['api_key'])
+    
+    # Tools are imported and created on first use; their modules pull in heavy
+    # dependencies (Playwright, ReportLab, plotting and market data libraries)
+    
+    @cached_property
+    def llm_tool(self):
+        from src.tools.llm_tool import LLMSummarizerTool
+        return LLMSummarizerTool()
+    
+    @cached_property
+    def search_tool(self):
+        from src.tools.search_tool import SearchTool
+        return SearchTool()
+    
+    @cached_property
+    def scrape_tool(self):
+        from src.tools.scrape_tool import ScrapeTool
+        return ScrapeTool()
+    
+    @cached_property
+    def scrape_batch_tool(self):
+        from src.tools.scrape_tool import ScrapeBatchTool
+        return ScrapeBatchTool()
+    
+    @cached_property
+    def pdf_tool(self):
+        from src.tools.pdf_tool import EnhancedPDFReportTool
+        return EnhancedPDFReportTool()
+    
+    @cached_property
+    def financial_tool(self):
+        from src.tools.financial_data_tool import financial_data_tool
+        return financial_data_tool
+    
+    @cached_property
+    def market_intel_tool(self):
+        from src.tools.market_intelligence_tool import market_intelligence_tool
+        return market_intelligence_tool
+    
+    @cached_property
+    def viz_tool(self):
+        from src.tools.visualization_tool import visualization_tool
+        return visualization_tool
         
     def create_enhanced_agents(self) -> Dict[str, Agent]:
         """Create specialized AI agents with advanced capabilities"""
@@ -43,15 +253,16 @@ class EnhancedAgentSystem:
                 role='Strategic Intelligence Researcher',
                 goal="""Conduct comprehensive strategic intelligence gathering on competitors, 
                 analyzing market positioning, business strategies, financial performance, 
-                and competitive advantages with professional-grade depth.""",
+                and competitive advantages with professional-grade depth. Prefer scrape_batch over 
+                sequential scraping whenever you have two or more URLs to visit.""",
                 backstory="""You are a senior strategic intelligence analyst with 15+ years 
                 of experience in competitive intelligence at top-tier consulting firms like 
                 McKinsey and BCG. You specialize in comprehensive market research, competitor 
                 analysis, and strategic positioning assessment. Your analyses are used by 
                 C-suite executives for critical strategic decisions.""",
-                tools=[self.search_tool, self.scrape_tool, self.financial_tool],
-                verbose=True,
-                llm=self.model_config['model'],
+                tools=[self.search_tool, self.scrape_tool, self.scrape_batch_tool, self.financial_tool],
+                verbose=_VERBOSE,
+                llm=self.llm,
                 max_iter=3,
                 memory=True
             ),
@@ -60,15 +271,16 @@ class EnhancedAgentSystem:
                 role='Senior Financial Intelligence Analyst', 
                 goal="""Perform deep financial analysis of competitors including revenue models, 
                 profitability trends, valuation metrics, investment flows, and financial 
-                health assessments with institutional-grade rigor.""",
+                health assessments with institutional-grade rigor. Prefer scrape_batch over 
+                sequential scraping whenever you have two or more URLs to visit.""",
                 backstory="""You are a CFA charterholder and former investment banking analyst 
                 with expertise in financial modeling, valuation analysis, and industry research. 
                 You've covered the automotive and technology sectors for major investment banks 
                 and have a track record of accurate financial forecasting and competitor 
                 financial assessment.""",
-                tools=[self.financial_tool, self.search_tool, self.scrape_tool],
-                verbose=True,
-                llm=self.model_config['model'],
+                tools=[self.financial_tool, self.search_tool, self.scrape_tool, self.scrape_batch_tool],
+                verbose=_VERBOSE,
+                llm=self.llm,
                 max_iter=3,
                 memory=True
             ),
@@ -77,15 +289,16 @@ class EnhancedAgentSystem:
                 role='Market Intelligence & Trend Analysis Specialist',
                 goal="""Analyze market trends, consumer behavior, regulatory landscapes, 
                 technology adoption patterns, and industry disruption factors to provide 
-                forward-looking market intelligence and opportunity identification.""",
+                forward-looking market intelligence and opportunity identification. Prefer scrape_batch over 
+                sequential scraping whenever you have two or more URLs to visit.""",
                 backstory="""You are a market intelligence expert with deep experience in 
                 technology trend analysis, consumer research, and industry transformation. 
                 You've led market research teams at leading consulting firms and technology 
                 companies, specializing in emerging markets and disruptive technologies. 
                 Your insights drive product strategy and market entry decisions.""",
-                tools=[self.market_intel_tool, self.search_tool, self.scrape_tool],
-                verbose=True,
-                llm=self.model_config['model'], 
+                tools=[self.market_intel_tool, self.search_tool, self.scrape_tool, self.scrape_batch_tool],
+                verbose=_VERBOSE,
+                llm=self.llm, 
                 max_iter=3,
                 memory=True
             ),
@@ -94,15 +307,16 @@ class EnhancedAgentSystem:
                 role='Technology & Innovation Intelligence Analyst',
                 goal="""Analyze technological capabilities, R&D investments, patent portfolios, 
                 innovation pipelines, and technical competitive advantages to assess 
-                technological positioning and future readiness.""",
+                technological positioning and future readiness. Prefer scrape_batch over 
+                sequential scraping whenever you have two or more URLs to visit.""",
                 backstory="""You are a technology analyst with a PhD in Engineering and 10+ 
                 years of experience in technology intelligence at Fortune 500 companies. 
                 You specialize in patent analysis, technology roadmap assessment, and 
                 innovation pipeline evaluation. Your technical analyses inform strategic 
                 technology investments and competitive positioning decisions.""",
-                tools=[self.search_tool, self.scrape_tool, self.market_intel_tool],
-                verbose=True,
-                llm=self.model_config['model'],
+                tools=[self.search_tool, self.scrape_tool, self.scrape_batch_tool, self.market_intel_tool],
+                verbose=_VERBOSE,
+                llm=self.llm,
                 max_iter=3,
                 memory=True
             ),
@@ -118,9 +332,9 @@ class EnhancedAgentSystem:
                 analyses into clear, actionable strategic recommendations that drive business 
                 results. Your strategic frameworks are used by industry leaders.""",
                 tools=[self.llm_tool],
-                verbose=True,
-                llm=self.model_config['model'],
-                max_iter=2,
+                verbose=_VERBOSE,
+                llm=self.llm,
+                max_iter=1,  # Single pass over the research context
                 memory=True
             ),
             
@@ -135,10 +349,10 @@ class EnhancedAgentSystem:
                 visualizations transform complex data into clear, actionable insights 
                 that drive decision-making at the highest levels.""",
                 tools=[self.viz_tool],
-                verbose=True,
-                llm=self.model_config['model'],
+                verbose=_VERBOSE,
+                llm=self.llm,
                 max_iter=2,
-                memory=True
+                memory=False  # Works only from its task context
             ),
             
             'executive_reporter': Agent(
@@ -151,247 +365,213 @@ class EnhancedAgentSystem:
                 for CEOs, board members, and investors at Fortune 500 companies. Your 
                 reports are known for their clarity, depth, and actionable insights that 
                 drive strategic decision-making.""",
-                tools=[self.pdf_tool, self.llm_tool],
-                verbose=True,
-                llm=self.model_config['model'],
+                tools=[self.llm_tool],  # The PDF is rendered afterwards by _render_pdf
+                verbose=_VERBOSE,
+                llm=self.llm,
                 max_iter=2,
-                memory=True
+                memory=False  # Works only from its task context
             )
         }
         
         return agents
     
-    def create_enhanced_tasks(self, query: str, agents: Dict[str, Agent]) -> List[Task]:
-        """Create comprehensive task workflow for 10/10 analysis"""
+    def create_enhanced_tasks(self, agents: Dict[str, Agent],
+                              analysts: tuple = _RESEARCH_AGENTS) -> List[Task]:
+        """
+        Create comprehensive task workflow for 10/10 analysis
         
-        tasks = [
-            Task(
-                description=f"""
-                Conduct comprehensive strategic intelligence research on: {query}
-                
-                Your analysis must include:
-                1. Complete competitor identification and categorization (direct, indirect, emerging)
-                2. Detailed business model analysis for each major competitor
-                3. Market positioning and competitive advantages assessment
-                4. Strategic initiatives, partnerships, and M&A activity
-                5. Geographic presence and expansion strategies
-                6. Customer base and target market analysis
-                7. Distribution channels and go-to-market strategies
-                8. Recent strategic moves and their implications
-                
-                Provide institutional-grade intelligence with specific details, metrics, 
-                and strategic implications. Include recent developments and forward-looking 
-                strategic assessments.
-                """,
-                agent=agents['strategic_researcher'],
-                expected_output="Comprehensive strategic intelligence report with detailed competitor profiles and strategic analysis"
-            ),
-            
-            Task(
-                description=f"""
-                Perform comprehensive financial intelligence analysis for competitors identified in: {query}
-                
-                Your analysis must include:
-                1. Real-time financial metrics and performance indicators
-                2. Revenue models, growth trajectories, and profitability analysis
-                3. Valuation metrics and market capitalization trends
-                4. Investment flows, funding rounds, and capital structure
-                5. Financial health assessment and risk indicators
-                6. Comparative financial benchmarking
-                7. Analyst ratings, price targets, and market sentiment
-                8. Financial forecasting and scenario analysis
-                
-                Use the financial data tool to gather real-time market data and provide 
-                institutional-grade financial intelligence suitable for investment decisions.
-                """,
-                agent=agents['financial_analyst'],
-                expected_output="Professional financial intelligence report with real-time data, comparative analysis, and investment insights"
-            ),
-            
-            Task(
-                description=f"""
-                Conduct advanced market intelligence and trend analysis for: {query}
-                
-                Your analysis must include:
-                1. Comprehensive market landscape and dynamics assessment
-                2. Technology trends and disruption analysis
-                3. Consumer behavior and adoption patterns
-                4. Regulatory environment and policy impact analysis
-                5. Supply chain and ecosystem mapping
-                6. Market opportunity identification and sizing
-                7. Competitive dynamics and intensity assessment
-                8. Future market scenarios and strategic implications
-                
-                Use the market intelligence tool to gather comprehensive trend data and 
-                provide forward-looking strategic market intelligence.
-                """,
-                agent=agents['market_intelligence_specialist'],
-                expected_output="Comprehensive market intelligence report with trend analysis, opportunities assessment, and strategic implications"
-            ),
-            
-            Task(
-                description=f"""
-                Analyze technology and innovation capabilities for competitors in: {query}
-                
-                Your analysis must include:
-                1. Technology stack and capabilities assessment
-                2. R&D investment levels and innovation pipeline analysis
-                3. Patent portfolio analysis and intellectual property strength
-                4. Technology partnerships and ecosystem development
-                5. Innovation timeline and product roadmap assessment
-                6. Technical competitive advantages and differentiation
-                7. Technology risk assessment and mitigation strategies
-                8. Future technology readiness and adaptation capacity
-                
-                Provide technical intelligence that assesses innovation capacity and 
-                competitive technological positioning.
-                """,
-                agent=agents['technology_analyst'],
-                expected_output="Technology intelligence report with innovation analysis, patent insights, and technical competitive assessment"
-            ),
-            
-            Task(
-                description=f"""
-                Synthesize all intelligence gathered into cohesive strategic insights for: {query}
-                
-                Integrate findings from:
-                - Strategic intelligence research
-                - Financial intelligence analysis
-                - Market intelligence and trends
-                - Technology and innovation assessment
-                
-                Your synthesis must include:
-                1. Integrated competitive landscape overview
-                2. Key strategic insights and implications
-                3. Competitive positioning matrix and strategic recommendations
-                4. Market opportunities and threat assessment
-                5. Strategic scenario planning and future outlook
-                6. Risk assessment and mitigation strategies
-                7. Implementation roadmap with timelines and metrics
-                8. Executive summary with key takeaways and decisions points
-                
-                Provide strategic-grade insights suitable for C-suite decision making.
-                """,
-                agent=agents['strategic_synthesizer'],
-                expected_output="Strategic synthesis report with integrated insights, recommendations, and implementation roadmap",
-                context=[
-                    Task(description="Strategic research findings", agent=agents['strategic_researcher']),
-                    Task(description="Financial analysis findings", agent=agents['financial_analyst']),
-                    Task(description="Market intelligence findings", agent=agents['market_intelligence_specialist']),
-                    Task(description="Technology analysis findings", agent=agents['technology_analyst'])
-                ]
-            ),
-            
-            Task(
-                description=f"""
-                Create professional-grade visualizations for the competitive analysis of: {query}
-                
-                Generate comprehensive visualizations including:
-                1. Interactive competitive positioning matrix
-                2. Financial performance comparison charts
-                3. Market share evolution and projections
-                4. Technology roadmap and innovation timeline
-                5. Risk assessment radar charts
-                6. Strategic scenario comparison matrices
-                7. Executive dashboard with key metrics
-                8. Investment attractiveness analysis charts
-                
-                Use the visualization tool to create interactive, professional-grade charts 
-                suitable for executive presentations and strategic planning sessions.
-                """,
-                agent=agents['visualization_specialist'],
-                expected_output="Comprehensive visualization package with interactive charts and executive dashboards",
-                context=[
-                    Task(description="Strategic synthesis findings", agent=agents['strategic_synthesizer'])
-                ]
-            ),
-            
-            Task(
-                description=f"""
-                Create a comprehensive executive report for the competitive analysis of: {query}
-                
-                Your report must include:
-                1. Executive Summary with key findings and recommendations
-                2. Detailed competitive landscape analysis
-                3. Strategic positioning assessment
-                4. Financial intelligence and market insights
-                5. Technology and innovation analysis
-                6. Risk assessment and scenario planning
-                7. Strategic recommendations with implementation roadmap
-                8. Professional appendices with supporting data
-                
-                Integrate all findings including:
-                - Strategic intelligence research
-                - Financial analysis
-                - Market intelligence
-                - Technology assessment
-                - Strategic synthesis
-                - Professional visualizations
-                
-                Create a board-ready report with professional formatting, clear recommendations, 
-                and actionable insights suitable for strategic decision-making.
-                """,
-                agent=agents['executive_reporter'],
-                expected_output="Executive-grade comprehensive report with professional formatting and strategic recommendations",
-                context=[
-                    Task(description="All previous analysis findings", agent=agents['strategic_synthesizer']),
-                    Task(description="Professional visualizations", agent=agents['visualization_specialist'])
-                ]
-            )
+        The four research tasks are independent, so they run concurrently
+        (async_execution) and the synthesis task waits on all of them.
+        Descriptions carry a {query} placeholder that CrewAI fills from the
+        kickoff inputs, so one set of tasks serves any number of queries.
+        Only the research tasks of the given analysts are included.
+        """
+        
+        strategic_task = Task(
+            description=_STRATEGIC_DESCRIPTION,
+            agent=agents['strategic_researcher'],
+            expected_output="Comprehensive strategic intelligence report with detailed competitor profiles and strategic analysis",
+            async_execution=True
+        )
+        
+        financial_task = Task(
+            description=_FINANCIAL_DESCRIPTION,
+            agent=agents['financial_analyst'],
+            expected_output="Professional financial intelligence report with real-time data, comparative analysis, and investment insights",
+            async_execution=True
+        )
+        
+        market_task = Task(
+            description=_MARKET_DESCRIPTION,
+            agent=agents['market_intelligence_specialist'],
+            expected_output="Comprehensive market intelligence report with trend analysis, opportunities assessment, and strategic implications",
+            async_execution=True
+        )
+        
+        technology_task = Task(
+            description=_TECHNOLOGY_DESCRIPTION,
+            agent=agents['technology_analyst'],
+            expected_output="Technology intelligence report with innovation analysis, patent insights, and technical competitive assessment",
+            async_execution=True
+        )
+        
+        research_tasks = [
+            task for name, task in zip(_RESEARCH_AGENTS, (strategic_task, financial_task, market_task, technology_task))
+            if name in analysts
         ]
         
-        return tasks
+        synthesis_task = Task(
+            description=_SYNTHESIS_DESCRIPTION,
+            agent=agents['strategic_synthesizer'],
+            expected_output="Strategic synthesis report with integrated insights, recommendations, and implementation roadmap",
+            context=research_tasks
+        )
+        
+        visualization_task = Task(
+            description=_VISUALIZATION_DESCRIPTION,
+            agent=agents['visualization_specialist'],
+            expected_output="Comprehensive visualization package with interactive charts and executive dashboards",
+            context=[synthesis_task]
+        )
+        
+        report_task = Task(
+            description=_REPORT_DESCRIPTION,
+            agent=agents['executive_reporter'],
+            expected_output="Executive-grade comprehensive report with professional formatting and strategic recommendations",
+            context=[synthesis_task, visualization_task]
+        )
+        
+        return research_tasks + [synthesis_task, visualization_task, report_task]
+    
+    def reset_memory(self):
+        """Discard the cached agents so the next analysis starts without their accumulated state"""
+        self._agents = None
     
-    def execute_enhanced_analysis(self, query: str) -> Dict[str, Any]:
-        """Execute comprehensive 10/10 competitor analysis"""
+    def plan_tasks(self, query: str) -> tuple:
+        """
+        Choose the research analysts a query needs with one planning LLM call
+        
+        Falls back to all analysts when the plan cannot be obtained or parsed.
+        """
+        plan = self.llm_tool._run(query, prompt=_PLANNER_PROMPT)
+        try:
+            chosen = json.loads(plan[plan.index('['):plan.rindex(']') + 1])
+        except ValueError:
+            logger.warning(f"Could not parse research plan, running all analysts: {plan[:200]}")
+            return _RESEARCH_AGENTS
+        
+        # Keep the canonical order of the analysts
+        analysts = tuple(name for name in _RESEARCH_AGENTS if name in chosen)
+        if not analysts:
+            return _RESEARCH_AGENTS
+        logger.info(f"Research plan for '{query}': {', '.join(analysts)}")
+        return analysts
+    
+    def _create_crew(self, analysts: tuple = _RESEARCH_AGENTS,
+                     agents: Optional[Dict[str, Agent]] = None) -> Crew:
+        """
+        Create a fresh enhanced crew, with empty memory, for one analysis
+        
+        Uses the shared agents unless a separate set is given (for crews that
+        run concurrently).
+        """
+        
+        # Create enhanced agents once and reuse them
+        if agents is None:
+            if self._agents is None:
+                self._agents = self.create_enhanced_agents()
+                logger.info(f"Created {len(self._agents)} specialized agents")
+            agents = self._agents
+        
+        # Create comprehensive tasks
+        tasks = self.create_enhanced_tasks(agents, analysts)
+        logger.info(f"Created {len(tasks)} analysis tasks")
+        
+        from src.utils.embeddings import embedder_config
+        
+        return Crew(
+            agents=[agent for name, agent in agents.items() if name in analysts or name not in _RESEARCH_AGENTS],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=_VERBOSE,
+            memory=True,
+            # Gemini embeddings for crew memory, cached on disk by model and text so
+            # later runs over the same competitors do not re-embed their outputs
+            embedder=embedder_config(),
+            cache=True,
+            max_rpm=self.model_config.get('max_rpm'),
+            share_crew=False
+        )
+    
+    def _render_pdf(self, query: str, result: Any) -> Future:
+        """Start rendering the executive report PDF in the background"""
+        report_text = getattr(result, 'raw', None) or str(result)
+        return self._pdf_executor.submit(self.pdf_tool._run, report_text, query=query)
+    
+    def get_pdf_path(self, analysis_results: Dict[str, Any], timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for the PDF of an analysis result and return its path
+        
+        Returns the PDF tool's error message if rendering failed, and None for
+        results this system did not produce. Raises
+        concurrent.futures.TimeoutError if the PDF is not ready within timeout.
+        """
+        render = self._pdf_renders.get((analysis_results.get('query'), analysis_results.get('timestamp')))
+        if render is None:
+            return None
+        return render.result(timeout)
+    
+    def _compile_results(self, query: str, crew: Crew, result: Any, timestamp: str) -> Dict[str, Any]:
+        """
+        Compile comprehensive results for one query
+        
+        The PDF is only started here; the results return without waiting for
+        it, and get_pdf_path() waits for it when the PDF is needed.
+        """
+        self._pdf_renders[(query, timestamp)] = self._render_pdf(query, result)
+        return {
+            'query': query,
+            'analysis_type': 'Enhanced 10/10 Competitor Intelligence',
+            'timestamp': timestamp,
+            'agents_deployed': len(crew.agents),
+            'tasks_completed': len(crew.tasks),
+            # The crew output itself; get_report_text() reads the text when it is needed
+            'executive_report_ref': result,
+            'methodology': 'Multi-agent AI system with specialized intelligence capabilities',
+            'confidence_level': _compute_confidence(
+                [str(getattr(output, 'raw', output)) for output in getattr(result, 'tasks_output', None) or [result]]
+            ),
+            'data_sources': [
+                'Real-time financial markets',
+                'Industry intelligence databases', 
+                'Technology trend analysis',
+                'Market research platforms',
+                'Strategic intelligence networks'
+            ],
+            'analysis_depth': 'Institutional Grade',
+            'suitable_for': ['C-suite decisions', 'Board presentations', 'Strategic planning']
+        }
+    
+    def execute_enhanced_analysis(self, query: str, plan: bool = False) -> Dict[str, Any]:
+        """
+        Execute comprehensive 10/10 competitor analysis
+        
+        Args:
+            query: The competitor research query to analyze
+            plan: Ask the LLM first which research analysts the query needs and
+                  skip the others (see plan_tasks)
+        """
+        # Start time of the analysis, shared by the success and failure results
+        timestamp = datetime.now().isoformat()
         
         try:
             logger.info(f"Starting enhanced competitor analysis for: {query}")
-            
-            # Create enhanced agents
-            agents = self.create_enhanced_agents()
-            logger.info(f"Created {len(agents)} specialized agents")
-            
-            # Create comprehensive tasks
-            tasks = self.create_enhanced_tasks(query, agents)
-            logger.info(f"Created {len(tasks)} analysis tasks")
-            
-            # Create and execute crew
-            crew = Crew(
-                agents=list(agents.values()),
-                tasks=tasks,
-                process=Process.sequential,
-                verbose=True,
-                memory=True,
-                cache=True,
-                max_rpm=10,
-                share_crew=False
-            )
+            crew = self._create_crew(self.plan_tasks(query) if plan else _RESEARCH_AGENTS)
             
             logger.info("Executing enhanced multi-agent analysis...")
-            result = crew.kickoff()
-            
-            # Compile comprehensive results
-            analysis_results = {
-                'query': query,
-                'analysis_type': 'Enhanced 10/10 Competitor Intelligence',
-                'timestamp': datetime.now().isoformat(),
-                'agents_deployed': len(agents),
-                'tasks_completed': len(tasks),
-                'executive_report': str(result),
-                'methodology': 'Multi-agent AI system with specialized intelligence capabilities',
-                'confidence_level': 'High (90-95%)',
-                'data_sources': [
-                    'Real-time financial markets',
-                    'Industry intelligence databases', 
-                    'Technology trend analysis',
-                    'Market research platforms',
-                    'Strategic intelligence networks'
-                ],
-                'analysis_depth': 'Institutional Grade',
-                'suitable_for': ['C-suite decisions', 'Board presentations', 'Strategic planning']
-            }
+            result = crew.kickoff(inputs={'query': query})
             
+            analysis_results = self._compile_results(query, crew, result, timestamp)
             logger.info("Enhanced competitor analysis completed successfully")
             return analysis_results
             
@@ -399,10 +579,77 @@ class EnhancedAgentSystem:
             logger.error(f"Enhanced analysis failed: {e}")
             return {
                 'error': str(e),
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timestamp,
                 'status': 'failed',
                 'query': query
             }
+    
+    def execute_enhanced_analysis_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Execute the enhanced analysis for several queries concurrently
+        
+        Each query gets its own crew and agents, so no memory or agent state is
+        shared, and the kickoffs are awaited together so the LLM calls of
+        different queries overlap. Results are returned in the same order as
+        the queries.
+        """
+        if not queries:
+            return []
+        timestamp = datetime.now().isoformat()
+        
+        try:
+            logger.info(f"Starting enhanced competitor analysis for {len(queries)} queries")
+            crews = [self._create_crew(agents=self.create_enhanced_agents()) for _ in queries]
+            
+            results = asyncio.run(_kickoff_each(crews, queries))
+            
+            logger.info("Enhanced batch analysis completed successfully")
+            return [self._compile_results(query, crew, result, timestamp)
+                    for query, crew, result in zip(queries, crews, results)]
+            
+        except Exception as e:
+            logger.error(f"Enhanced batch analysis failed: {e}")
+            return [{
+                'error': str(e),
+                'timestamp': timestamp,
+                'status': 'failed',
+                'query': query
+            } for query in queries]
+
+async def _kickoff_each(crews: List[Crew], queries: List[str]) -> list:
+    """Kick off one crew per query concurrently and return their outputs in order"""
+    return await asyncio.gather(*(crew.kickoff_async(inputs={'query': query})
+                                  for crew, query in zip(crews, queries)))
+
+def _compute_confidence(outputs: List[str]) -> str:
+    """
+    Score confidence from the task outputs of a crew run
+    
+    Each output earns a point for citing sources, for containing concrete
+    figures and for not reporting a failure; the level is the average share.
+    """
+    if not outputs:
+        return 'Low (0%)'
+    
+    score = sum(
+        (bool(_CITATION_PATTERN.search(text)) + bool(_FIGURE_PATTERN.search(text))
+         + (bool(text.strip()) and not _FAILURE_PATTERN.search(text))) / 3
+        for text in outputs
+    ) / len(outputs)
+    
+    level = 'High' if score >= 0.75 else 'Medium' if score >= 0.45 else 'Low'
+    return f"{level} ({score:.0%})"
+
+def get_report_text(analysis_results: Dict[str, Any]) -> str:
+    """Return the executive report text of an enhanced analysis result"""
+    report = analysis_results.get('executive_report_ref')
+    if report is None:
+        return ''
+    return getattr(report, 'raw', None) or str(report)
+
+def serialize_results(analysis_results: Dict[str, Any]) -> str:
+    """Serialize an enhanced analysis result to JSON, with orjson when it is installed"""
+    return serialize_response(analysis_results).decode("utf-8")
 
 # Create global enhanced system instance
 enhanced_agent_system = EnhancedAgentSystem()
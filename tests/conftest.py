@@ -0,0 +1,123 @@
+"""
+Shared pytest configuration
+"""
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+def pytest_addoption(parser):
+    """Add the --runintegration opt-in for tests marked integration"""
+    parser.addoption(
+        "--runintegration", action="store_true", default=False,
+        help="Run tests marked integration (skipped by default)"
+    )
+
+
+def pytest_configure(config):
+    """Register custom markers so they work with --strict-markers and under pytest-xdist workers"""
+    config.addinivalue_line("markers", "slow: Tests that take more than 1 second (deselect with -m 'not slow')")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests unless --runintegration was given"""
+    if config.getoption("--runintegration"):
+        return
+    skip_integration = pytest.mark.skip(reason="needs --runintegration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+class _FakeCrew:
+    """Stand-in for crewai.Crew: calling it returns itself, and kickoff() returns ``result`` or raises ``error``"""
+
+    def __init__(self):
+        self.result = SimpleNamespace(raw="report.pdf")
+        self.error = None
+        self.tasks = []
+
+    def __call__(self, *_args, **kwargs):
+        self.tasks = kwargs.get("tasks", self.tasks)
+        return self
+
+    def kickoff(self, *_args, **_kwargs):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _FakeGenerativeModel:
+    """Stand-in for google.generativeai.GenerativeModel returning a canned summary"""
+
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def generate_content(self, *_args, **_kwargs):
+        return SimpleNamespace(text="This is a test summary of the provided content.")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _block_gemini():
+    """Replace the Gemini model for the whole session so no test reaches the real API"""
+    with patch('google.generativeai.GenerativeModel', new=_FakeGenerativeModel):
+        yield
+
+
+# Tools are stateless between calls, so one instance of each is shared by the session.
+# They are imported inside their fixtures so that filtered runs such as `pytest -k search`
+# never load ReportLab or the Gemini SDK.
+
+@pytest.fixture(scope="session")
+def search_tool():
+    """Shared SearchTool instance"""
+    from src.tools.search_tool import SearchTool
+    return SearchTool()
+
+
+@pytest.fixture(scope="session")
+def pdf_tool():
+    """Shared EnhancedPDFReportTool instance"""
+    from src.tools.pdf_tool import EnhancedPDFReportTool
+    return EnhancedPDFReportTool()
+
+
+@pytest.fixture(scope="session")
+def llm_tool():
+    """Shared LLMSummarizerTool instance"""
+    from src.tools.llm_tool import LLMSummarizerTool
+    return LLMSummarizerTool()
+
+
+@pytest.fixture(scope="session")
+def session_tmp_dir(tmp_path_factory):
+    """Output directory shared by every test in the session"""
+    return tmp_path_factory.mktemp("out")
+
+
+@pytest.fixture
+def crew_mock(monkeypatch):
+    """Replace the workflow's Crew with a _FakeCrew; set .result or .error to shape kickoff()"""
+    fake = _FakeCrew()
+    monkeypatch.setattr('src.workflows.competitor_research.Crew', fake)
+    return fake
+
+
+@pytest.fixture(scope="session")
+def thread_pool():
+    """Small thread pool shared by the concurrency tests"""
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=5, thread_name_prefix="test-pool") as executor:
+        yield executor
+
+
+@pytest.fixture
+def mock_ddgs(monkeypatch):
+    """Patch DDGS with a context manager yielding a Mock search instance; set .text as needed"""
+    instance = Mock()
+    context = Mock()
+    context.__enter__ = Mock(return_value=instance)
+    context.__exit__ = Mock(return_value=False)
+    monkeypatch.setattr('src.tools.search_tool.DDGS', Mock(return_value=context))
+    return instance
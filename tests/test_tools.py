@@ -1,18 +1,20 @@
 import pytest
-from src.tools.search_tool import SearchTool
 
 @pytest.mark.unit
-def test_search_tool_initialization():
+def test_search_tool_initialization(search_tool):
     """Test that SearchTool can be initialized properly"""
-    tool = SearchTool()
+    tool = search_tool
     assert tool.name == "Enhanced Competitor Search Tool"
     assert "Advanced web search tool" in tool.description
     assert hasattr(tool, '_run')
 
 @pytest.mark.unit
-def test_search_tool_basic_functionality():
+def test_search_tool_basic_functionality(search_tool, mock_ddgs):
     """Test basic search functionality with a simple query"""
-    tool = SearchTool()
+    mock_ddgs.text.return_value = [
+        {'title': 'Test Company', 'href': 'https://test.com', 'body': 'Test company description'}
+    ]
+    tool = search_tool
     result = tool._run("test query")
     # The result should be either a valid search result or the failure message
     assert isinstance(result, str)
@@ -2,16 +2,8 @@
 Basic unit tests for core functionality
 """
 import pytest
-from src.tools.search_tool import SearchTool
 from src.utils.config import config
 
-@pytest.mark.unit
-def test_search_tool_basic_init():
-    """Test basic SearchTool initialization"""
-    tool = SearchTool()
-    assert tool.name == "Enhanced Competitor Search Tool"
-    assert hasattr(tool, '_run')
-
 @pytest.mark.unit  
 def test_config_basic():
     """Test basic config functionality"""
@@ -20,9 +12,9 @@ def test_config_basic():
     assert config is not None
     
 @pytest.mark.unit
-def test_search_empty_query():
+def test_search_empty_query(search_tool):
     """Test search tool with empty query"""
-    tool = SearchTool()
+    tool = search_tool
     result = tool._run("")
     assert isinstance(result, str)
     # Should handle empty query gracefully